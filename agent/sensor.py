@@ -36,12 +36,16 @@ SERVER_URL: str = os.getenv("SERVER_URL", "http://localhost:8000").rstrip("/")
 USER_API_KEY: str = os.getenv("USER_API_KEY", "")
 AGENT_ID: str = os.getenv("AGENT_ID", "default-agent")
 COLLECTION_INTERVAL: int = int(os.getenv("COLLECTION_INTERVAL", "5"))
+DISK_PATH: str = os.getenv("DISK_PATH", "C:\\" if sys.platform == "win32" else "/")
 
 INGEST_ENDPOINT = f"{SERVER_URL}/api/v1/metrics/ingest"
 
 # Clamp interval between 2 and 60 seconds
 COLLECTION_INTERVAL = max(2, min(60, COLLECTION_INTERVAL))
 
+# Prime the CPU counter; each tick then reads usage since the previous tick
+psutil.cpu_percent(interval=None)
+
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
@@ -77,22 +81,31 @@ signal.signal(signal.SIGTERM, _handle_signal)
 _prev_net: Optional[Any] = None
 _prev_disk_io: Optional[Any] = None
 
+# disk usage changes slowly — re-read it every few ticks, not every tick
+DISK_USAGE_REFRESH_TICKS = 12
+_disk_usage: Optional[Any] = None
+_disk_usage_age = 0
+
 
 def collect_metrics() -> Dict[str, Any]:
     """Return a dict of current system metrics."""
-    global _prev_net, _prev_disk_io
+    global _prev_net, _prev_disk_io, _disk_usage, _disk_usage_age
 
     now = datetime.now(timezone.utc).isoformat()
 
     # CPU ------------------------------------------------------------------
-    cpu_percent = psutil.cpu_percent(interval=0.5)  # short blocking sample
+    cpu_percent = psutil.cpu_percent(interval=None)  # non-blocking, since last call
     cpu_freq = psutil.cpu_freq()
 
     # Memory ---------------------------------------------------------------
     mem = psutil.virtual_memory()
 
     # Disk usage -----------------------------------------------------------
-    disk = psutil.disk_usage(os.environ.get("DISK_PATH", "C:\\" if sys.platform == "win32" else "/"))
+    if _disk_usage is None or _disk_usage_age >= DISK_USAGE_REFRESH_TICKS:
+        _disk_usage = psutil.disk_usage(DISK_PATH)
+        _disk_usage_age = 0
+    _disk_usage_age += 1
+    disk = _disk_usage
 
     # Disk I/O (delta since last collection) — ransomware indicator --------
     disk_io = psutil.disk_io_counters()
@@ -0,0 +1,29 @@
+"""
+Cheap UTC timestamps for hot paths.
+
+Provides:
+  - utc_isoformat : current UTC time as an ISO-8601 string, without
+                    building a datetime object per call
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Tuple
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") — the date/time part only changes once per second
+_second_cache: Tuple[int, str] = (0, "")
+
+
+def utc_isoformat() -> str:
+    """
+    Current UTC time formatted like ``datetime.now(timezone.utc).isoformat()``
+    (microsecond precision, ``+00:00`` suffix). The seconds part is formatted
+    at most once per second; each call only appends the microseconds.
+    """
+    global _second_cache
+    ns = time.time_ns()
+    sec, frac = divmod(ns, 1_000_000_000)
+    if _second_cache[0] != sec:
+        _second_cache = (sec, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec)))
+    return f"{_second_cache[1]}.{frac // 1000:06d}+00:00"
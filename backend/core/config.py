@@ -3,9 +3,8 @@ Configuration management for the application
 Centralizes all settings from environment variables with validation
 """
 
-import os
 from typing import List, Optional
-from functools import lru_cache
+from functools import cache, cached_property, lru_cache
 from pydantic import field_validator, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -13,130 +12,124 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     """Application settings from environment variables"""
     
+    # Values are read once from the process environment (and ../.env when
+    # present); pydantic-settings coerces them to the annotated types.
+    # Frozen: the shared instance is read-only after startup.
     model_config = SettingsConfigDict(
+        env_file="../.env",
         case_sensitive=True,
-        extra='ignore'  # Ignore extra environment variables
+        extra='ignore',  # Ignore extra environment variables
+        frozen=True
     )
     
     # ========================================================================
     # ENVIRONMENT & DEBUG
     # ========================================================================
     
-    ENVIRONMENT: str = os.getenv("ENVIRONMENT", "development")
-    DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
+    ENVIRONMENT: str = "development"
+    DEBUG: bool = True
     
     # ========================================================================
     # API CONFIGURATION
     # ========================================================================
     
-    API_TITLE: str = os.getenv("API_TITLE", "Real-Time System Monitoring API")
-    API_VERSION: str = os.getenv("API_VERSION", "1.0.0")
-    BACKEND_HOST: str = os.getenv("BACKEND_HOST", "0.0.0.0")
-    BACKEND_PORT: int = int(os.getenv("BACKEND_PORT", "8000"))
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FILE: str = os.getenv("LOG_FILE", "logs/app.log")
-    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")
+    API_TITLE: str = "Real-Time System Monitoring API"
+    API_VERSION: str = "1.0.0"
+    BACKEND_HOST: str = "0.0.0.0"
+    BACKEND_PORT: int = 8000
+    LOG_LEVEL: str = "INFO"
+    LOG_FILE: str = "logs/app.log"
+    LOG_FORMAT: str = "json"
     
     # ========================================================================
     # API KEYS (REQUIRED - User must provide)
     # ========================================================================
     
-    GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
-    HUGGINGFACE_API_TOKEN: str = os.getenv("HUGGINGFACE_API_TOKEN", "")
-    OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY", None)
+    GROQ_API_KEY: str = ""
+    HUGGINGFACE_API_TOKEN: str = ""
+    OPENAI_API_KEY: Optional[str] = None
     
     # ========================================================================
     # DATABASE CONFIGURATION
     # ========================================================================
     
-    DATABASE_URL: str = os.getenv(
-        "DATABASE_URL",
-        "sqlite:///./monitoring.db"
-    )
-    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "20"))
-    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+    DATABASE_URL: str = "sqlite:///./monitoring.db"
+    DB_POOL_SIZE: int = 20
+    DB_POOL_RECYCLE: int = 3600
     
     # Time-series database
-    INFLUXDB_URL: str = os.getenv("INFLUXDB_URL", "http://localhost:8086")
-    INFLUXDB_TOKEN: str = os.getenv("INFLUXDB_TOKEN", "")
-    INFLUXDB_ORG: str = os.getenv("INFLUXDB_ORG", "")
-    INFLUXDB_BUCKET: str = os.getenv("INFLUXDB_BUCKET", "system_metrics")
+    INFLUXDB_URL: str = "http://localhost:8086"
+    INFLUXDB_TOKEN: str = ""
+    INFLUXDB_ORG: str = ""
+    INFLUXDB_BUCKET: str = "system_metrics"
     
     # ========================================================================
     # CACHE & MESSAGE QUEUE
     # ========================================================================
     
-    REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
-    REDIS_PORT: int = int(os.getenv("REDIS_PORT", "6379"))
-    REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
-    REDIS_PASSWORD: Optional[str] = os.getenv("REDIS_PASSWORD", None)
-    CACHE_TTL: int = int(os.getenv("CACHE_TTL", "300"))
-    CACHE_MAX_SIZE: int = int(os.getenv("CACHE_MAX_SIZE", "1000"))
+    REDIS_HOST: str = "localhost"
+    REDIS_PORT: int = 6379
+    REDIS_DB: int = 0
+    REDIS_PASSWORD: Optional[str] = None
+    CACHE_TTL: int = 300
+    CACHE_MAX_SIZE: int = 1000
+    LOCAL_CACHE_MAX: int = 50_000  # StateManager in-process entries (LRU-evicted)
     
     # ========================================================================
     # ML MODEL CONFIGURATION
     # ========================================================================
     
     # GROQ Configuration - Use Llama 3.1 70B (faster and more capable)
-    GROQ_MODEL: str = os.getenv("GROQ_MODEL", "llama-3.1-70b-versatile")
+    GROQ_MODEL: str = "llama-3.1-70b-versatile"
     
     # Ollama Configuration (Local LLM)
-    OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-    OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "llama2")
+    OLLAMA_BASE_URL: str = "http://localhost:11434"
+    OLLAMA_MODEL: str = "llama2"
     
     # Hugging Face Models
-    HF_MODEL_NAME: str = os.getenv(
-        "HF_MODEL_NAME",
-        "distilbert-base-uncased-finetuned-sst-2-english"
-    )
-    HF_MODEL_DEVICE: str = os.getenv("HF_MODEL_DEVICE", "cpu")
+    HF_MODEL_NAME: str = "distilbert-base-uncased-finetuned-sst-2-english"
+    HF_MODEL_DEVICE: str = "cpu"
     
     # Anomaly Detection
-    ANOMALY_MODEL: str = os.getenv("ANOMALY_MODEL", "isolation_forest")
-    ANOMALY_THRESHOLD: float = float(os.getenv("ANOMALY_THRESHOLD", "0.7"))
+    ANOMALY_MODEL: str = "isolation_forest"
+    ANOMALY_THRESHOLD: float = 0.7
     
     # ========================================================================
     # EMAIL CONFIGURATION
     # ========================================================================
     
-    EMAIL_USER: str = os.getenv("EMAIL_USER", "")
-    EMAIL_PASS: str = os.getenv("EMAIL_PASS", "")
-    SMTP_SERVER: str = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-    SMTP_PORT: int = int(os.getenv("SMTP_PORT", "587"))
+    EMAIL_USER: str = ""
+    EMAIL_PASS: str = ""
+    SMTP_SERVER: str = "smtp.gmail.com"
+    SMTP_PORT: int = 587
     
     # ========================================================================
     # DATA PIPELINE CONFIGURATION
     # ========================================================================
     
-    DATA_COLLECTION_INTERVAL: int = int(os.getenv("DATA_COLLECTION_INTERVAL", "5"))
-    BATCH_SIZE: int = int(os.getenv("BATCH_SIZE", "100"))
-    RETENTION_DAYS: int = int(os.getenv("RETENTION_DAYS", "30"))
+    DATA_COLLECTION_INTERVAL: int = 5
+    BATCH_SIZE: int = 100
+    RETENTION_DAYS: int = 30
     
     # Kafka (for large-scale deployments)
-    KAFKA_BOOTSTRAP_SERVERS: str = os.getenv(
-        "KAFKA_BOOTSTRAP_SERVERS",
-        "localhost:9092"
-    )
-    KAFKA_TOPIC: str = os.getenv("KAFKA_TOPIC", "system_metrics")
+    KAFKA_BOOTSTRAP_SERVERS: str = "localhost:9092"
+    KAFKA_TOPIC: str = "system_metrics"
     
     # ========================================================================
     # SECURITY & AUTHENTICATION
     # ========================================================================
     
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
-    JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
-    JWT_EXPIRATION_HOURS: int = int(os.getenv("JWT_EXPIRATION_HOURS", "24"))
+    SECRET_KEY: str = "your-secret-key-change-in-production"
+    JWT_ALGORITHM: str = "HS256"
+    JWT_EXPIRATION_HOURS: int = 24
+    JWKS_URL: str = ""  # when set, RBAC verifies RS256 tokens against this JWK set
     
     # CORS - Using computed field to avoid Pydantic parsing issues
-    CORS_ORIGINS_STR: str = os.getenv("CORS_ORIGINS_STR", "http://localhost:8501")
+    CORS_ORIGINS_STR: str = "http://localhost:8501"
     
-    def model_post_init(self, __context):
-        """Post-initialization hook - Pydantic v2 style"""
-        pass
-    
-    @property
+    @cached_property
     def cors_origins(self) -> List[str]:
-        """Parse CORS origins from comma-separated string"""
+        """Parse CORS origins from comma-separated string (once per instance)"""
         if self.CORS_ORIGINS_STR == "*":
             return ["*"]
         return [origin.strip() for origin in self.CORS_ORIGINS_STR.split(",") if origin.strip()]
@@ -145,45 +138,35 @@ class Settings(BaseSettings):
     # FEATURE FLAGS
     # ========================================================================
     
-    ENABLE_ANOMALY_DETECTION: bool = (
-        os.getenv("ENABLE_ANOMALY_DETECTION", "true").lower() == "true"
-    )
-    ENABLE_PREDICTIVE_ALERTS: bool = (
-        os.getenv("ENABLE_PREDICTIVE_ALERTS", "true").lower() == "true"
-    )
-    ENABLE_LLM_ANALYSIS: bool = (
-        os.getenv("ENABLE_LLM_ANALYSIS", "true").lower() == "true"
-    )
-    ENABLE_ADVANCED_VISUALIZATIONS: bool = (
-        os.getenv("ENABLE_ADVANCED_VISUALIZATIONS", "true").lower() == "true"
-    )
-    ENABLE_REAL_TIME_UPDATES: bool = (
-        os.getenv("ENABLE_REAL_TIME_UPDATES", "true").lower() == "true"
-    )
+    ENABLE_ANOMALY_DETECTION: bool = True
+    ENABLE_PREDICTIVE_ALERTS: bool = True
+    ENABLE_LLM_ANALYSIS: bool = True
+    ENABLE_ADVANCED_VISUALIZATIONS: bool = True
+    ENABLE_REAL_TIME_UPDATES: bool = True
     
     # ========================================================================
     # NOTIFICATION SETTINGS
     # ========================================================================
     
-    SLACK_WEBHOOK_URL: Optional[str] = os.getenv("SLACK_WEBHOOK_URL", None)
-    PAGERDUTY_API_KEY: Optional[str] = os.getenv("PAGERDUTY_API_KEY", None)
+    SLACK_WEBHOOK_URL: Optional[str] = None
+    PAGERDUTY_API_KEY: Optional[str] = None
     
     # ========================================================================
     # PERFORMANCE TUNING
     # ========================================================================
     
-    NUM_WORKERS: int = int(os.getenv("NUM_WORKERS", "4"))
-    WORKER_TIMEOUT: int = int(os.getenv("WORKER_TIMEOUT", "300"))
+    NUM_WORKERS: int = 4
+    WORKER_TIMEOUT: int = 300
     
     # ========================================================================
     # MONITORING & METRICS
     # ========================================================================
     
-    PROMETHEUS_PORT: int = int(os.getenv("PROMETHEUS_PORT", "9090"))
-    ENABLE_METRICS: bool = os.getenv("ENABLE_METRICS", "true").lower() == "true"
+    PROMETHEUS_PORT: int = 9090
+    ENABLE_METRICS: bool = True
 
 
-@lru_cache()
+@cache
 def get_settings() -> Settings:
     """Get cached settings instance"""
     return Settings()
@@ -193,8 +176,9 @@ def get_settings() -> Settings:
 settings = get_settings()
 
 
+@lru_cache(maxsize=1)
 def validate_required_settings():
-    """Validate that all required settings are provided"""
+    """Validate that all required settings are provided (cached after first success)"""
     required_keys = [
         "GROQ_API_KEY",
         "HUGGINGFACE_API_TOKEN",
@@ -10,8 +10,7 @@ from typing import AsyncGenerator
 
 from sqlalchemy import text
 from sqlalchemy.engine import make_url
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from core.config import settings
 from core.logger import get_logger
@@ -60,27 +59,35 @@ async def init_db() -> None:
                     "pool_size": settings.DB_POOL_SIZE,
                     "max_overflow": 10,
                     "pool_recycle": settings.DB_POOL_RECYCLE,
+                    "pool_timeout": 5,
+                    # LIFO keeps reusing the most recently returned (warm) connection
+                    "pool_use_lifo": True,
                 }
             )
+            if url_obj.drivername.endswith("asyncpg"):
+                # Cache prepared statements per connection so hot queries
+                # skip the PREPARE round-trip
+                engine_kwargs["connect_args"] = {
+                    "prepared_statement_cache_size": 256,
+                    "server_settings": {"jit": "off"},
+                }
 
         engine = create_async_engine(database_url, **engine_kwargs)
 
-        AsyncSessionLocal = sessionmaker(
-            engine, class_=AsyncSession, expire_on_commit=False
-        )
+        AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
         # Create all tables (safe if they already exist)
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
-        # Quick connectivity check
-        async with engine.begin() as conn:
+        # Quick connectivity check (plain connection, no BEGIN/COMMIT)
+        async with engine.connect() as conn:
             await conn.execute(text("SELECT 1"))
 
         logger.info("✅ Database initialised — all tables ready")
 
     except Exception as e:
-        logger.error(f"❌ Database initialisation error: {e}")
+        logger.error("❌ Database initialisation error: %s", e)
         raise
 
 
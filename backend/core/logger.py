@@ -2,14 +2,25 @@
 Logger setup and configuration
 """
 
+import atexit
 import logging
-import json
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
+from functools import lru_cache
+import orjson
 from pythonjsonlogger import jsonlogger
 from core.config import settings
 import os
 
 
+class OrjsonFormatter(jsonlogger.JsonFormatter):
+    """JSON formatter that serializes records with orjson"""
+
+    def jsonify_log_record(self, log_record):
+        return orjson.dumps(log_record, default=str).decode()
+
+
 def setup_logging():
     """Configure structured logging"""
     
@@ -20,12 +31,15 @@ def setup_logging():
     os.makedirs("logs", exist_ok=True)
     
     # JSON formatter for structured logging
-    json_formatter = jsonlogger.JsonFormatter()
+    json_formatter = OrjsonFormatter()
     
     # File handler
-    file_handler = logging.FileHandler(settings.LOG_FILE)
+    file_handler = RotatingFileHandler(
+        settings.LOG_FILE,
+        maxBytes=50_000_000,
+        backupCount=5
+    )
     file_handler.setFormatter(json_formatter)
-    logger.addHandler(file_handler)
     
     # Console handler
     console_handler = logging.StreamHandler()
@@ -33,11 +47,20 @@ def setup_logging():
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
+    
+    # Serialization and I/O happen on the listener thread; callers only enqueue
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    logger.addHandler(QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
     
     return logger
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
-    """Get logger instance"""
+    """Get logger instance (memoized to skip the logging module lock)"""
     return logging.getLogger(f"system_monitoring.{name}")
@@ -0,0 +1,89 @@
+"""
+Host metrics snapshot shared by the routers that report on the server itself.
+
+Provides:
+  - host_snapshot : one psutil sample of this host (CPU, memory, disk,
+                    network, processes), reused by every caller for
+                    SNAPSHOT_TTL seconds
+  - network_rate  : network bytes/s measured over a window of its own
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, Tuple
+
+import psutil
+
+from core.logger import get_logger
+
+logger = get_logger("metrics")
+
+SNAPSHOT_TTL = 1.0  # seconds a sample is shared before psutil is read again
+NETWORK_RATE_WINDOW = 1.0  # seconds between the two counter reads of network_rate
+
+# Prime the CPU counter so later interval=None reads return a real delta
+psutil.cpu_percent(interval=None)
+
+_snapshot: Tuple[float, Dict[str, Any]] = (float("-inf"), {})
+_sample_lock = asyncio.Lock()
+
+async def _sample() -> Dict[str, Any]:
+    # psutil reads are blocking syscalls; run them concurrently in threads
+    cpu_percent, memory, disk, network, pids = await asyncio.gather(
+        asyncio.to_thread(psutil.cpu_percent, None),
+        asyncio.to_thread(psutil.virtual_memory),
+        asyncio.to_thread(psutil.disk_usage, "/"),
+        asyncio.to_thread(psutil.net_io_counters),
+        asyncio.to_thread(psutil.pids),
+    )
+    return {
+        "cpu_percent": round(cpu_percent, 2),
+        "memory_percent": round(memory.percent, 2),
+        "memory_used_gb": round(memory.used / (1024**3), 2),
+        "memory_total_gb": round(memory.total / (1024**3), 2),
+        "disk_percent": round(disk.percent, 2),
+        "disk_used_gb": round(disk.used / (1024**3), 2),
+        "disk_total_gb": round(disk.total / (1024**3), 2),
+        "network_sent_mb": round(network.bytes_sent / (1024**2), 2),
+        "network_recv_mb": round(network.bytes_recv / (1024**2), 2),
+        "process_count": len(pids),
+    }
+
+
+async def host_snapshot() -> Dict[str, Any]:
+    """
+    Current host metrics. Concurrent callers share one in-flight sample,
+    and a sample is reused for SNAPSHOT_TTL seconds. Returns {} if psutil
+    fails.
+    """
+    global _snapshot
+    async with _sample_lock:
+        taken_at, metrics = _snapshot
+        if time.monotonic() - taken_at >= SNAPSHOT_TTL:
+            try:
+                metrics = await _sample()
+            except Exception as e:
+                logger.error("Error sampling host metrics: %s", e)
+                return {}
+            _snapshot = (time.monotonic(), metrics)
+    return dict(metrics)
+
+
+async def network_rate(window: float = NETWORK_RATE_WINDOW) -> Dict[str, float]:
+    """
+    Bytes/s sent and received, from two counter reads ``window`` seconds
+    apart, so the rate never depends on when another caller last sampled.
+    psutil's net_io_counters already corrects for counter wraparound; a
+    counter reset clamps to 0.
+    """
+    first = await asyncio.to_thread(psutil.net_io_counters)
+    started = time.monotonic()
+    await asyncio.sleep(window)
+    second = await asyncio.to_thread(psutil.net_io_counters)
+    elapsed = time.monotonic() - started
+    return {
+        "network_sent_bps": round(max(second.bytes_sent - first.bytes_sent, 0) / elapsed, 2),
+        "network_recv_bps": round(max(second.bytes_recv - first.bytes_recv, 0) / elapsed, 2),
+    }
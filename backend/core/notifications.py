@@ -3,16 +3,27 @@ Notification Service for Multi-Channel Alerts
 Supports Email, Slack, PagerDuty, and In-App notifications
 """
 
-import smtplib
-import requests
+from __future__ import annotations
+
 import asyncio
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Optional, List, Dict
-from datetime import datetime
+import html
+import orjson
+from typing import TYPE_CHECKING, Final, Optional, List, Dict, Tuple
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pydantic import BaseModel, EmailStr
 from enum import Enum
 
+from core.logger import get_logger
+
+# smtplib, email.mime and httpx are imported where they are first needed, so
+# a manager with no email/webhook channels configured never loads them.
+if TYPE_CHECKING:
+    import httpx
+    from email.mime.multipart import MIMEMultipart
+
+logger = get_logger("notifications")
+
 # ============================================================================
 # NOTIFICATION MODELS
 # ============================================================================
@@ -32,14 +43,108 @@ class NotificationSeverity(str, Enum):
     ERROR = "error"
     CRITICAL = "critical"
 
-class Notification(BaseModel):
-    """Notification model"""
+# ============================================================================
+# SEVERITY LOOKUP TABLES
+# ============================================================================
+
+_SLACK_COLORS: Final[Dict[NotificationSeverity, str]] = {
+    NotificationSeverity.INFO: "#36a64f",      # Green
+    NotificationSeverity.WARNING: "#ff9900",   # Orange
+    NotificationSeverity.ERROR: "#ff0000",     # Red
+    NotificationSeverity.CRITICAL: "#8b0000"   # Dark Red
+}
+
+_SLACK_EMOJIS: Final[Dict[NotificationSeverity, str]] = {
+    NotificationSeverity.INFO: ":information_source:",
+    NotificationSeverity.WARNING: ":warning:",
+    NotificationSeverity.ERROR: ":x:",
+    NotificationSeverity.CRITICAL: ":rotating_light:"
+}
+
+_PD_SEVERITY_MAP: Final[Dict[NotificationSeverity, str]] = {
+    NotificationSeverity.INFO: "info",
+    NotificationSeverity.WARNING: "warning",
+    NotificationSeverity.ERROR: "error",
+    NotificationSeverity.CRITICAL: "critical"
+}
+
+_HTML_SEVERITY_COLORS: Final[Dict[NotificationSeverity, str]] = {
+    NotificationSeverity.INFO: "#2196F3",
+    NotificationSeverity.WARNING: "#FF9800",
+    NotificationSeverity.ERROR: "#F44336",
+    NotificationSeverity.CRITICAL: "#B71C1C"
+}
+
+_JSON_HEADERS: Final[Dict[str, str]] = {"Content-Type": "application/json"}
+
+# ============================================================================
+# HTML EMAIL TEMPLATES
+# ============================================================================
+
+_HTML_TEMPLATE: Final[str] = """
+        <html>
+        <body style="font-family: Arial, sans-serif; padding: 20px; background-color: #f5f5f5;">
+            <div style="max-width: 600px; margin: 0 auto; background-color: white; border-radius: 8px; overflow: hidden; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+                <div style="background-color: {color}; color: white; padding: 20px;">
+                    <h2 style="margin: 0;">{title}</h2>
+                    <p style="margin: 5px 0 0 0; opacity: 0.9;">System Monitoring Alert</p>
+                </div>
+                
+                <div style="padding: 20px;">
+                    <p style="font-size: 16px; line-height: 1.6; color: #333;">
+                        {message}
+                    </p>
+                    
+                    {metadata}
+                </div>
+                
+                <div style="padding: 20px; background-color: #f5f5f5; border-top: 1px solid #ddd;">
+                    <p style="margin: 0; font-size: 12px; color: #757575;">
+                        Severity: <strong>{severity}</strong> | 
+                        Timestamp: {timestamp}
+                    </p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """
+
+_HTML_ROW_TEMPLATE: Final[str] = """
+                <tr style="border-bottom: 1px solid #eee;">
+                    <td style="padding: 8px; font-weight: bold; color: #666;">{key}:</td>
+                    <td style="padding: 8px;">{value}</td>
+                </tr>
+                """
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class Notification:
+    """Internal notification (trusted data, no validation overhead)"""
+    title: str
+    message: str
+    severity: NotificationSeverity = NotificationSeverity.INFO
+    channels: List[NotificationChannel]
+    recipients: List[str] = field(default_factory=list)
+    metadata: Dict = field(default_factory=dict)
+
+class NotificationRequest(BaseModel):
+    """Notification request model, validated at the API boundary"""
     title: str
     message: str
     severity: NotificationSeverity = NotificationSeverity.INFO
     channels: List[NotificationChannel]
     recipients: Optional[List[str]] = []
     metadata: Optional[Dict] = {}
+    
+    def to_notification(self) -> Notification:
+        """Convert to the internal Notification"""
+        return Notification(
+            title=self.title,
+            message=self.message,
+            severity=self.severity,
+            channels=self.channels,
+            recipients=self.recipients or [],
+            metadata=self.metadata or {}
+        )
 
 # ============================================================================
 # EMAIL SERVICE
@@ -54,16 +159,17 @@ class EmailService:
         self.username = username
         self.password = password
     
-    async def send_email(
+    def build_message(
         self,
         to_email: str,
         subject: str,
         body: str,
         html_body: Optional[str] = None,
-        suggested_fixes: Optional[List[str]] = None
-    ) -> bool:
+        suggested_fixes: Optional[List[str]] = None,
+        timestamp: Optional[datetime] = None
+    ) -> MIMEMultipart:
         """
-        Send email notification
+        Build a MIME email message
         
         Args:
             to_email: Recipient email address
@@ -71,45 +177,137 @@ class EmailService:
             body: Plain text body
             html_body: HTML body (optional)
             suggested_fixes: List of suggested fixes for anomalies
+            timestamp: UTC send time (defaults to now)
         """
-        try:
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = self.username
-            msg['To'] = to_email
-            msg['Date'] = datetime.utcnow().strftime("%a, %d %b %Y %H:%M:%S +0000")
-            
-            # Add suggested fixes to body if provided
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+        
+        now = timestamp or datetime.now(timezone.utc)
+        
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = self.username
+        msg['To'] = to_email
+        msg['Date'] = now.strftime("%a, %d %b %Y %H:%M:%S +0000")
+        
+        # Add suggested fixes to body if provided
+        if suggested_fixes:
+            body += "\n\n🔧 Suggested Fixes:\n"
+            for i, fix in enumerate(suggested_fixes, 1):
+                body += f"{i}. {fix}\n"
+        
+        # Attach plain text
+        msg.attach(MIMEText(body, 'plain'))
+        
+        # Attach HTML if provided
+        if html_body:
             if suggested_fixes:
-                body += "\n\n🔧 Suggested Fixes:\n"
-                for i, fix in enumerate(suggested_fixes, 1):
-                    body += f"{i}. {fix}\n"
-            
-            # Attach plain text
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Attach HTML if provided
-            if html_body:
-                if suggested_fixes:
-                    html_body += "<h3>🔧 Suggested Fixes:</h3><ol>"
-                    for fix in suggested_fixes:
-                        html_body += f"<li>{fix}</li>"
-                    html_body += "</ol>"
-                
-                msg.attach(MIMEText(html_body, 'html'))
-            
-            # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
-            
-            return True
+                html_body += "<h3>🔧 Suggested Fixes:</h3><ol>"
+                for fix in suggested_fixes:
+                    html_body += f"<li>{fix}</li>"
+                html_body += "</ol>"
             
+            msg.attach(MIMEText(html_body, 'html'))
+        
+        return msg
+    
+    def _connect(self):
+        """Open an authenticated SMTP session (blocking)"""
+        import smtplib
+        
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            server.starttls()
+            server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def send_emails_batch(self, messages: List[Tuple[str, MIMEMultipart]]) -> Dict[str, bool]:
+        """
+        Send several messages over a single SMTP session (blocking)
+        
+        Args:
+            messages: List of (recipient, message) pairs
+        
+        Returns:
+            Dict mapping recipient to success status
+        """
+        import smtplib
+        
+        results = {recipient: False for recipient, _ in messages}
+        
+        try:
+            with self._connect() as server:
+                for recipient, msg in messages:
+                    try:
+                        server.send_message(msg)
+                        results[recipient] = True
+                    except smtplib.SMTPException as e:
+                        logger.error("Email send error for %s: %s", recipient, e)
+        
         except Exception as e:
-            print(f"Email send error: {e}")
-            return False
+            logger.error("Email send error: %s", e)
+        
+        return results
+    
+    def send_broadcast(self, recipients: List[str], template: MIMEMultipart) -> Dict[str, bool]:
+        """
+        Send one message to many recipients over a single SMTP session (blocking)
+        
+        The MIME parts are built once; only the To header is rewritten
+        before each send.
+        
+        Args:
+            recipients: Recipient email addresses
+            template: Message from build_message()
+        
+        Returns:
+            Dict mapping recipient to success status
+        """
+        import smtplib
+        
+        results = dict.fromkeys(recipients, False)
+        
+        try:
+            with self._connect() as server:
+                for recipient in recipients:
+                    template.replace_header('To', recipient)
+                    try:
+                        server.send_message(template)
+                        results[recipient] = True
+                    except smtplib.SMTPException as e:
+                        logger.error("Email send error for %s: %s", recipient, e)
+        
+        except Exception as e:
+            logger.error("Email send error: %s", e)
+        
+        return results
+    
+    async def send_email(
+        self,
+        to_email: str,
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None,
+        suggested_fixes: Optional[List[str]] = None,
+        timestamp: Optional[datetime] = None
+    ) -> bool:
+        """
+        Send email notification
+        
+        Args:
+            to_email: Recipient email address
+            subject: Email subject
+            body: Plain text body
+            html_body: HTML body (optional)
+            suggested_fixes: List of suggested fixes for anomalies
+            timestamp: UTC send time (defaults to now)
+        """
+        msg = self.build_message(to_email, subject, body, html_body, suggested_fixes, timestamp)
+        results = await asyncio.to_thread(self.send_emails_batch, [(to_email, msg)])
+        return results[to_email]
 
 # ============================================================================
 # SLACK SERVICE
@@ -118,13 +316,18 @@ class EmailService:
 class SlackService:
     """Slack webhook notification service"""
     
-    def __init__(self, webhook_url: str):
+    def __init__(self, webhook_url: str, http_client: Optional[httpx.AsyncClient] = None):
         self.webhook_url = webhook_url
+        if http_client is None:
+            import httpx
+            http_client = httpx.AsyncClient(timeout=10.0)
+        self.http_client = http_client
     
     async def send_notification(
         self,
         message: str,
-        severity: NotificationSeverity = NotificationSeverity.INFO
+        severity: NotificationSeverity = NotificationSeverity.INFO,
+        timestamp: Optional[datetime] = None
     ) -> bool:
         """
         Send notification to Slack channel
@@ -132,42 +335,33 @@ class SlackService:
         Args:
             message: Message text
             severity: Severity level for color coding
+            timestamp: UTC event time (defaults to now)
         """
         try:
-            # Color coding by severity
-            colors = {
-                NotificationSeverity.INFO: "#36a64f",      # Green
-                NotificationSeverity.WARNING: "#ff9900",   # Orange
-                NotificationSeverity.ERROR: "#ff0000",     # Red
-                NotificationSeverity.CRITICAL: "#8b0000"   # Dark Red
-            }
-            
-            # Emoji by severity
-            emojis = {
-                NotificationSeverity.INFO: ":information_source:",
-                NotificationSeverity.WARNING: ":warning:",
-                NotificationSeverity.ERROR: ":x:",
-                NotificationSeverity.CRITICAL: ":rotating_light:"
-            }
+            now = timestamp or datetime.now(timezone.utc)
             
             payload = {
                 "username": "System Monitor Bot",
                 "icon_emoji": ":chart_with_upwards_trend:",
                 "attachments": [
                     {
-                        "color": colors.get(severity, "#808080"),
-                        "text": f"{emojis.get(severity, ':bell:')} {message}",
+                        "color": _SLACK_COLORS.get(severity, "#808080"),
+                        "text": f"{_SLACK_EMOJIS.get(severity, ':bell:')} {message}",
                         "footer": "System Monitoring Dashboard",
-                        "ts": int(datetime.utcnow().timestamp())
+                        "ts": int(now.timestamp())
                     }
                 ]
             }
             
-            response = requests.post(self.webhook_url, json=payload)
+            response = await self.http_client.post(
+                self.webhook_url,
+                content=orjson.dumps(payload, default=str),
+                headers=_JSON_HEADERS
+            )
             return response.status_code == 200
             
         except Exception as e:
-            print(f"Slack notification error: {e}")
+            logger.error("Slack notification error: %s", e)
             return False
 
 # ============================================================================
@@ -177,17 +371,27 @@ class SlackService:
 class PagerDutyService:
     """PagerDuty incident management service"""
     
-    def __init__(self, api_key: str, service_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        service_key: str,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         self.api_key = api_key
         self.service_key = service_key
         self.events_url = "https://events.pagerduty.com/v2/enqueue"
+        if http_client is None:
+            import httpx
+            http_client = httpx.AsyncClient(timeout=10.0)
+        self.http_client = http_client
     
     async def trigger_incident(
         self,
         summary: str,
         severity: NotificationSeverity = NotificationSeverity.INFO,
         source: str = "system-monitor",
-        custom_details: Optional[Dict] = None
+        custom_details: Optional[Dict] = None,
+        timestamp: Optional[datetime] = None
     ) -> bool:
         """
         Trigger PagerDuty incident
@@ -197,38 +401,37 @@ class PagerDutyService:
             severity: Severity level
             source: Source identifier
             custom_details: Additional details
+            timestamp: UTC event time (defaults to now)
         """
         try:
+            now = timestamp or datetime.now(timezone.utc)
+            
             headers = {
                 "Content-Type": "application/json",
                 "Authorization": f"Token token={self.api_key}"
             }
             
-            # Map severity to PagerDuty levels
-            pd_severity_map = {
-                NotificationSeverity.INFO: "info",
-                NotificationSeverity.WARNING: "warning",
-                NotificationSeverity.ERROR: "error",
-                NotificationSeverity.CRITICAL: "critical"
-            }
-            
             payload = {
                 "routing_key": self.service_key,
                 "event_action": "trigger",
                 "payload": {
                     "summary": summary,
-                    "severity": pd_severity_map.get(severity, "info"),
+                    "severity": _PD_SEVERITY_MAP.get(severity, "info"),
                     "source": source,
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": now,
                     "custom_details": custom_details or {}
                 }
             }
             
-            response = requests.post(self.events_url, json=payload, headers=headers)
+            response = await self.http_client.post(
+                self.events_url,
+                content=orjson.dumps(payload, default=str),
+                headers=headers
+            )
             return response.status_code == 202
             
         except Exception as e:
-            print(f"PagerDuty incident error: {e}")
+            logger.error("PagerDuty incident error: %s", e)
             return False
     
     async def resolve_incident(self, dedup_key: str) -> bool:
@@ -245,11 +448,15 @@ class PagerDutyService:
                 "dedup_key": dedup_key
             }
             
-            response = requests.post(self.events_url, json=payload, headers=headers)
+            response = await self.http_client.post(
+                self.events_url,
+                content=orjson.dumps(payload, default=str),
+                headers=headers
+            )
             return response.status_code == 202
             
         except Exception as e:
-            print(f"PagerDuty resolve error: {e}")
+            logger.error("PagerDuty resolve error: %s", e)
             return False
 
 # ============================================================================
@@ -263,111 +470,121 @@ class NotificationManager:
         self,
         email_service: Optional[EmailService] = None,
         slack_service: Optional[SlackService] = None,
-        pagerduty_service: Optional[PagerDutyService] = None
+        pagerduty_service: Optional[PagerDutyService] = None,
+        http_client: Optional[httpx.AsyncClient] = None
     ):
         self.email_service = email_service
         self.slack_service = slack_service
         self.pagerduty_service = pagerduty_service
+        # Shared keep-alive pool for the webhook-based channels
+        self._http = http_client
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP connection pool"""
+        if self._http is not None:
+            await self._http.aclose()
     
     async def send_notification(self, notification: Notification) -> Dict[str, bool]:
         """
-        Send notification through specified channels
+        Send notification through specified channels concurrently
         
         Returns:
             Dict mapping channel names to success status
         """
         results = {}
         
-        # Send to each requested channel
-        for channel in notification.channels:
-            if channel == NotificationChannel.EMAIL and self.email_service:
-                for recipient in notification.recipients:
-                    success = await self.email_service.send_email(
-                        to_email=recipient,
-                        subject=notification.title,
-                        body=notification.message,
-                        html_body=self._create_html_body(notification),
-                        suggested_fixes=notification.metadata.get('suggested_fixes', [])
-                    )
-                    results[f"{channel}:{recipient}"] = success
-            
-            elif channel == NotificationChannel.SLACK and self.slack_service:
-                success = await self.slack_service.send_notification(
-                    message=f"*{notification.title}*\n{notification.message}",
-                    severity=notification.severity
-                )
-                results[channel] = success
-            
-            elif channel == NotificationChannel.PAGERDUTY and self.pagerduty_service:
-                success = await self.pagerduty_service.trigger_incident(
-                    summary=notification.title,
-                    severity=notification.severity,
-                    custom_details=notification.metadata
-                )
-                results[channel] = success
+        # Only channels with a configured service; duplicate recipients dropped
+        channels = [
+            c for c in notification.channels
+            if getattr(self, f"{c.value}_service", None)
+        ]
+        if not channels:
+            return results
+        recipients = list(dict.fromkeys(notification.recipients or []))
+        
+        # One clock read shared by every channel and recipient
+        now = datetime.now(timezone.utc)
+        
+        channel_results = await asyncio.gather(
+            *[self._dispatch(channel, notification, recipients, now) for channel in channels]
+        )
+        for channel_result in channel_results:
+            results.update(channel_result)
         
         return results
     
-    def _create_html_body(self, notification: Notification) -> str:
-        """Create HTML email body"""
-        severity_colors = {
-            NotificationSeverity.INFO: "#2196F3",
-            NotificationSeverity.WARNING: "#FF9800",
-            NotificationSeverity.ERROR: "#F44336",
-            NotificationSeverity.CRITICAL: "#B71C1C"
-        }
+    async def _dispatch(
+        self,
+        channel: NotificationChannel,
+        notification: Notification,
+        recipients: List[str],
+        now: datetime
+    ) -> Dict[str, bool]:
+        """Send notification to a single channel"""
+        results = {}
         
-        color = severity_colors.get(notification.severity, "#757575")
+        if channel == NotificationChannel.EMAIL:
+            if not recipients:
+                return results
+            
+            # Body is identical for every recipient; build the message once
+            template = self.email_service.build_message(
+                to_email=recipients[0],
+                subject=notification.title,
+                body=notification.message,
+                html_body=self._create_html_body(notification, now),
+                suggested_fixes=notification.metadata.get('suggested_fixes', []),
+                timestamp=now
+            )
+            # One SMTP session for all recipients, off the event loop
+            sent = await asyncio.to_thread(
+                self.email_service.send_broadcast, recipients, template
+            )
+            for recipient, success in sent.items():
+                results[f"{channel}:{recipient}"] = success
         
-        html = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; padding: 20px; background-color: #f5f5f5;">
-            <div style="max-width: 600px; margin: 0 auto; background-color: white; border-radius: 8px; overflow: hidden; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                <div style="background-color: {color}; color: white; padding: 20px;">
-                    <h2 style="margin: 0;">{notification.title}</h2>
-                    <p style="margin: 5px 0 0 0; opacity: 0.9;">System Monitoring Alert</p>
-                </div>
-                
-                <div style="padding: 20px;">
-                    <p style="font-size: 16px; line-height: 1.6; color: #333;">
-                        {notification.message}
-                    </p>
-                    
-                    {self._format_metadata_html(notification.metadata)}
-                </div>
-                
-                <div style="padding: 20px; background-color: #f5f5f5; border-top: 1px solid #ddd;">
-                    <p style="margin: 0; font-size: 12px; color: #757575;">
-                        Severity: <strong>{notification.severity.value.upper()}</strong> | 
-                        Timestamp: {datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")}
-                    </p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        elif channel == NotificationChannel.SLACK:
+            success = await self.slack_service.send_notification(
+                message=f"*{notification.title}*\n{notification.message}",
+                severity=notification.severity,
+                timestamp=now
+            )
+            results[channel] = success
+        
+        elif channel == NotificationChannel.PAGERDUTY:
+            success = await self.pagerduty_service.trigger_incident(
+                summary=notification.title,
+                severity=notification.severity,
+                custom_details=notification.metadata,
+                timestamp=now
+            )
+            results[channel] = success
         
-        return html
+        return results
+    
+    def _create_html_body(self, notification: Notification, now: datetime) -> str:
+        """Create HTML email body"""
+        return _HTML_TEMPLATE.format_map({
+            "color": _HTML_SEVERITY_COLORS.get(notification.severity, "#757575"),
+            "title": html.escape(notification.title),
+            "message": html.escape(notification.message),
+            "metadata": self._format_metadata_html(notification.metadata),
+            "severity": notification.severity.value.upper(),
+            "timestamp": now.strftime("%Y-%m-%d %H:%M:%S UTC"),
+        })
     
     def _format_metadata_html(self, metadata: Dict) -> str:
         """Format metadata as HTML table"""
         if not metadata:
             return ""
         
-        html = '<table style="width: 100%; border-collapse: collapse; margin-top: 15px;">'
-        
-        for key, value in metadata.items():
-            if key != 'suggested_fixes':  # Handled separately
-                html += f"""
-                <tr style="border-bottom: 1px solid #eee;">
-                    <td style="padding: 8px; font-weight: bold; color: #666;">{key}:</td>
-                    <td style="padding: 8px;">{value}</td>
-                </tr>
-                """
-        
-        html += '</table>'
+        rows = "".join(
+            _HTML_ROW_TEMPLATE.format(key=html.escape(str(key)), value=html.escape(str(value)))
+            for key, value in metadata.items()
+            if key != 'suggested_fixes'  # Handled separately
+        )
         
-        return html
+        return f'<table style="width: 100%; border-collapse: collapse; margin-top: 15px;">{rows}</table>'
 
 # ============================================================================
 # FACTORY FUNCTION
@@ -385,6 +602,14 @@ def create_notification_manager(
     """
     Factory function to create NotificationManager with configured services
     """
+    http_client = None
+    if slack_webhook or (pagerduty_api_key and pagerduty_service_key):
+        import httpx
+        http_client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=10)
+        )
+    
     email_service = None
     if smtp_server and smtp_username and smtp_password:
         email_service = EmailService(
@@ -396,17 +621,19 @@ def create_notification_manager(
     
     slack_service = None
     if slack_webhook:
-        slack_service = SlackService(webhook_url=slack_webhook)
+        slack_service = SlackService(webhook_url=slack_webhook, http_client=http_client)
     
     pagerduty_service = None
     if pagerduty_api_key and pagerduty_service_key:
         pagerduty_service = PagerDutyService(
             api_key=pagerduty_api_key,
-            service_key=pagerduty_service_key
+            service_key=pagerduty_service_key,
+            http_client=http_client
         )
     
     return NotificationManager(
         email_service=email_service,
         slack_service=slack_service,
-        pagerduty_service=pagerduty_service
+        pagerduty_service=pagerduty_service,
+        http_client=http_client
     )
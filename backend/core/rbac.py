@@ -3,10 +3,28 @@ Advanced Role-Based Access Control (RBAC) System
 Provides granular permission management for API endpoints
 """
 
-from fastapi import HTTPException, Depends, Header
-from typing import Optional, List
-from enum import Enum
-from pydantic import BaseModel
+import asyncio
+import hashlib
+import jwt
+import orjson
+import threading
+import time
+from cachetools import TTLCache
+from collections import deque
+from dataclasses import dataclass
+from functools import cache, reduce
+from jwt import PyJWK, PyJWKClient
+from operator import or_
+from fastapi import HTTPException, Request
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, List, Pattern, Set, Tuple
+from enum import Enum, IntFlag
+from pydantic import BaseModel, model_validator
+
+from core.clock import utc_isoformat
+from core.config import settings
+from core.logger import get_logger
+
+audit_logger = get_logger("audit")
 
 # ============================================================================
 # ROLE DEFINITIONS
@@ -19,50 +37,55 @@ class UserRole(str, Enum):
     VIEWER = "viewer"        # Read-only access
     GUEST = "guest"          # Limited read access
 
-class Permission(str, Enum):
-    """Available permissions"""
-    READ_METRICS = "read:metrics"
-    WRITE_METRICS = "write:metrics"
-    READ_INCIDENTS = "read:incidents"
-    WRITE_INCIDENTS = "write:incidents"
-    READ_USERS = "read:users"
-    WRITE_USERS = "write:users"
-    MANAGE_SETTINGS = "manage:settings"
-    DELETE_DATA = "delete:data"
-    TRIGGER_ALERTS = "trigger:alerts"
+class Permission(IntFlag):
+    """Available permissions (one bit each, so sets combine with | and &)"""
+    READ_METRICS = 1 << 0
+    WRITE_METRICS = 1 << 1
+    READ_INCIDENTS = 1 << 2
+    WRITE_INCIDENTS = 1 << 3
+    READ_USERS = 1 << 4
+    WRITE_USERS = 1 << 5
+    MANAGE_SETTINGS = 1 << 6
+    DELETE_DATA = 1 << 7
+    TRIGGER_ALERTS = 1 << 8
+    
+    @property
+    def label(self) -> str:
+        """Scope-style name, e.g. ``read:metrics``"""
+        return self.name.lower().replace("_", ":", 1)
 
 # ============================================================================
 # ROLE-PERMISSION MAPPING
 # ============================================================================
 
-ROLE_PERMISSIONS = {
-    UserRole.ADMIN: [
-        Permission.READ_METRICS,
-        Permission.WRITE_METRICS,
-        Permission.READ_INCIDENTS,
-        Permission.WRITE_INCIDENTS,
-        Permission.READ_USERS,
-        Permission.WRITE_USERS,
-        Permission.MANAGE_SETTINGS,
-        Permission.DELETE_DATA,
-        Permission.TRIGGER_ALERTS
-    ],
-    UserRole.OPERATOR: [
-        Permission.READ_METRICS,
-        Permission.WRITE_METRICS,
-        Permission.READ_INCIDENTS,
-        Permission.WRITE_INCIDENTS,
-        Permission.TRIGGER_ALERTS
-    ],
-    UserRole.VIEWER: [
-        Permission.READ_METRICS,
-        Permission.READ_INCIDENTS
-    ],
-    UserRole.GUEST: [
+ROLE_PERMISSIONS: Dict[UserRole, Permission] = {
+    UserRole.ADMIN: (
         Permission.READ_METRICS
-    ]
+        | Permission.WRITE_METRICS
+        | Permission.READ_INCIDENTS
+        | Permission.WRITE_INCIDENTS
+        | Permission.READ_USERS
+        | Permission.WRITE_USERS
+        | Permission.MANAGE_SETTINGS
+        | Permission.DELETE_DATA
+        | Permission.TRIGGER_ALERTS
+    ),
+    UserRole.OPERATOR: (
+        Permission.READ_METRICS
+        | Permission.WRITE_METRICS
+        | Permission.READ_INCIDENTS
+        | Permission.WRITE_INCIDENTS
+        | Permission.TRIGGER_ALERTS
+    ),
+    UserRole.VIEWER: Permission.READ_METRICS | Permission.READ_INCIDENTS,
+    UserRole.GUEST: Permission.READ_METRICS,
 }
 
+
+def permission_mask(permissions: Iterable[Permission]) -> int:
+    """Combine permissions into a single bitmask"""
+    return int(reduce(or_, permissions, 0))
+
 # ============================================================================
 # USER MODEL
 # ============================================================================
@@ -73,123 +96,320 @@ class User(BaseModel):
     username: str
     email: str
     role: UserRole
-    permissions: List[Permission] = []
+    permissions: int = 0  # bitmask; role grants are merged in at load time
     is_active: bool = True
     
+    @model_validator(mode='after')
+    def _apply_role_permissions(self) -> 'User':
+        self.permissions |= int(ROLE_PERMISSIONS.get(self.role, 0))
+        return self
+    
     def has_permission(self, permission: Permission) -> bool:
         """Check if user has specific permission"""
-        return permission in ROLE_PERMISSIONS.get(self.role, [])
+        return self.permissions & permission != 0
     
     def has_any_permission(self, permissions: List[Permission]) -> bool:
         """Check if user has any of the specified permissions"""
-        user_permissions = ROLE_PERMISSIONS.get(self.role, [])
-        return any(p in user_permissions for p in permissions)
+        return self.permissions & permission_mask(permissions) != 0
     
     def has_all_permissions(self, permissions: List[Permission]) -> bool:
         """Check if user has all of the specified permissions"""
-        user_permissions = ROLE_PERMISSIONS.get(self.role, [])
-        return all(p in user_permissions for p in permissions)
+        mask = permission_mask(permissions)
+        return self.permissions & mask == mask
 
 # ============================================================================
-# DEPENDENCY FUNCTIONS
+# ROUTE ACCESS RULES
 # ============================================================================
 
-async def get_current_user(authorization: Optional[str] = Header(None)) -> User:
-    """
-    Extract and validate user from authorization header
-    
-    In production, this would:
-    1. Decode JWT token
-    2. Validate signature
-    3. Check expiration
-    4. Load user from database
-    5. Return User object
-    """
-    if not authorization:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    # Mock implementation - replace with actual JWT validation
-    # For demo, parse role from header
-    token = authorization.replace("Bearer ", "")
-    
-    # In production: decode JWT and get user from database
-    # For now, return mock user
-    return User(
-        id=1,
-        username="demo_user",
-        email="user@example.com",
-        role=UserRole.ADMIN  # Change based on actual token
+# (status, headers, body) of a rejection; immutable so it can be shared
+_Rejection = Tuple[int, Tuple[Tuple[bytes, bytes], ...], bytes]
+
+
+@dataclass(frozen=True)
+class AccessRule:
+    """Access requirement recorded on an endpoint and enforced by AuthASGIMiddleware"""
+    mask: int = 0
+    any_of: bool = False
+    role: Optional[UserRole] = None
+    denied: Optional[_Rejection] = None  # pre-encoded 403 response
+    
+    def allows(self, user: User) -> bool:
+        """Check whether the user satisfies this rule"""
+        if self.role is not None and user.role != self.role:
+            return False
+        granted = user.permissions & self.mask
+        return granted != 0 if self.any_of else granted == self.mask
+
+
+def _mark(rule: AccessRule) -> Callable[[Callable], Callable]:
+    """Return a decorator that records the rule on the endpoint"""
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__access_rule__ = rule
+        return endpoint
+    
+    return decorator
+
+
+def _denied(
+    detail: str,
+    status: int = 403,
+    extra_headers: Tuple[Tuple[bytes, bytes], ...] = ()
+) -> _Rejection:
+    """Encode a rejection's body and headers once, at declaration time"""
+    body = orjson.dumps({"detail": detail})
+    headers = (
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+        *extra_headers,
     )
+    return status, headers, body
+
 
 def require_permission(permission: Permission):
     """
-    Dependency to require specific permission
+    Require a specific permission on an endpoint
     
     Usage:
-        @router.get("/admin", dependencies=[Depends(require_permission(Permission.MANAGE_SETTINGS))])
+        @router.get("/admin")
+        @require_permission(Permission.MANAGE_SETTINGS)
+        async def admin_settings(): ...
     """
-    async def permission_checker(user: User = Depends(get_current_user)):
-        if not user.has_permission(permission):
-            raise HTTPException(
-                status_code=403,
-                detail=f"Permission denied: requires {permission.value}"
-            )
-        return user
-    
-    return permission_checker
+    return _mark(AccessRule(
+        mask=int(permission),
+        denied=_denied(f"Permission denied: requires {permission.label}")
+    ))
 
 def require_any_permission(permissions: List[Permission]):
-    """Dependency to require any of the specified permissions"""
-    async def permission_checker(user: User = Depends(get_current_user)):
-        if not user.has_any_permission(permissions):
-            raise HTTPException(
-                status_code=403,
-                detail=f"Permission denied: requires one of {[p.value for p in permissions]}"
-            )
-        return user
-    
-    return permission_checker
+    """Require any of the specified permissions on an endpoint"""
+    return _mark(AccessRule(
+        mask=permission_mask(permissions),
+        any_of=True,
+        denied=_denied(f"Permission denied: requires one of {[p.label for p in permissions]}")
+    ))
 
 def require_all_permissions(permissions: List[Permission]):
-    """Dependency to require all of the specified permissions"""
-    async def permission_checker(user: User = Depends(get_current_user)):
-        if not user.has_all_permissions(permissions):
-            raise HTTPException(
-                status_code=403,
-                detail=f"Permission denied: requires all of {[p.value for p in permissions]}"
-            )
-        return user
-    
-    return permission_checker
+    """Require all of the specified permissions on an endpoint"""
+    return _mark(AccessRule(
+        mask=permission_mask(permissions),
+        denied=_denied(f"Permission denied: requires all of {[p.label for p in permissions]}")
+    ))
 
 def require_role(role: UserRole):
-    """Dependency to require specific role"""
-    async def role_checker(user: User = Depends(get_current_user)):
-        if user.role != role:
-            raise HTTPException(
-                status_code=403,
-                detail=f"Access denied: requires {role.value} role"
-            )
-        return user
-    
-    return role_checker
+    """Require a specific role on an endpoint"""
+    return _mark(AccessRule(
+        role=role,
+        denied=_denied(f"Access denied: requires {role.value} role")
+    ))
 
 def require_admin():
-    """Shortcut dependency for admin-only endpoints"""
+    """Shortcut for admin-only endpoints"""
     return require_role(UserRole.ADMIN)
 
+# ============================================================================
+# ASGI MIDDLEWARE
+# ============================================================================
+
+_NOT_AUTHENTICATED = _denied("Not authenticated", 401, ((b"www-authenticate", b"Bearer"),))
+_NOT_AUTHENTICATED_EXC = HTTPException(status_code=401, detail="Not authenticated")
+
+
+# Resolved users keyed on a token digest prefix, so repeat requests skip
+# decode and lookup until the entry expires
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+
+_JWKS_REFRESH_INTERVAL = 60.0  # seconds between forced refetches for unseen kids
+_jwks_lock = threading.Lock()
+_jwks_refreshed_at = float("-inf")
+
+# Key IDs that matched nothing even after a refetch; random kids are
+# rejected from here instead of each triggering a JWKS request
+_unknown_kids: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+
+@cache
+def _jwk_client() -> Optional[PyJWKClient]:
+    """JWKS client for JWKS_URL, or None to verify with SECRET_KEY"""
+    if not settings.JWKS_URL:
+        return None
+    return PyJWKClient(settings.JWKS_URL, cache_keys=False, lifespan=3600)
+
+
+def _signing_key(kid: str) -> Optional[PyJWK]:
+    """
+    Find ``kid`` in the cached JWK set (blocking; run off the event loop)
+    
+    A kid missing from the cached set forces a refetch at most once per
+    _JWKS_REFRESH_INTERVAL, so key rotation is picked up without letting
+    unknown kids drive a request per token.
+    """
+    global _jwks_refreshed_at
+    client = _jwk_client()
+    with _jwks_lock:
+        key = client.match_kid(client.get_signing_keys(), kid)
+        now = time.monotonic()
+        if key is None and now - _jwks_refreshed_at >= _JWKS_REFRESH_INTERVAL:
+            _jwks_refreshed_at = now
+            key = client.match_kid(client.get_signing_keys(refresh=True), kid)
+        return key
+
+
+def _load_user(
+    token: bytes,
+    key: Any,
+    algorithms: List[str],
+    options: Optional[Dict[str, Any]] = None
+) -> Optional[User]:
+    """
+    Verify a bearer token and build its User from the claims
+    
+    The algorithm is pinned by the caller (RS256 for JWKS keys,
+    JWT_ALGORITHM otherwise), so a verify costs one signature check.
+    """
+    try:
+        payload = jwt.decode(token, key, algorithms=algorithms, options=options)
+        return User(
+            id=int(payload.get("uid", 0)),
+            username=payload["sub"],
+            email=payload.get("email", ""),
+            role=UserRole(payload.get("role", UserRole.VIEWER.value))
+        )
+    except (jwt.PyJWTError, KeyError, ValueError):
+        return None
+
+
+async def resolve_user(token: bytes) -> Optional[User]:
+    """Resolve a bearer token to a User, consulting the TTL cache first"""
+    if not token:
+        return None
+    
+    cache_key = hashlib.sha256(token).digest()[:16]
+    user = _user_cache.get(cache_key)
+    if user is not None:
+        return user
+    
+    if _jwk_client() is None:
+        user = _load_user(token, settings.SECRET_KEY, [settings.JWT_ALGORITHM])
+    else:
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except jwt.PyJWTError:
+            return None
+        if not kid or kid in _unknown_kids:
+            return None
+        
+        try:
+            signing_key = await asyncio.to_thread(_signing_key, kid)
+        except jwt.PyJWKClientError:
+            return None  # endpoint unreachable or empty; don't blame the kid
+        if signing_key is None:
+            _unknown_kids[kid] = True
+            return None
+        user = _load_user(token, signing_key.key, ["RS256"], {"verify_aud": False})
+    
+    if user is not None:
+        _user_cache[cache_key] = user
+    return user
+
+
+class AuthASGIMiddleware:
+    """
+    Pure ASGI middleware that authenticates requests and enforces AccessRules
+    
+    Rules are collected once from the application's routes on the first
+    request. The resolved user is stored on ``scope["state"]["user"]`` so
+    endpoints can read it via ``request.state.user``.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+        self._rules: Optional[List[Tuple[Pattern[str], Optional[Set[str]], AccessRule]]] = None
+    
+    def _build_rules(self, routes) -> List[Tuple[Pattern[str], Optional[Set[str]], AccessRule]]:
+        rules = []
+        for route in routes:
+            rule = getattr(getattr(route, "endpoint", None), "__access_rule__", None)
+            if rule is not None:
+                rules.append((route.path_regex, getattr(route, "methods", None), rule))
+        return rules
+    
+    def _match(self, method: str, path: str) -> Optional[AccessRule]:
+        for path_regex, methods, rule in self._rules:
+            if (methods is None or method in methods) and path_regex.match(path):
+                return rule
+        return None
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        if self._rules is None:
+            self._rules = self._build_rules(scope["app"].router.routes)
+        
+        user = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                if value[:7].lower() == b"bearer ":
+                    user = await resolve_user(value[7:])
+                break
+        
+        if user is not None:
+            scope.setdefault("state", {})["user"] = user
+        
+        rule = self._match(scope["method"], scope["path"]) if self._rules else None
+        if rule is not None:
+            if user is None or not user.is_active:
+                await self._reject(send, _NOT_AUTHENTICATED)
+                return
+            if not rule.allows(user):
+                await self._reject(send, rule.denied)
+                return
+        
+        await self.app(scope, receive, send)
+    
+    @staticmethod
+    async def _reject(send, response: _Rejection):
+        # Fresh message dicts per send: outer middleware (CORS) mutates them
+        status, headers, body = response
+        await send({"type": "http.response.start", "status": status, "headers": list(headers)})
+        await send({"type": "http.response.body", "body": body})
+
+# ============================================================================
+# DEPENDENCY FUNCTIONS
+# ============================================================================
+
+async def get_current_user(request: Request) -> User:
+    """Return the user resolved by AuthASGIMiddleware"""
+    user = getattr(request.state, "user", None)
+    if user is None:
+        raise _NOT_AUTHENTICATED_EXC
+    return user
+
 # ============================================================================
 # AUDIT LOGGING
 # ============================================================================
 
+_AUDIT_BUFFER_SIZE = 100_000
+_AUDIT_FLUSH_INTERVAL = 0.1  # seconds
+
+
 class AuditLog:
-    """Audit log for RBAC actions"""
+    """Audit log for RBAC actions, written in batches by a background task"""
+    
+    _buffer: Deque[Dict[str, Any]] = deque(maxlen=_AUDIT_BUFFER_SIZE)
+    # Event and drainer are bound to the loop they were created on, so both
+    # are (re)created lazily whenever log_access runs on a different loop
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _wake: Optional[asyncio.Event] = None
+    _drainer: Optional[asyncio.Task] = None
+    dropped: int = 0
     
     @staticmethod
-    async def log_access(user: User, resource: str, action: str, success: bool):
-        """Log access attempt"""
+    def log_access(user: User, resource: str, action: str, success: bool):
+        """Record an access attempt; never blocks, oldest entries drop on overflow"""
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": utc_isoformat(),
             "user_id": user.id,
             "username": user.username,
             "role": user.role.value,
@@ -198,7 +418,35 @@ class AuditLog:
             "success": success
         }
         
-        # In production: write to database or log file
-        print(f"AUDIT: {log_entry}")
+        if len(AuditLog._buffer) == _AUDIT_BUFFER_SIZE:
+            AuditLog.dropped += 1
+        AuditLog._buffer.append(log_entry)
+        
+        loop = asyncio.get_running_loop()
+        if AuditLog._loop is not loop or AuditLog._drainer.done():
+            AuditLog._loop = loop
+            AuditLog._wake = asyncio.Event()
+            AuditLog._drainer = loop.create_task(AuditLog._drain(AuditLog._wake))
+        AuditLog._wake.set()
         
         return log_entry
+    
+    @staticmethod
+    async def _drain(wake: asyncio.Event):
+        """Write buffered entries in batches, at most every _AUDIT_FLUSH_INTERVAL"""
+        while True:
+            await wake.wait()
+            wake.clear()
+            
+            batch = list(AuditLog._buffer)
+            AuditLog._buffer.clear()
+            
+            if batch:
+                # In production: write to database or dedicated audit sink
+                audit_logger.info(
+                    "AUDIT: %d entries", len(batch),
+                    extra={"audit_entries": batch, "dropped": AuditLog.dropped}
+                )
+            
+            # Let entries accumulate into the next batch
+            await asyncio.sleep(_AUDIT_FLUSH_INTERVAL)
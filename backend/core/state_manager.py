@@ -4,17 +4,26 @@ Handles application state, caching, and session management with efficient synchr
 """
 
 import asyncio
-from typing import Dict, Any, Optional, List
+import time
+from contextlib import AsyncExitStack
+from collections import OrderedDict, deque
+from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from enum import Enum
-import json
+import orjson
+from cachetools import TTLCache
 import redis.asyncio as redis
+from redis.exceptions import ResponseError, WatchError
 from core.config import settings
 from core.logger import get_logger
 
 logger = get_logger("state_manager")
 
+_LOCK_STRIPES = 64  # power of two, so the stripe index is a mask
+_SWEEP_INTERVAL = 30  # seconds between expired-entry sweeps
+_SWEEP_BATCH = 1000
+
 
 class StateScope(Enum):
     """Scopes for state management"""
@@ -24,26 +33,70 @@ class StateScope(Enum):
     TEMPORARY = "temporary"
 
 
-@dataclass
+# Shared across workers, so Redis is authoritative and writes are awaited;
+# session/temporary state is served locally and persisted in the background
+_WRITE_THROUGH_SCOPES = frozenset({StateScope.GLOBAL, StateScope.USER})
+
+
+@dataclass(slots=True)
 class StateEntry:
     """Individual state entry with metadata"""
     key: str
     value: Any
     scope: StateScope
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    expires_at: Optional[datetime] = None
+    created_at: float = field(default_factory=time.monotonic)
+    expires_at: Optional[float] = None  # time.monotonic() deadline
     metadata: Dict[str, Any] = field(default_factory=dict)
     version: int = 0
     
     def is_expired(self) -> bool:
         """Check if entry is expired"""
-        if self.expires_at is None:
-            return False
-        return datetime.utcnow() > self.expires_at
+        return self.expires_at is not None and time.monotonic() > self.expires_at
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return asdict(self)
+        """Convert to dictionary (metadata is shared, not copied)"""
+        return {
+            "key": self.key,
+            "value": self.value,
+            "scope": self.scope.value,
+            "created_at": self.created_at,
+            "expires_at": self.expires_at,
+            "metadata": self.metadata,
+            "version": self.version
+        }
+
+
+class _LRUDict(OrderedDict):
+    """Dict that evicts the least recently used key once it exceeds maxsize"""
+    
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def get(self, key, default=None, touch: bool = True):
+        """Look up key, marking it most recently used unless touch is False"""
+        if key not in self:
+            return default
+        if touch:
+            self.move_to_end(key)
+        return self[key]
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+def _unwrap(value_json: bytes) -> Any:
+    """Decode a Redis string value; INCRBY counters are stored bare"""
+    data = orjson.loads(value_json)
+    return data["value"] if isinstance(data, dict) else data
+
+
+def _public(value: Any) -> Any:
+    """append() keeps a bounded deque internally; callers get a plain list"""
+    return list(value) if isinstance(value, deque) else value
 
 
 class StateManager:
@@ -54,8 +107,14 @@ class StateManager:
     
     def __init__(self):
         self.redis_client: Optional[redis.Redis] = None
-        self.local_state: Dict[str, StateEntry] = {}
-        self.state_lock = asyncio.Lock()
+        # Size-capped LRU; per-entry expires_at is enforced on read and by _sweeper()
+        self.local_state: _LRUDict = _LRUDict(settings.LOCAL_CACHE_MAX)
+        self._sweeper_task: Optional[asyncio.Task] = None
+        # Redis keys recently found missing, so repeat misses skip the round trip
+        self._miss_cache: TTLCache = TTLCache(maxsize=10_000, ttl=5)
+        self._pending_writes: Set[asyncio.Task] = set()
+        # Writes serialize per key stripe; reads go straight to the dict
+        self._write_locks = [asyncio.Lock() for _ in range(_LOCK_STRIPES)]
         self.metrics = {
             "gets": 0,
             "sets": 0,
@@ -71,7 +130,7 @@ class StateManager:
                 f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/"
                 f"{settings.REDIS_DB}",
                 password=settings.REDIS_PASSWORD,
-                decode_responses=True
+                decode_responses=False  # payloads stay bytes for orjson
             )
             
             # Test connection
@@ -79,15 +138,38 @@ class StateManager:
             logger.info("✅ Redis connection established")
             
         except Exception as e:
-            logger.warning(f"⚠️  Redis unavailable, using local state: {str(e)}")
+            logger.warning("⚠️  Redis unavailable, using local state: %s", e)
             self.redis_client = None
+        
+        if self._sweeper_task is None:
+            self._sweeper_task = asyncio.create_task(self._sweeper())
+    
+    async def _sweeper(self):
+        """Periodically drop expired local entries, a batch at a time"""
+        while True:
+            await asyncio.sleep(_SWEEP_INTERVAL)
+            entries = list(self.local_state.items())
+            for start in range(0, len(entries), _SWEEP_BATCH):
+                for key, entry in entries[start:start + _SWEEP_BATCH]:
+                    if entry.is_expired() and self.local_state.get(key, touch=False) is entry:
+                        self.local_state.pop(key, None)
+                # Let other tasks run between batches
+                await asyncio.sleep(0)
     
     async def cleanup(self):
         """Cleanup and close connections"""
+        if self._sweeper_task:
+            self._sweeper_task.cancel()
+            self._sweeper_task = None
+        
         if self.redis_client:
             await self.redis_client.close()
             logger.info("✅ Redis connection closed")
     
+    def _lock_for(self, key: str) -> asyncio.Lock:
+        """Write lock guarding the stripe that key hashes to"""
+        return self._write_locks[hash(key) & (_LOCK_STRIPES - 1)]
+    
     async def set(
         self,
         key: str,
@@ -97,46 +179,111 @@ class StateManager:
         metadata: Optional[Dict[str, Any]] = None
     ) -> bool:
         """Set state value with optional TTL"""
-        async with self.state_lock:
+        async with self._lock_for(key):
+            return await self._store(key, value, scope, ttl, metadata)
+    
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        scope: StateScope = StateScope.GLOBAL,
+        ttl: Optional[int] = None
+    ) -> bool:
+        """Set several state values, writing them to Redis in one pipeline"""
+        stripes = sorted({hash(key) & (_LOCK_STRIPES - 1) for key in items})
+        async with AsyncExitStack() as stack:
+            for stripe in stripes:
+                await stack.enter_async_context(self._write_locks[stripe])
             try:
-                expires_at = None
-                if ttl:
-                    expires_at = datetime.utcnow() + timedelta(seconds=ttl)
+                payloads = [
+                    self._store_local(key, value, scope, ttl)
+                    for key, value in items.items()
+                ]
                 
-                entry = StateEntry(
-                    key=key,
-                    value=value,
-                    scope=scope,
-                    expires_at=expires_at,
-                    metadata=metadata or {}
-                )
+                if self.redis_client and payloads:
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    for redis_key, value_json in payloads:
+                        pipe.set(redis_key, value_json, ex=ttl)
+                    await pipe.execute()
                 
-                # Store locally
-                self.local_state[key] = entry
-                
-                # Store in Redis if available
-                if self.redis_client:
-                    redis_key = f"{scope.value}:{key}"
-                    value_json = json.dumps({
-                        "value": value,
-                        "metadata": metadata or {},
-                        "expires_at": expires_at.isoformat() if expires_at else None
-                    })
-                    
-                    await self.redis_client.set(
-                        redis_key,
-                        value_json,
-                        ex=ttl
-                    )
-                
-                self.metrics["sets"] += 1
-                logger.debug(f"State set: {key}")
+                self.metrics["sets"] += len(payloads)
                 return True
                 
             except Exception as e:
-                logger.error(f"Error setting state {key}: {str(e)}")
+                logger.error("Error setting state batch: %s", e)
                 return False
     
+    def _store_local(
+        self,
+        key: str,
+        value: Any,
+        scope: StateScope,
+        ttl: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, bytes]:
+        """Update local state for key and return its Redis key and payload
+        
+        Write-through scopes keep no local copy while Redis is available;
+        their stale local entry, if any, is dropped instead.
+        """
+        redis_key = f"{scope.value}:{key}"
+        metadata = metadata or {}
+        
+        if self.redis_client and scope in _WRITE_THROUGH_SCOPES:
+            self.local_state.pop(key, None)
+        else:
+            self.local_state[key] = StateEntry(
+                key=key,
+                value=value,
+                scope=scope,
+                expires_at=time.monotonic() + ttl if ttl else None,
+                metadata=metadata
+            )
+        self._miss_cache.pop(redis_key, None)
+        
+        value_json = orjson.dumps({
+            "value": value,
+            "metadata": metadata,
+            "expires_at": datetime.utcnow() + timedelta(seconds=ttl) if ttl else None
+        })
+        return redis_key, value_json
+    
+    async def _store(
+        self,
+        key: str,
+        value: Any,
+        scope: StateScope,
+        ttl: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Write state locally and to Redis; caller holds the key's lock"""
+        try:
+            redis_key, value_json = self._store_local(key, value, scope, ttl, metadata)
+            
+            if self.redis_client:
+                if scope in _WRITE_THROUGH_SCOPES:
+                    # Redis is the source of truth: the write completes before returning
+                    await self.redis_client.set(redis_key, value_json, ex=ttl)
+                else:
+                    # Local copy already updated; persist in the background
+                    task = asyncio.create_task(self._write_behind(redis_key, value_json, ttl))
+                    self._pending_writes.add(task)
+                    task.add_done_callback(self._pending_writes.discard)
+            
+            self.metrics["sets"] += 1
+            logger.debug("State set: %s", key)
+            return True
+            
+        except Exception as e:
+            logger.error("Error setting state %s: %s", key, e)
+            return False
+    
+    async def _write_behind(self, redis_key: str, value_json: bytes, ttl: Optional[int]):
+        """Background Redis write for write-behind scopes"""
+        try:
+            await self.redis_client.set(redis_key, value_json, ex=ttl)
+        except Exception as e:
+            logger.error("Error writing state %s to Redis: %s", redis_key, e)
+    
     async def get(
         self,
         key: str,
@@ -144,44 +291,55 @@ class StateManager:
         default: Any = None
     ) -> Any:
         """Get state value with fallback to default"""
-        async with self.state_lock:
-            try:
-                # Check local state first
-                if key in self.local_state:
-                    entry = self.local_state[key]
-                    if not entry.is_expired():
-                        self.metrics["gets"] += 1
-                        self.metrics["cache_hits"] += 1
-                        return entry.value
-                    else:
-                        # Remove expired entry
-                        del self.local_state[key]
-                
-                # Try Redis
-                if self.redis_client:
-                    redis_key = f"{scope.value}:{key}"
-                    value_json = await self.redis_client.get(redis_key)
+        try:
+            # Write-behind scopes (and everything without Redis) are served
+            # locally first; write-through scopes ask Redis first
+            local_first = self.redis_client is None or scope not in _WRITE_THROUGH_SCOPES
+            
+            # Lock-free; expired entries are skipped here and removed by _sweeper()
+            entry = self.local_state.get(key) if local_first else None
+            if entry is not None and not entry.is_expired():
+                self.metrics["gets"] += 1
+                self.metrics["cache_hits"] += 1
+                return _public(entry.value)
+            
+            # Try Redis
+            if self.redis_client:
+                redis_key = f"{scope.value}:{key}"
+                if redis_key not in self._miss_cache:
+                    try:
+                        value_json = await self.redis_client.get(redis_key)
+                    except ResponseError:
+                        # Non-string value (append() keeps lists); use the local copy
+                        value_json = None
                     
                     if value_json:
-                        data = json.loads(value_json)
                         self.metrics["cache_hits"] += 1
-                        return data["value"]
-                
-                self.metrics["cache_misses"] += 1
-                self.metrics["gets"] += 1
-                return default
-                
-            except Exception as e:
-                logger.error(f"Error getting state {key}: {str(e)}")
-                return default
+                        return _unwrap(value_json)
+                    
+                    if not local_first:
+                        entry = self.local_state.get(key)
+                        if entry is not None and not entry.is_expired():
+                            self.metrics["gets"] += 1
+                            self.metrics["cache_hits"] += 1
+                            return _public(entry.value)
+                    
+                    self._miss_cache[redis_key] = None
+            
+            self.metrics["cache_misses"] += 1
+            self.metrics["gets"] += 1
+            return default
+            
+        except Exception as e:
+            logger.error("Error getting state %s: %s", key, e)
+            return default
     
     async def delete(self, key: str, scope: StateScope = StateScope.GLOBAL) -> bool:
         """Delete state value"""
-        async with self.state_lock:
+        async with self._lock_for(key):
             try:
                 # Delete from local state
-                if key in self.local_state:
-                    del self.local_state[key]
+                self.local_state.pop(key, None)
                 
                 # Delete from Redis
                 if self.redis_client:
@@ -189,49 +347,52 @@ class StateManager:
                     await self.redis_client.delete(redis_key)
                 
                 self.metrics["deletes"] += 1
-                logger.debug(f"State deleted: {key}")
+                logger.debug("State deleted: %s", key)
                 return True
                 
             except Exception as e:
-                logger.error(f"Error deleting state {key}: {str(e)}")
+                logger.error("Error deleting state %s: %s", key, e)
                 return False
     
     async def exists(self, key: str, scope: StateScope = StateScope.GLOBAL) -> bool:
         """Check if state key exists"""
-        async with self.state_lock:
-            if key in self.local_state:
-                return not self.local_state[key].is_expired()
-            
-            if self.redis_client:
-                redis_key = f"{scope.value}:{key}"
-                return await self.redis_client.exists(redis_key) > 0
-            
-            return False
+        entry = self.local_state.get(key)
+        if entry is not None:
+            return not entry.is_expired()
+        
+        if self.redis_client:
+            redis_key = f"{scope.value}:{key}"
+            return await self.redis_client.exists(redis_key) > 0
+        
+        return False
     
     async def get_all(self, scope: StateScope = StateScope.GLOBAL) -> Dict[str, Any]:
         """Get all state values for a scope"""
-        async with self.state_lock:
-            result = {}
-            
-            # Get from local state
-            for key, entry in self.local_state.items():
-                if entry.scope == scope and not entry.is_expired():
-                    result[key] = entry.value
-            
-            # Get from Redis
-            if self.redis_client:
-                pattern = f"{scope.value}:*"
-                keys = await self.redis_client.keys(pattern)
-                
-                for redis_key in keys:
-                    key = redis_key.replace(f"{scope.value}:", "")
-                    if key not in result:
-                        value_json = await self.redis_client.get(redis_key)
-                        if value_json:
-                            data = json.loads(value_json)
-                            result[key] = data["value"]
+        result = {}
+        
+        # Get from local state
+        for key, entry in self.local_state.items():
+            if entry.scope == scope and not entry.is_expired():
+                result[key] = _public(entry.value)
+        
+        # Get from Redis: SCAN instead of blocking KEYS, one MGET for the values
+        if self.redis_client:
+            prefix_len = len(scope.value) + 1
+            keys = []
+            redis_keys = []
+            async for redis_key in self.redis_client.scan_iter(match=f"{scope.value}:*", count=500):
+                key = redis_key[prefix_len:].decode()
+                if key not in result:
+                    keys.append(key)
+                    redis_keys.append(redis_key)
             
-            return result
+            if redis_keys:
+                values = await self.redis_client.mget(redis_keys)
+                for key, value_json in zip(keys, values):
+                    if value_json:
+                        result[key] = _unwrap(value_json)
+        
+        return result
     
     async def increment(
         self,
@@ -239,13 +400,47 @@ class StateManager:
         amount: int = 1,
         scope: StateScope = StateScope.GLOBAL
     ) -> int:
-        """Increment numeric state value"""
-        async with self.state_lock:
-            current = await self.get(key, scope, 0)
-            new_value = current + amount
-            await self.set(key, new_value, scope)
+        """Increment numeric state value (atomic INCRBY when Redis is available)
+        
+        Redis stays authoritative: if it cannot be updated the error is
+        raised rather than answered from a local count.
+        """
+        async with self._lock_for(key):
+            redis_key = f"{scope.value}:{key}"
+            if self.redis_client:
+                try:
+                    new_value = int(await self.redis_client.incrby(redis_key, amount))
+                except ResponseError:
+                    # Written by set(), so wrapped JSON rather than a bare integer
+                    new_value = await self._rewrite_counter(redis_key, amount)
+            else:
+                entry = self.local_state.get(key)
+                current = entry.value if entry is not None and not entry.is_expired() else 0
+                new_value = current + amount
+            
+            if self.redis_client and scope in _WRITE_THROUGH_SCOPES:
+                self.local_state.pop(key, None)
+            else:
+                self.local_state[key] = StateEntry(key=key, value=new_value, scope=scope)
+            self._miss_cache.pop(redis_key, None)
+            self.metrics["sets"] += 1
             return new_value
     
+    async def _rewrite_counter(self, redis_key: str, amount: int) -> int:
+        """Add to a JSON-wrapped value and store it back bare, so INCRBY works next time"""
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(redis_key)
+                    value_json = await pipe.get(redis_key)
+                    new_value = int(_unwrap(value_json) if value_json else 0) + amount
+                    pipe.multi()
+                    pipe.set(redis_key, new_value, keepttl=True)
+                    await pipe.execute()
+                    return new_value
+                except WatchError:
+                    continue  # changed by another writer; re-read
+    
     async def append(
         self,
         key: str,
@@ -253,20 +448,40 @@ class StateManager:
         scope: StateScope = StateScope.GLOBAL,
         max_size: int = 1000
     ) -> List[Any]:
-        """Append to list state value"""
-        async with self.state_lock:
-            current = await self.get(key, scope, [])
-            if not isinstance(current, list):
-                current = []
+        """Append to list state value, keeping only the most recent max_size items"""
+        async with self._lock_for(key):
+            redis_key = f"{scope.value}:{key}"
+            entry = self.local_state.get(key)
             
-            current.append(value)
+            if entry is not None and not entry.is_expired() and isinstance(entry.value, (deque, list)):
+                items = entry.value
+                if not isinstance(items, deque) or items.maxlen != max_size:
+                    items = deque(items, maxlen=max_size)
+            else:
+                items = deque(maxlen=max_size)
+                # Seed from Redis once when this process has no local copy
+                if self.redis_client:
+                    try:
+                        stored = await self.redis_client.lrange(redis_key, -max_size, -1)
+                        items.extend(orjson.loads(item) for item in stored)
+                    except Exception as e:
+                        logger.error("Error loading state %s: %s", key, e)
             
-            # Keep only recent items
-            if len(current) > max_size:
-                current = current[-max_size:]
+            items.append(value)
+            self.local_state[key] = StateEntry(key=key, value=items, scope=scope)
+            self._miss_cache.pop(redis_key, None)
+            
+            if self.redis_client:
+                try:
+                    pipe = self.redis_client.pipeline()
+                    pipe.rpush(redis_key, orjson.dumps(value))
+                    pipe.ltrim(redis_key, -max_size, -1)
+                    await pipe.execute()
+                except Exception as e:
+                    logger.error("Error appending state %s: %s", key, e)
             
-            await self.set(key, current, scope)
-            return current
+            self.metrics["sets"] += 1
+            return list(items)
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get state manager metrics"""
@@ -8,7 +8,7 @@ import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 # Import routers
 from routers import (
@@ -25,6 +25,8 @@ from routers.ingest import router as ingest_router
 
 from core.database import init_db, close_db
 from core.config import settings
+from middleware.cors import FastCORSMiddleware
+from middleware.fast_dispatch import FastDispatchMiddleware
 
 
 # ---------------------------------------------------------------------------
@@ -47,18 +49,19 @@ app = FastAPI(
                 "runs ML anomaly detection, and streams alerts over WebSocket.",
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # ---------------------------------------------------------------------------
 # Middleware
 # ---------------------------------------------------------------------------
 
+# Added first so it runs innermost, after CORS
+app.add_middleware(FastDispatchMiddleware)
+
 app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],          # tighten in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    FastCORSMiddleware,
+    origins=settings.cors_origins,  # CORS_ORIGINS_STR, comma-separated
 )
 
 # ---------------------------------------------------------------------------
@@ -139,3 +142,17 @@ async def root():
         "version": "2.0.0",
         "docs": "/docs",
     }
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # Same server stack as the Docker image: uvloop event loop + httptools parser
+    uvicorn.run(
+        "main:app",
+        host=settings.BACKEND_HOST,
+        port=settings.BACKEND_PORT,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+    )
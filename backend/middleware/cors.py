@@ -0,0 +1,77 @@
+"""
+CORS middleware with response headers pre-encoded at startup
+"""
+
+from typing import Iterable
+
+_ALLOW_METHODS = b"GET, POST, PUT, PATCH, DELETE, OPTIONS"
+_ALLOW_HEADERS = b"Authorization, Content-Type, X-API-Key"
+
+
+class FastCORSMiddleware:
+    """
+    Pure ASGI CORS middleware for a fixed origin list
+
+    Allowed origins are compared as raw header bytes; the matching origin is
+    echoed back so credentials keep working. ``"*"`` in ``origins`` allows
+    any origin. Preflight requests are answered directly without reaching
+    the application.
+    """
+
+    def __init__(
+        self,
+        app,
+        origins: Iterable[str],
+        methods: bytes = _ALLOW_METHODS,
+        headers: bytes = _ALLOW_HEADERS,
+        max_age: int = 600,
+    ):
+        self.app = app
+        origins = list(origins)
+        self.allow_all = "*" in origins
+        self.origins = frozenset(origin.encode("latin-1") for origin in origins)
+        self.simple_headers = (
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        )
+        self.preflight_headers = self.simple_headers + (
+            (b"access-control-allow-methods", methods),
+            (b"access-control-allow-headers", headers),
+            (b"access-control-max-age", str(max_age).encode()),
+            (b"content-length", b"0"),
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        preflight = False
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                preflight = True
+
+        if origin is None or not (self.allow_all or origin in self.origins):
+            await self.app(scope, receive, send)
+            return
+
+        if preflight and scope["method"] == "OPTIONS":
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"access-control-allow-origin", origin), *self.preflight_headers],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        cors_headers = ((b"access-control-allow-origin", origin),) + self.simple_headers
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *cors_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
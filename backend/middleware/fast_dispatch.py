@@ -0,0 +1,82 @@
+"""
+Exact-path route dispatch for fixed (non-parameterized) endpoints
+"""
+
+from typing import Dict, Optional, Tuple
+
+from fastapi.middleware.asyncexitstack import AsyncExitStackMiddleware
+from fastapi.routing import APIRoute
+from starlette.middleware.exceptions import ExceptionMiddleware
+
+
+class FastDispatchMiddleware:
+    """
+    Pure ASGI middleware that dispatches fixed-path routes with a dict lookup
+
+    On the first request, every APIRoute without path parameters is indexed
+    by ``(method, path)``. Matching requests are handed straight to the route
+    instead of walking the router's regex list; anything else (parameterized
+    routes, websockets, 404/405 handling, slash redirects) falls through to
+    the normal router. Register it before other middleware so it runs
+    innermost, after CORS and authentication.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: Optional[Dict[Tuple[str, str], APIRoute]] = None
+        self._router = None
+        self._handle = None
+
+    def _build(self, fastapi_app):
+        routes = {}
+        earlier = []
+        for route in fastapi_app.routes:
+            if isinstance(route, APIRoute) and not route.param_convertors:
+                for method in route.methods or ():
+                    # Skip paths an earlier route would claim in the router's
+                    # first-match scan (e.g. "/{id}" registered before "/stats")
+                    shadowed = any(
+                        regex.match(route.path) and (methods is None or method in methods)
+                        for regex, methods in earlier
+                    )
+                    if not shadowed:
+                        routes.setdefault((method, route.path), route)
+            path_regex = getattr(route, "path_regex", None)
+            if path_regex is not None:
+                earlier.append((path_regex, getattr(route, "methods", None)))
+        self._routes = routes
+        self._router = fastapi_app.router
+
+        # Same exception handling and exit stack the router normally sits
+        # behind; yield dependencies (get_db) need scope["fastapi_astack"]
+        handlers = {
+            key: handler
+            for key, handler in fastapi_app.exception_handlers.items()
+            if key not in (500, Exception)
+        }
+        self._handle = ExceptionMiddleware(
+            AsyncExitStackMiddleware(self._dispatch), handlers=handlers
+        )
+
+    @staticmethod
+    async def _dispatch(scope, receive, send):
+        await scope["route"].handle(scope, receive, send)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self._routes is None:
+            self._build(scope["app"])
+
+        route = self._routes.get((scope["method"], scope["path"]))
+        if route is None:
+            await self.app(scope, receive, send)
+            return
+
+        scope.setdefault("router", self._router)
+        scope["route"] = route
+        scope["endpoint"] = route.endpoint
+        scope["path_params"] = {}
+        await self._handle(scope, receive, send)
@@ -2,44 +2,65 @@
 Logging middleware for request/response tracking
 """
 
+import logging
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 
 from core.logger import get_logger
 
 logger = get_logger("http")
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging HTTP requests and responses"""
+class LoggingMiddleware:
+    """Pure ASGI middleware for logging HTTP requests and responses"""
 
-    async def dispatch(self, request: Request, call_next):
-        request_start_time = time.time()
+    def __init__(self, app, process_time_header: bool = False):
+        self.app = app
+        self.process_time_header = process_time_header
 
-        logger.info(
-            f"Incoming request: {request.method} {request.url.path}",
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-                "query_params": dict(request.query_params),
-                "client": request.client.host if request.client else None,
-            },
-        )
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        response = await call_next(request)
+        request_start_ns = time.monotonic_ns()
+        log_enabled = logger.isEnabledFor(logging.INFO)
+        status_code = 500
 
-        process_time = time.time() - request_start_time
+        if log_enabled:
+            client = scope.get("client")
+            logger.info(
+                "Incoming request: %s %s", scope["method"], scope["path"],
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "query_string": scope.get("query_string", b"").decode("latin-1"),
+                    "client": client[0] if client else None,
+                },
+            )
 
-        logger.info(
-            f"Request completed: {request.method} {request.url.path} - {response.status_code}",
-            extra={
-                "method": request.method,
-                "path": request.url.path,
-                "status_code": response.status_code,
-                "process_time_ms": round(process_time * 1000, 2),
-            },
-        )
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.process_time_header:
+                    process_time = (time.monotonic_ns() - request_start_ns) / 1e9
+                    message["headers"] = [
+                        *message.get("headers", ()),
+                        (b"x-process-time", str(process_time).encode()),
+                    ]
+            await send(message)
 
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if log_enabled:
+                process_time_ms = (time.monotonic_ns() - request_start_ns) / 1e6
+                logger.info(
+                    "Request completed: %s %s - %s", scope["method"], scope["path"], status_code,
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status_code": status_code,
+                        "process_time_ms": round(process_time_ms, 2),
+                    },
+                )
@@ -3,35 +3,45 @@ AI Analysis Router - Real Groq LLM Integration
 Production-ready for Hugging Face Spaces deployment
 """
 
-import os
 from datetime import datetime
-from typing import Optional, Dict, Any
+from functools import cache
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Tuple
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-import psutil
+
+from core.config import settings
+from core.logger import get_logger
+from core.metrics import host_snapshot
+
+if TYPE_CHECKING:
+    from groq import AsyncGroq
+
+logger = get_logger("ai_analysis")
 
 # ============================================================================
 # GROQ CLIENT INITIALIZATION
 # ============================================================================
 
-# Initialize Groq client from environment variable
-GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
-groq_client = None
-GROQ_AVAILABLE = False
-
-try:
-    from groq import Groq
-    if GROQ_API_KEY and GROQ_API_KEY.strip():
-        groq_client = Groq(api_key=GROQ_API_KEY)
-        GROQ_AVAILABLE = True
-        print("✅ GROQ client initialized successfully")
-    else:
-        print("⚠️ GROQ_API_KEY not set or empty")
-except ImportError:
-    print("⚠️ groq library not installed - run: pip install groq")
-except Exception as e:
-    print(f"❌ Error initializing GROQ: {e}")
+def _groq_available() -> bool:
+    """Whether a GROQ API key is configured (does not import the SDK)"""
+    return bool(settings.GROQ_API_KEY.strip())
+
+
+@cache
+def _groq() -> "AsyncGroq":
+    """Shared AsyncGroq client, created on first use with a pooled HTTP client"""
+    import httpx
+    from groq import AsyncGroq
+    
+    return AsyncGroq(
+        api_key=settings.GROQ_API_KEY,
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=30.0
+        )
+    )
 
 # ============================================================================
 # ROUTER SETUP
@@ -39,6 +49,42 @@ except Exception as e:
 
 router = APIRouter()
 
+# ============================================================================
+# PROMPTS
+# ============================================================================
+
+SYSTEM_PROMPT = """You are an expert system administrator and DevOps engineer. 
+Analyze the following system query strictly and concisely.
+Provide actionable insights based on the metrics provided.
+Keep your response under 200 words and use clear formatting."""
+
+_ANALYSIS_SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+_METRICS_CONTEXT_TEMPLATE = """
+
+CURRENT SYSTEM METRICS (Real-time):
+- CPU Usage: {cpu_percent}%
+- Memory Usage: {memory_percent}% ({memory_used_gb} GB / {memory_total_gb} GB)
+- Disk Usage: {disk_percent}% ({disk_used_gb} GB / {disk_total_gb} GB)
+- Active Processes: {process_count}
+"""
+
+_CONTEXT_HEADER = "\nADDITIONAL CONTEXT:\n"
+
+_ANOMALY_SYSTEM_MESSAGE = {"role": "system", "content": "You are a system monitoring expert. Be concise."}
+
+_ANOMALY_PROMPT_TEMPLATE = """Analyze this system anomaly briefly:
+
+Metric: {metric_name}
+Current Value: {value}%
+Historical Average: {mean}%
+Alert Threshold: {threshold}%
+
+Provide:
+1. Why this is anomalous (1 sentence)
+2. 3 possible causes
+3. 2 recommended actions"""
+
 # ============================================================================
 # PYDANTIC MODELS
 # ============================================================================
@@ -63,26 +109,49 @@ class AnalyzeResponse(BaseModel):
 # HELPER FUNCTIONS
 # ============================================================================
 
-def get_current_system_metrics() -> Dict[str, Any]:
-    """Fetch current system metrics using psutil"""
+def _get_groq_client() -> "AsyncGroq":
+    """Return the GROQ client, raising 503 when it is not configured"""
+    if not _groq_available():
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": "GROQ_API_KEY_MISSING",
+                "message": "AI analysis unavailable. GROQ_API_KEY environment variable is not set.",
+                "solution": "Add GROQ_API_KEY to your Hugging Face Space secrets."
+            }
+        )
     try:
-        cpu_percent = psutil.cpu_percent(interval=0.1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        
-        return {
-            "cpu_percent": round(cpu_percent, 2),
-            "memory_percent": round(memory.percent, 2),
-            "memory_used_gb": round(memory.used / (1024**3), 2),
-            "memory_total_gb": round(memory.total / (1024**3), 2),
-            "disk_percent": round(disk.percent, 2),
-            "disk_used_gb": round(disk.used / (1024**3), 2),
-            "disk_total_gb": round(disk.total / (1024**3), 2),
-            "process_count": len(psutil.pids())
-        }
-    except Exception as e:
-        print(f"Error fetching metrics: {e}")
-        return {}
+        return _groq()
+    except ImportError:
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "error": "GROQ_SDK_MISSING",
+                "message": "AI analysis unavailable. The groq library is not installed.",
+                "solution": "Run: pip install groq"
+            }
+        )
+
+
+async def _build_analysis_messages(request: AnalyzeRequest) -> Tuple[List[Dict[str, str]], bool]:
+    """Build the chat messages for an analysis request"""
+    parts = [f"USER QUERY: {request.query}"]
+    metrics_included = False
+    
+    # Context with current system metrics
+    if request.include_current_metrics:
+        metrics = await host_snapshot()
+        if metrics:
+            parts.append(_METRICS_CONTEXT_TEMPLATE.format_map(metrics))
+            metrics_included = True
+    
+    # User-provided context, if any
+    if request.context:
+        parts.append(_CONTEXT_HEADER)
+        parts.append("".join(f"- {key}: {value}\n" for key, value in request.context.items()))
+    
+    messages = [_ANALYSIS_SYSTEM_MESSAGE, {"role": "user", "content": "".join(parts)}]
+    return messages, metrics_included
 
 
 # ============================================================================
@@ -98,57 +167,14 @@ async def analyze_with_ai(request: AnalyzeRequest):
     - Automatically includes current system metrics
     - Returns AI-powered analysis
     """
-    
-    # Check if GROQ is available
-    if not GROQ_AVAILABLE or groq_client is None:
-        raise HTTPException(
-            status_code=503,
-            detail={
-                "error": "GROQ_API_KEY_MISSING",
-                "message": "AI analysis unavailable. GROQ_API_KEY environment variable is not set.",
-                "solution": "Add GROQ_API_KEY to your Hugging Face Space secrets."
-            }
-        )
+    groq_client = _get_groq_client()
     
     try:
-        # Build context with current system metrics
-        context_str = ""
-        metrics_included = False
-        
-        if request.include_current_metrics:
-            metrics = get_current_system_metrics()
-            if metrics:
-                context_str = f"""
-
-CURRENT SYSTEM METRICS (Real-time):
-- CPU Usage: {metrics.get('cpu_percent', 'N/A')}%
-- Memory Usage: {metrics.get('memory_percent', 'N/A')}% ({metrics.get('memory_used_gb', 'N/A')} GB / {metrics.get('memory_total_gb', 'N/A')} GB)
-- Disk Usage: {metrics.get('disk_percent', 'N/A')}% ({metrics.get('disk_used_gb', 'N/A')} GB / {metrics.get('disk_total_gb', 'N/A')} GB)
-- Active Processes: {metrics.get('process_count', 'N/A')}
-"""
-                metrics_included = True
-        
-        # Add user-provided context if any
-        if request.context:
-            context_str += "\nADDITIONAL CONTEXT:\n"
-            for key, value in request.context.items():
-                context_str += f"- {key}: {value}\n"
+        messages, metrics_included = await _build_analysis_messages(request)
         
-        # System prompt for the AI
-        system_prompt = """You are an expert system administrator and DevOps engineer. 
-Analyze the following system query strictly and concisely.
-Provide actionable insights based on the metrics provided.
-Keep your response under 200 words and use clear formatting."""
-        
-        # User prompt with query and context
-        user_prompt = f"USER QUERY: {request.query}{context_str}"
-        
-        # Call Groq API
-        chat_completion = groq_client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
+        # Call Groq API (async client, so the event loop keeps serving)
+        chat_completion = await groq_client.chat.completions.create(
+            messages=messages,
             model="llama-3.1-8b-instant",  # Fast and reliable model
             temperature=0.7,
             max_tokens=500
@@ -166,7 +192,40 @@ Keep your response under 200 words and use clear formatting."""
         )
     
     except Exception as e:
-        print(f"Error in AI analysis: {e}")
+        logger.error("Error in AI analysis: %s", e)
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "error": "ANALYSIS_FAILED",
+                "message": f"Failed to generate analysis: {str(e)}",
+                "solution": "Check your GROQ_API_KEY and try again."
+            }
+        )
+
+
+@router.post("/analyze/stream")
+async def analyze_with_ai_stream(request: AnalyzeRequest):
+    """
+    Stream the AI analysis as plain text while it is generated
+    
+    Same input as /analyze; tokens are forwarded as they arrive. Failures
+    after the response has started end the body with an
+    ``[ERROR] ANALYSIS_FAILED: ...`` line, since the status is already 200.
+    """
+    groq_client = _get_groq_client()
+    
+    messages, _ = await _build_analysis_messages(request)
+    
+    try:
+        stream = await groq_client.chat.completions.create(
+            messages=messages,
+            model="llama-3.1-8b-instant",
+            temperature=0.7,
+            max_tokens=500,
+            stream=True
+        )
+    except Exception as e:
+        logger.error("Error in AI analysis: %s", e)
         raise HTTPException(
             status_code=500,
             detail={
@@ -175,6 +234,16 @@ Keep your response under 200 words and use clear formatting."""
                 "solution": "Check your GROQ_API_KEY and try again."
             }
         )
+    
+    async def token_stream():
+        try:
+            async for chunk in stream:
+                yield chunk.choices[0].delta.content or ""
+        except Exception as e:
+            logger.error("AI analysis stream failed: %s", e)
+            yield f"\n[ERROR] ANALYSIS_FAILED: {e}\n"
+    
+    return StreamingResponse(token_stream(), media_type="text/plain")
 
 
 # ============================================================================
@@ -186,9 +255,9 @@ async def list_available_models():
     """List available AI models and their status"""
     return {
         "groq": {
-            "status": "available" if GROQ_AVAILABLE else "unavailable",
+            "status": "available" if _groq_available() else "unavailable",
             "model": "llama-3.1-8b-instant",
-            "api_key_configured": bool(GROQ_API_KEY)
+            "api_key_configured": _groq_available()
         },
         "timestamp": datetime.utcnow().isoformat()
     }
@@ -203,28 +272,21 @@ async def explain_anomaly(
 ):
     """Get AI explanation for a detected anomaly"""
     
-    if not GROQ_AVAILABLE or groq_client is None:
+    if not _groq_available():
         raise HTTPException(
             status_code=503,
             detail="AI unavailable - GROQ_API_KEY not configured"
         )
     
     try:
-        prompt = f"""Analyze this system anomaly briefly:
-
-Metric: {metric_name}
-Current Value: {value}%
-Historical Average: {mean}%
-Alert Threshold: {threshold}%
-
-Provide:
-1. Why this is anomalous (1 sentence)
-2. 3 possible causes
-3. 2 recommended actions"""
+        groq_client = _groq()
+        prompt = _ANOMALY_PROMPT_TEMPLATE.format(
+            metric_name=metric_name, value=value, mean=mean, threshold=threshold
+        )
 
-        response = groq_client.chat.completions.create(
+        response = await groq_client.chat.completions.create(
             messages=[
-                {"role": "system", "content": "You are a system monitoring expert. Be concise."},
+                _ANOMALY_SYSTEM_MESSAGE,
                 {"role": "user", "content": prompt}
             ],
             model="llama-3.1-8b-instant",
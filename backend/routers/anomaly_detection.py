@@ -7,16 +7,20 @@ authenticated user's agents.
 
 from __future__ import annotations
 
+import math
+from bisect import bisect_left
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import Iterable, List, Literal, Optional, Tuple
 
 import numpy as np
-from fastapi import APIRouter, Depends, Query, HTTPException
-from pydantic import BaseModel
+import orjson
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from pydantic import BaseModel, Field
 from sqlalchemy import select, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.auth_deps import get_current_user
+from core.clock import utc_isoformat
 from core.database import get_db
 from core.models import AnomalyEvent, MetricRecord, User
 from core.logger import get_logger
@@ -53,20 +57,56 @@ class DetectRequest(BaseModel):
     value: float
 
 
+class DetectBatchRequest(BaseModel):
+    agent_id: str
+    metric_name: str
+    values: List[float] = Field(..., min_length=1, max_length=10_000)
+
+
 # ---------------------------------------------------------------------------
 # Helpers — Z-score anomaly detection against per-agent history
 # ---------------------------------------------------------------------------
 
-async def _detect_zscore(
+ANOMALY_Z = 2.0
+# Severity bands: z <= 2.5 low, <= 3.0 medium, <= 3.5 high, above that critical
+_SEVERITY_Z = (2.5, 3.0, 3.5)
+_SEVERITY_LABELS = ("low", "medium", "high", "critical")
+_SEVERITY_LABELS_NP = np.array(_SEVERITY_LABELS)
+
+
+def _score(value: float, mean: float, std: float) -> Tuple[float, str]:
+    """Z-score of *value* and its severity label, via one table lookup."""
+    z_score = abs((value - mean) / std) if std > 0 else 0.0
+    return z_score, _SEVERITY_LABELS[bisect_left(_SEVERITY_Z, z_score)]
+
+
+def _online_mean_std(values: Iterable[Optional[float]]) -> Tuple[int, float, float]:
+    """
+    Single-pass (Welford) count, mean and population std dev, skipping
+    NULLs. Matches np.mean / np.std without building a list or array.
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for x in values:
+        if x is None:
+            continue
+        n += 1
+        delta = x - mean
+        mean += delta / n
+        m2 += delta * (x - mean)
+    return n, mean, math.sqrt(m2 / n) if n else 0.0
+
+
+async def _baseline(
     db: AsyncSession,
     user_id: str,
     agent_id: str,
     metric_name: str,
-    value: float,
-) -> dict:
+) -> Tuple[int, float, float]:
     """
-    Compute a Z-score for *value* against the last 100 readings for
-    the given agent + metric.
+    Count, mean and std dev of the last 100 readings for the given
+    agent + metric.
     """
     col = getattr(MetricRecord, metric_name, None)
     if col is None:
@@ -82,32 +122,36 @@ async def _detect_zscore(
         .limit(100)
     )
     result = await db.execute(stmt)
-    history = [float(r[0]) for r in result.all() if r[0] is not None]
+    return _online_mean_std(result.scalars())
 
-    if len(history) < 10:
-        return {"is_anomaly": False, "message": "Collecting baseline data…"}
 
-    mean = float(np.mean(history))
-    std = float(np.std(history))
-    z_score = abs((value - mean) / std) if std > 0 else 0.0
+async def _detect_zscore(
+    db: AsyncSession,
+    user_id: str,
+    agent_id: str,
+    metric_name: str,
+    value: float,
+) -> dict:
+    """
+    Compute a Z-score for *value* against the last 100 readings for
+    the given agent + metric.
+    """
+    n, mean, std = await _baseline(db, user_id, agent_id, metric_name)
 
-    is_anomaly = z_score > 2.0
-    severity = (
-        "critical" if z_score > 3.5
-        else "high" if z_score > 3.0
-        else "medium" if z_score > 2.5
-        else "low"
-    )
+    if n < 10:
+        return {"is_anomaly": False, "message": "Collecting baseline data…"}
+
+    z_score, severity = _score(value, mean, std)
 
     return {
-        "is_anomaly": is_anomaly,
+        "is_anomaly": z_score > ANOMALY_Z,
         "metric_name": metric_name,
         "value": value,
-        "z_score": round(z_score, 2),
+        "z_score": z_score,
         "severity": severity,
-        "mean": round(mean, 2),
-        "std_dev": round(std, 2),
-        "threshold": round(mean + 2 * std, 2),
+        "mean": mean,
+        "std_dev": std,
+        "threshold": mean + ANOMALY_Z * std,
     }
 
 
@@ -115,25 +159,107 @@ async def _detect_zscore(
 # Endpoints
 # ---------------------------------------------------------------------------
 
-@router.post("/detect")
+def _parse_detect_body(raw: bytes) -> Tuple[str, str, float]:
+    """
+    Read agent_id / metric_name / value straight from a /detect JSON body,
+    without building a DetectRequest model.
+    """
+    try:
+        payload = orjson.loads(raw)
+        agent_id = payload["agent_id"]
+        metric_name = payload["metric_name"]
+        value = float(payload["value"])
+    except (orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        agent_id = metric_name = None
+    if not isinstance(agent_id, str) or not isinstance(metric_name, str):
+        raise HTTPException(
+            status_code=422,
+            detail="Body must be a JSON object with string agent_id, "
+                   "string metric_name and numeric value",
+        )
+    return agent_id, metric_name, value
+
+
+@router.post(
+    "/detect",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": DetectRequest.model_json_schema()}},
+        }
+    },
+)
 async def detect_anomaly_realtime(
-    body: DetectRequest,
+    request: Request,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Run real-time Z-score anomaly detection on a single data point
     using the specific agent's historical baseline (not global data).
+
+    The body is parsed directly with orjson; use /detect/strict for full
+    schema validation errors.
     """
+    agent_id, metric_name, value = _parse_detect_body(await request.body())
+    result = await _detect_zscore(db, user.id, agent_id, metric_name, value)
+    result["timestamp"] = utc_isoformat()
+    return result
+
+
+@router.post("/detect/strict")
+async def detect_anomaly_strict(
+    body: DetectRequest,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Same as /detect, with the body validated against DetectRequest."""
     result = await _detect_zscore(db, user.id, body.agent_id, body.metric_name, body.value)
-    result["timestamp"] = datetime.now(timezone.utc).isoformat()
+    result["timestamp"] = utc_isoformat()
     return result
 
 
+@router.post("/detect/batch")
+async def detect_anomaly_batch(
+    body: DetectBatchRequest,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Score many data points against the agent's baseline in one pass.
+    Same math and thresholds as /detect, vectorised with NumPy.
+    """
+    n, mean, std = await _baseline(db, user.id, body.agent_id, body.metric_name)
+    timestamp = utc_isoformat()
+
+    if n < 10:
+        return {"results": [], "message": "Collecting baseline data…", "timestamp": timestamp}
+
+    values = np.asarray(body.values, dtype=np.float64)
+    z_scores = np.abs((values - mean) / std) if std > 0 else np.zeros_like(values)
+    is_anomaly = z_scores > ANOMALY_Z
+    severity = _SEVERITY_LABELS_NP[np.searchsorted(_SEVERITY_Z, z_scores, side="left")]
+
+    return {
+        "metric_name": body.metric_name,
+        "mean": mean,
+        "std_dev": std,
+        "threshold": mean + ANOMALY_Z * std,
+        "anomaly_count": int(is_anomaly.sum()),
+        "results": [
+            {"value": v, "z_score": z, "is_anomaly": a, "severity": sev}
+            for v, z, a, sev in zip(
+                body.values, z_scores.tolist(), is_anomaly.tolist(), severity.tolist()
+            )
+        ],
+        "timestamp": timestamp,
+    }
+
+
 @router.get("/list", response_model=AnomalyListResponse)
 async def list_anomalies(
     hours: int = Query(1, ge=1, le=168),
-    severity: Optional[str] = Query(None, pattern="^(low|medium|high|critical)$"),
+    severity: Optional[Literal["low", "medium", "high", "critical"]] = Query(None),
     agent_id: Optional[str] = Query(None),
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
@@ -171,7 +297,7 @@ async def list_anomalies(
             )
             for r in rows
         ],
-        timestamp=datetime.now(timezone.utc).isoformat(),
+        timestamp=utc_isoformat(),
     )
 
 
@@ -226,4 +352,4 @@ async def analyze_for_anomalies(
     Analyse a single data point for the given agent (same as /detect but
     with a friendlier name kept for backwards compat).
     """
-    return await detect_anomaly_realtime(body, user, db)
+    return await detect_anomaly_strict(body, user, db)
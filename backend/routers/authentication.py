@@ -2,6 +2,10 @@
 Authentication router — JWT login / register with database-backed users.
 """
 
+import asyncio
+import base64
+import hashlib
+import hmac
 from datetime import datetime, timedelta, timezone
 from typing import Optional, List
 
@@ -9,6 +13,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, EmailStr
 from jose import jwt
 import bcrypt
+import orjson
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -74,13 +79,33 @@ def _verify(plain: str, hashed: str) -> bool:
     return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("utf-8"))
 
 
+# Checked against when the username is unknown, so every login pays the same
+# bcrypt cost and response time does not reveal which usernames exist
+_DUMMY_HASH = _hash("dummy-password-for-timing")
+
+
+def _b64url(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+
+# HS256 signing inputs that never change between tokens
+_JWT_KEY = settings.SECRET_KEY.encode("utf-8")
+_JWT_HEADER_B64 = _b64url(orjson.dumps({"alg": "HS256", "typ": "JWT"}))
+
+
 def _create_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
         expires_delta or timedelta(hours=settings.JWT_EXPIRATION_HOURS)
     )
-    to_encode["exp"] = expire
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    if settings.JWT_ALGORITHM != "HS256":
+        return jwt.encode({**data, "exp": expire}, settings.SECRET_KEY,
+                          algorithm=settings.JWT_ALGORITHM)
+
+    # HS256 fast path: prebuilt header and key, HMAC signed directly
+    payload = {**data, "exp": int(expire.timestamp())}
+    signing_input = _JWT_HEADER_B64 + b"." + _b64url(orjson.dumps(payload))
+    signature = hmac.new(_JWT_KEY, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64url(signature)).decode("ascii")
 
 
 # ---------------------------------------------------------------------------
@@ -93,7 +118,9 @@ async def login(body: LoginRequest, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(User).where(User.username == body.username))
     user = result.scalar_one_or_none()
 
-    if user is None or not _verify(body.password, user.hashed_password):
+    hashed = user.hashed_password if user is not None else _DUMMY_HASH
+    password_ok = await asyncio.to_thread(_verify, body.password, hashed)
+    if user is None or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -128,7 +155,7 @@ async def register(body: RegisterRequest, db: AsyncSession = Depends(get_db)):
     user = User(
         username=body.username,
         email=body.email,
-        hashed_password=_hash(body.password),
+        hashed_password=await asyncio.to_thread(_hash, body.password),
     )
     db.add(user)
     await db.commit()
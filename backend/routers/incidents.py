@@ -10,11 +10,12 @@ All list/stats endpoints are kept in-memory for now (migrate to DB as needed).
 """
 
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, Literal, Optional
 from enum import Enum
 from fastapi import APIRouter, Depends, Query, HTTPException
 from pydantic import BaseModel
 from core.auth_deps import get_current_user
+from core.clock import utc_isoformat
 from core.models import User
 from core.logger import get_logger
 import uuid
@@ -98,6 +99,7 @@ def create_auto_incident(
         f"{metric_type} utilisation exceeded {threshold}% threshold. "
         f"Current: {metric_value:.1f}% (agent: {agent_id})"
     )
+    now = utc_isoformat()
     with INCIDENTS_LOCK:
         # De-duplicate: skip if there's already an open incident for this agent + metric
         for inc in INCIDENTS:
@@ -108,7 +110,7 @@ def create_auto_incident(
                 and inc.get("auto_generated")
             ):
                 inc["metric_value"] = metric_value
-                inc["updated_at"] = datetime.now(timezone.utc).isoformat()
+                inc["updated_at"] = utc_isoformat()
                 return
         INCIDENTS.append({
             "id": generate_incident_id(),
@@ -120,8 +122,8 @@ def create_auto_incident(
             "metric_value": metric_value,
             "threshold": threshold,
             "agent_id": agent_id,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": now,
+            "updated_at": now,
             "assignee": None,
             "auto_generated": True,
         })
@@ -130,12 +132,12 @@ def create_auto_incident(
 
 @router.get("/list")
 async def list_incidents(
-    status: str = Query("all", pattern="^(open|investigating|resolved|closed|all)$"),
+    status: Literal["open", "investigating", "resolved", "closed", "all"] = Query("all"),
     agent_id: Optional[str] = Query(None),
     user: User = Depends(get_current_user),
 ):
     """List incidents, optionally filtered by status and agent_id."""
-    logger.info("Fetching incidents for user=%s status=%s agent=%s", user.id, status, agent_id)
+    logger.debug("Fetching incidents for user=%s status=%s agent=%s", user.id, status, agent_id)
 
     with INCIDENTS_LOCK:
         results = INCIDENTS
@@ -168,7 +170,7 @@ async def get_incident_stats(user: User = Depends(get_current_user)):
             "memory": MEMORY_THRESHOLD,
             "disk": DISK_THRESHOLD,
         },
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": utc_isoformat(),
     }
 
 
@@ -179,7 +181,7 @@ async def create_incident(
 ):
     """Create a new incident manually."""
     logger.info("Creating incident: %s (user=%s)", request.title, user.id)
-    now = datetime.now(timezone.utc).isoformat()
+    now = utc_isoformat()
     new_incident = {
         "id": generate_incident_id(),
         "title": request.title,
@@ -222,7 +224,7 @@ async def update_incident(
                     incident["assignee"] = assignee
                 if severity:
                     incident["severity"] = severity
-                incident["updated_at"] = datetime.now(timezone.utc).isoformat()
+                incident["updated_at"] = utc_isoformat()
                 return incident
     raise HTTPException(status_code=404, detail=f"Incident {incident_id} not found")
 
@@ -254,7 +256,7 @@ async def resolve_incident(
         for incident in INCIDENTS:
             if incident["id"] == incident_id:
                 incident["status"] = "resolved"
-                incident["updated_at"] = datetime.now(timezone.utc).isoformat()
+                incident["updated_at"] = utc_isoformat()
                 if resolution_notes:
                     incident["description"] += f"\n\nResolution: {resolution_notes}"
                 return incident
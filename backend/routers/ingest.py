@@ -6,6 +6,7 @@ POST /api/v1/metrics/ingest
   - Persists the incoming payload to the database
   - Auto-registers the agent if it's new
   - Runs anomaly detection per-agent and pushes alerts over WebSocket
+  - Fans the snapshot out to live metric subscribers over WebSocket
 """
 
 from __future__ import annotations
@@ -156,6 +157,14 @@ async def ingest_metrics(
         except Exception as exc:
             logger.warning("Failed to push WS alert: %s", exc)
 
+    # Ingest is the single producer for live metrics; subscribers only hold
+    # their socket open and receive one shared frame per snapshot
+    try:
+        from routers.websocket import push_metric
+        await push_metric(payload.agent_id, {**payload.model_dump(), "timestamp": ts})
+    except Exception as exc:
+        logger.warning("Failed to push WS metrics: %s", exc)
+
     return IngestResponse(
         agent_id=payload.agent_id,
         recorded_at=ts.isoformat(),
@@ -17,6 +17,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.auth_deps import get_current_user
+from core.clock import utc_isoformat
 from core.database import get_db
 from core.models import MetricRecord, User
 from core.logger import get_logger
@@ -51,17 +52,17 @@ class PredictionResponse(BaseModel):
 # ---------------------------------------------------------------------------
 
 def _moving_average_forecast(
-    data: List[float], window: int = 10, steps: int = 12
+    data: np.ndarray, window: int = 10, steps: int = 12
 ) -> List[tuple[float, float]]:
     if len(data) < window:
         window = max(len(data), 1)
     ma = np.convolve(data, np.ones(window) / window, mode="valid")
     if len(ma) == 0:
-        return [(float(np.mean(data)), 0.5)] * steps
+        return [(float(data.mean()), 0.5)] * steps
 
     recent = ma[-min(20, len(ma)):]
     trend = (recent[-1] - recent[0]) / len(recent) if len(recent) > 1 else 0
-    std_dev = float(np.std(data[-window:]) if len(data) >= window else np.std(data))
+    std_dev = float(data[-window:].std())
     last_value = float(ma[-1])
 
     forecasts: list[tuple[float, float]] = []
@@ -73,7 +74,7 @@ def _moving_average_forecast(
     return forecasts
 
 
-def _anomaly_probability(data: List[float], threshold: float = 90.0) -> float:
+def _anomaly_probability(data: np.ndarray, threshold: float = 90.0) -> float:
     if len(data) < 5:
         return 0.1
     recent = data[-20:]
@@ -86,7 +87,7 @@ def _anomaly_probability(data: List[float], threshold: float = 90.0) -> float:
     elif trend > 0 and current > threshold * 0.7:
         prob = min(0.8, 0.3 + trend * 10 + (1 - dist) * 0.3)
     else:
-        prob = max(0.05, 0.2 - dist * 0.1 + float(np.std(recent)) / 100)
+        prob = max(0.05, 0.2 - dist * 0.1 + float(recent.std()) / 100)
     return round(min(0.95, max(0.05, prob)), 2)
 
 
@@ -116,7 +117,7 @@ def _explain(metric: str, current: float, forecasts: List[float], prob: float) -
 
 async def _fetch_series(
     db: AsyncSession, user_id: str, agent_id: str, column: str, limit: int = 200
-) -> List[float]:
+) -> np.ndarray:
     col = getattr(MetricRecord, column, None)
     if col is None:
         raise HTTPException(400, f"Unknown metric column: {column}")
@@ -127,8 +128,12 @@ async def _fetch_series(
         .limit(limit)
     )
     result = await db.execute(stmt)
-    # oldest-first for forecasting
-    return [float(r[0]) for r in reversed(result.all()) if r[0] is not None]
+    # One contiguous float64 array, shared by every helper below (no list
+    # -> array conversions per call); flipped to oldest-first for forecasting
+    values = np.fromiter(
+        (v for v in result.scalars() if v is not None), dtype=np.float64, count=-1
+    )
+    return values[::-1]
 
 
 # ---------------------------------------------------------------------------
@@ -151,12 +156,12 @@ async def forecast_metric(
         return PredictionResponse(
             metric_name=metric_name,
             agent_id=agent_id,
-            current_value=values[-1] if values else 0,
+            current_value=values[-1] if len(values) else 0,
             predictions=[],
             next_anomaly_probability=0.1,
             explanation="Not enough historical data yet.",
             data_points_used=len(values),
-            timestamp=datetime.now(timezone.utc).isoformat(),
+            timestamp=utc_isoformat(),
         )
 
     steps = hours * 12
@@ -217,7 +222,7 @@ async def get_anomaly_risk(
         "risk_level": level,
         "overall_probability": round(max_risk, 2),
         "metrics_risk": risks,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": utc_isoformat(),
     }
 
 
@@ -253,5 +258,5 @@ async def get_predictive_alerts(
         "agent_id": agent_id,
         "alerts": alerts,
         "total": len(alerts),
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": utc_isoformat(),
     }
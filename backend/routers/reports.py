@@ -3,16 +3,17 @@ Reports router - Email reporting functionality
 Sends HTML email reports with system status and AI analysis
 """
 
+import asyncio
 from datetime import datetime
 from typing import Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, EmailStr
 from core.logger import get_logger
 from core.config import settings
+from core.metrics import host_snapshot, network_rate
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-import psutil
 import os
 
 logger = get_logger("reports")
@@ -41,31 +42,6 @@ class ReportResponse(BaseModel):
     timestamp: datetime
 
 
-def get_current_metrics_dict() -> dict:
-    """Get current system metrics as dictionary"""
-    try:
-        cpu_percent = psutil.cpu_percent(interval=0.5)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        network = psutil.net_io_counters()
-        
-        return {
-            "cpu_percent": round(cpu_percent, 2),
-            "memory_percent": round(memory.percent, 2),
-            "memory_used_gb": round(memory.used / (1024**3), 2),
-            "memory_total_gb": round(memory.total / (1024**3), 2),
-            "disk_percent": round(disk.percent, 2),
-            "disk_used_gb": round(disk.used / (1024**3), 2),
-            "disk_total_gb": round(disk.total / (1024**3), 2),
-            "network_sent_mb": round(network.bytes_sent / (1024**2), 2),
-            "network_recv_mb": round(network.bytes_recv / (1024**2), 2),
-            "process_count": len(psutil.pids())
-        }
-    except Exception as e:
-        logger.error(f"Error getting metrics: {e}")
-        return {}
-
-
 def get_status_color(value: float, warning: float = 70, critical: float = 90) -> str:
     """Get status color based on value"""
     if value >= critical:
@@ -116,7 +92,7 @@ Focus on: overall health, any concerns, and one recommendation."""
         return f"<p>{response.choices[0].message.content}</p>"
     
     except Exception as e:
-        logger.error(f"Error getting AI analysis: {e}")
+        logger.error("Error getting AI analysis: %s", e)
         return f"<p>AI analysis unavailable: {str(e)}</p>"
 
 
@@ -239,7 +215,7 @@ def generate_html_report(metrics: dict, ai_analysis: str = "", custom_message: s
         <div class="metric-card" style="border-color: #3498db;">
             <div class="metric-title">🌐 NETWORK I/O</div>
             <div class="metric-detail">
-                ↑ Sent: {metrics.get('network_sent_mb', 0)} MB | ↓ Received: {metrics.get('network_recv_mb', 0)} MB
+                ↑ Sent: {metrics.get('network_sent_bps', 0) / 1024:.1f} KB/s | ↓ Received: {metrics.get('network_recv_bps', 0) / 1024:.1f} KB/s
             </div>
         </div>
         
@@ -277,7 +253,7 @@ async def send_report(request: ReportRequest):
     - SMTP_SERVER: SMTP server (default: smtp.gmail.com)
     - SMTP_PORT: SMTP port (default: 587)
     """
-    logger.info(f"Sending report to {request.recipient_email}")
+    logger.info("Sending report to %s", request.recipient_email)
     
     # Validate email configuration
     if not EMAIL_USER or not EMAIL_PASS:
@@ -291,11 +267,12 @@ async def send_report(request: ReportRequest):
         )
     
     try:
-        # Get current metrics
-        metrics = get_current_metrics_dict()
+        # Get current metrics; the network rate is measured for this report
+        metrics, rates = await asyncio.gather(host_snapshot(), network_rate())
         
         if not metrics:
             raise HTTPException(status_code=500, detail="Failed to collect system metrics")
+        metrics.update(rates)
         
         # Get AI analysis if requested
         ai_analysis = ""
@@ -325,7 +302,7 @@ async def send_report(request: ReportRequest):
             server.login(EMAIL_USER, EMAIL_PASS)
             server.sendmail(EMAIL_USER, request.recipient_email, msg.as_string())
         
-        logger.info(f"Report sent successfully to {request.recipient_email}")
+        logger.info("Report sent successfully to %s", request.recipient_email)
         
         return ReportResponse(
             success=True,
@@ -346,7 +323,7 @@ async def send_report(request: ReportRequest):
         )
     
     except smtplib.SMTPException as e:
-        logger.error(f"SMTP error: {e}")
+        logger.error("SMTP error: %s", e)
         raise HTTPException(
             status_code=500,
             detail={
@@ -356,7 +333,7 @@ async def send_report(request: ReportRequest):
         )
     
     except Exception as e:
-        logger.error(f"Error sending report: {e}")
+        logger.error("Error sending report: %s", e)
         raise HTTPException(
             status_code=500,
             detail={
@@ -19,6 +19,7 @@ from sqlalchemy import select, func, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.auth_deps import get_current_user
+from core.clock import utc_isoformat
 from core.database import get_db
 from core.models import Agent, MetricRecord, User
 from core.logger import get_logger
@@ -107,7 +108,7 @@ async def _get_metric_series(
         metric_name=column_name,
         data_points=data_points,
         count=len(data_points),
-        timestamp=datetime.now(timezone.utc).isoformat(),
+        timestamp=utc_isoformat(),
     )
 
 
@@ -218,7 +219,7 @@ async def get_metrics_history(
             for r in rows
         ],
         "count": len(rows),
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": utc_isoformat(),
     }
 
 
@@ -5,22 +5,72 @@ Endpoints:
   WS  /ws/alerts/{agent_id}  — subscribe to anomaly alerts for a specific agent
   WS  /ws/metrics/{agent_id} — subscribe to live metric push for a specific agent
   POST /broadcast/alert       — internal helper to push an alert to subscribers
+
+Frames are binary; both WS endpoints take ?format=json (default) or
+?format=msgpack to pick the encoding.
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
-from datetime import datetime, timezone
-from typing import Dict, List
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Literal, Optional, Set
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+import msgpack
+import orjson
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 
+from core.clock import utc_isoformat
 from core.logger import get_logger
 
 logger = get_logger("websocket")
 router = APIRouter()
 
+KEEPALIVE_INTERVAL = 30  # seconds between server → client pings
+
+
+def _msgpack_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+# wire format name → encoder producing one frame
+WIRE_FORMATS: Dict[str, Callable[[Any], bytes]] = {
+    "json": orjson.dumps,
+    "msgpack": partial(msgpack.packb, use_bin_type=True, default=_msgpack_default),
+}
+_PING_FRAMES = {fmt: encode({"type": "ping"}) for fmt, encode in WIRE_FORMATS.items()}
+
+# format → subscribers using it
+Subscribers = Dict[str, Set[WebSocket]]
+
+
+async def _send_all(conns: Set[WebSocket], data: bytes) -> int:
+    """
+    Send one pre-encoded frame to every socket in *conns* concurrently.
+    Sockets whose send fails are dropped from *conns*. Returns delivery count.
+    """
+    if not conns:
+        return 0
+    targets = list(conns)
+    results = await asyncio.gather(
+        *(ws.send_bytes(data) for ws in targets), return_exceptions=True
+    )
+    dead = {ws for ws, result in zip(targets, results) if isinstance(result, Exception)}
+    conns -= dead
+    return len(targets) - len(dead)
+
+
+async def _send_encoded(subs: Subscribers, message: dict) -> int:
+    """Encode *message* once per wire format in use and send it to *subs*."""
+    counts = await asyncio.gather(*(
+        _send_all(conns, WIRE_FORMATS[fmt](message))
+        for fmt, conns in subs.items() if conns
+    ))
+    return sum(counts)
+
 
 # ---------------------------------------------------------------------------
 # Connection Manager — keyed by agent_id
@@ -29,89 +79,113 @@ router = APIRouter()
 class AgentConnectionManager:
     """
     Manages WebSocket connections per agent_id.
-    Each agent_id has its own subscriber list.
+    Each agent_id has its own subscriber sets, one per wire format.
     """
 
     def __init__(self) -> None:
-        # agent_id → list of websockets
-        self._alert_subs: Dict[str, List[WebSocket]] = {}
-        self._metric_subs: Dict[str, List[WebSocket]] = {}
+        # agent_id → format → set of websockets
+        self._alert_subs: Dict[str, Subscribers] = {}
+        self._metric_subs: Dict[str, Subscribers] = {}
+        self._keepalive: Optional[asyncio.Task] = None
+        # agent_id → last metrics message, replayed to new subscribers
+        self._latest_metrics: Dict[str, dict] = {}
+
+    def _groups(self) -> List[Subscribers]:
+        return [*self._alert_subs.values(), *self._metric_subs.values()]
+
+    # -- keepalive ----------------------------------------------------------
+
+    def _ensure_keepalive(self) -> None:
+        if self._keepalive is None or self._keepalive.done():
+            self._keepalive = asyncio.create_task(self._keepalive_loop())
+
+    async def _keepalive_loop(self) -> None:
+        """
+        One task pings every subscriber each KEEPALIVE_INTERVAL, dropping
+        sockets that fail. Exits once nobody is subscribed.
+        """
+        while True:
+            await asyncio.sleep(KEEPALIVE_INTERVAL)
+            groups = [
+                (fmt, conns)
+                for subs in self._groups()
+                for fmt, conns in subs.items() if conns
+            ]
+            if not groups:
+                return
+            await asyncio.gather(*(_send_all(conns, _PING_FRAMES[fmt]) for fmt, conns in groups))
 
     # -- alert subscriptions ------------------------------------------------
 
-    async def connect_alerts(self, agent_id: str, ws: WebSocket) -> None:
+    async def connect_alerts(self, agent_id: str, ws: WebSocket, fmt: str = "json") -> None:
         await ws.accept()
-        self._alert_subs.setdefault(agent_id, []).append(ws)
+        subs = self._alert_subs.setdefault(agent_id, {})
+        subs.setdefault(fmt, set()).add(ws)
+        self._ensure_keepalive()
         logger.info("Alert subscriber connected for agent '%s' (total=%d)",
-                     agent_id, len(self._alert_subs[agent_id]))
+                     agent_id, sum(len(conns) for conns in subs.values()))
 
-    def disconnect_alerts(self, agent_id: str, ws: WebSocket) -> None:
-        conns = self._alert_subs.get(agent_id, [])
-        if ws in conns:
-            conns.remove(ws)
+    def disconnect_alerts(self, agent_id: str, ws: WebSocket, fmt: str = "json") -> None:
+        conns = self._alert_subs.get(agent_id, {}).get(fmt)
+        if conns is not None:
+            conns.discard(ws)
 
     async def push_alerts(self, agent_id: str, payload: dict | list) -> int:
         """Send an alert payload to all subscribers of *agent_id*. Returns delivery count."""
-        conns = self._alert_subs.get(agent_id, [])
-        sent = 0
-        message = json.dumps({
+        subs = self._alert_subs.get(agent_id)
+        if not subs:
+            return 0
+        return await _send_encoded(subs, {
             "type": "alert",
             "agent_id": agent_id,
             "data": payload,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": utc_isoformat(),
         })
-        for ws in conns[:]:
-            try:
-                await ws.send_text(message)
-                sent += 1
-            except Exception:
-                conns.remove(ws)
-        return sent
 
     # -- metric subscriptions -----------------------------------------------
 
-    async def connect_metrics(self, agent_id: str, ws: WebSocket) -> None:
+    async def connect_metrics(self, agent_id: str, ws: WebSocket, fmt: str = "json") -> None:
         await ws.accept()
-        self._metric_subs.setdefault(agent_id, []).append(ws)
+        latest = self._latest_metrics.get(agent_id)
+        if latest is not None:
+            try:
+                await ws.send_bytes(WIRE_FORMATS[fmt](latest))
+            except Exception:
+                return
+        self._metric_subs.setdefault(agent_id, {}).setdefault(fmt, set()).add(ws)
+        self._ensure_keepalive()
         logger.info("Metrics subscriber connected for agent '%s'", agent_id)
 
-    def disconnect_metrics(self, agent_id: str, ws: WebSocket) -> None:
-        conns = self._metric_subs.get(agent_id, [])
-        if ws in conns:
-            conns.remove(ws)
+    def disconnect_metrics(self, agent_id: str, ws: WebSocket, fmt: str = "json") -> None:
+        conns = self._metric_subs.get(agent_id, {}).get(fmt)
+        if conns is not None:
+            conns.discard(ws)
 
     async def push_metrics(self, agent_id: str, payload: dict) -> int:
         """Send a metric snapshot to all subscribers of *agent_id*."""
-        conns = self._metric_subs.get(agent_id, [])
-        sent = 0
-        message = json.dumps({
+        message = {
             "type": "metrics",
             "agent_id": agent_id,
             "data": payload,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        })
-        for ws in conns[:]:
-            try:
-                await ws.send_text(message)
-                sent += 1
-            except Exception:
-                conns.remove(ws)
-        return sent
+            "timestamp": utc_isoformat(),
+        }
+        self._latest_metrics[agent_id] = message
+        subs = self._metric_subs.get(agent_id)
+        if not subs:
+            return 0
+        return await _send_encoded(subs, message)
 
     # -- broadcast to ALL agent subscribers ---------------------------------
 
     async def broadcast_all(self, payload: dict) -> int:
         """Broadcast a message to every connected subscriber regardless of agent."""
-        sent = 0
-        message = json.dumps(payload)
-        for conns in list(self._alert_subs.values()) + list(self._metric_subs.values()):
-            for ws in conns[:]:
-                try:
-                    await ws.send_text(message)
-                    sent += 1
-                except Exception:
-                    conns.remove(ws)
-        return sent
+        frames = {fmt: encode(payload) for fmt, encode in WIRE_FORMATS.items()}
+        counts = await asyncio.gather(*(
+            _send_all(conns, frames[fmt])
+            for subs in self._groups()
+            for fmt, conns in subs.items() if conns
+        ))
+        return sum(counts)
 
 
 manager = AgentConnectionManager()
@@ -135,43 +209,64 @@ async def push_metric(agent_id: str, metric_snapshot: dict) -> int:
 # WebSocket endpoints
 # ---------------------------------------------------------------------------
 
+async def _hold_open(ws: WebSocket) -> None:
+    """
+    Park the connection until the client goes away. Pushes come from the
+    producers above, so incoming frames (text or binary pings) are ignored
+    without being decoded.
+    """
+    while True:
+        message = await ws.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+
+
 @router.websocket("/alerts/{agent_id}")
-async def ws_alerts(websocket: WebSocket, agent_id: str):
+async def ws_alerts(
+    websocket: WebSocket,
+    agent_id: str,
+    format: Literal["json", "msgpack"] = Query("json"),
+):
     """
     Subscribe to anomaly / critical alerts for a specific agent.
 
     The server pushes messages of the form:
         { "type": "alert", "agent_id": "...", "data": [...], "timestamp": "..." }
 
-    The client may send text frames as keep-alive pings.
+    encoded as JSON, or as MessagePack with ?format=msgpack.
+
+    The client may send text or binary frames as keep-alive pings; the
+    server sends { "type": "ping" } every KEEPALIVE_INTERVAL seconds.
     """
-    await manager.connect_alerts(agent_id, websocket)
+    await manager.connect_alerts(agent_id, websocket, format)
     try:
-        while True:
-            # Keep the connection alive; accept pings from the client
-            _ = await websocket.receive_text()
+        await _hold_open(websocket)
     except WebSocketDisconnect:
-        manager.disconnect_alerts(agent_id, websocket)
+        manager.disconnect_alerts(agent_id, websocket, format)
         logger.info("Alert subscriber disconnected for agent '%s'", agent_id)
     except Exception as exc:
-        manager.disconnect_alerts(agent_id, websocket)
+        manager.disconnect_alerts(agent_id, websocket, format)
         logger.warning("WS alerts error for '%s': %s", agent_id, exc)
 
 
 @router.websocket("/metrics/{agent_id}")
-async def ws_metrics(websocket: WebSocket, agent_id: str):
+async def ws_metrics(
+    websocket: WebSocket,
+    agent_id: str,
+    format: Literal["json", "msgpack"] = Query("json"),
+):
     """
     Subscribe to live metric snapshots for a specific agent.
-    Metrics are pushed each time the agent's data is ingested.
+    Metrics are pushed each time the agent's data is ingested, as JSON or,
+    with ?format=msgpack, as MessagePack.
     """
-    await manager.connect_metrics(agent_id, websocket)
+    await manager.connect_metrics(agent_id, websocket, format)
     try:
-        while True:
-            _ = await websocket.receive_text()
+        await _hold_open(websocket)
     except WebSocketDisconnect:
-        manager.disconnect_metrics(agent_id, websocket)
+        manager.disconnect_metrics(agent_id, websocket, format)
     except Exception as exc:
-        manager.disconnect_metrics(agent_id, websocket)
+        manager.disconnect_metrics(agent_id, websocket, format)
         logger.warning("WS metrics error for '%s': %s", agent_id, exc)
 
 
@@ -185,6 +280,6 @@ async def broadcast_alert(alert: dict):
     sent = await manager.broadcast_all({
         "type": "alert",
         "data": alert,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": utc_isoformat(),
     })
     return {"status": "broadcasted", "delivered_to": sent}
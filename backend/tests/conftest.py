@@ -0,0 +1,30 @@
+"""
+Shared fixtures for the backend test suite
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Settings are read once at import time, so pin a throwaway database and
+# the default CORS origin before anything imports core.config
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/monitoring.db"
+os.environ["CORS_ORIGINS_STR"] = "http://localhost:8501"
+os.environ.setdefault("DEBUG", "false")
+
+
+@pytest.fixture(scope="session")
+def client():
+    """TestClient over the real app, with lifespan (init_db/close_db) run"""
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
@@ -0,0 +1,33 @@
+"""
+Streaming AI analysis: failures after the response starts are reported in-band
+"""
+
+from types import SimpleNamespace
+
+from routers import ai_analysis
+
+
+class _FailingStream:
+    """Yields one token, then fails like a dropped upstream connection"""
+
+    def __aiter__(self):
+        return self._chunks()
+
+    async def _chunks(self):
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="CPU is"))])
+        raise ConnectionError("upstream closed")
+
+
+def test_stream_error_is_marked_in_body(client, monkeypatch):
+    async def create(**kwargs):
+        return _FailingStream()
+
+    fake_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    monkeypatch.setattr(ai_analysis, "_get_groq_client", lambda: fake_client)
+
+    response = client.post(
+        "/api/v1/ai/analyze/stream",
+        json={"query": "status?", "include_current_metrics": False},
+    )
+    assert response.status_code == 200
+    assert response.text == "CPU is\n[ERROR] ANALYSIS_FAILED: upstream closed\n"
@@ -0,0 +1,61 @@
+"""
+FastCORSMiddleware: preflight and simple requests for allowed origins only
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from middleware.cors import FastCORSMiddleware
+
+
+def _client(origins):
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    app.add_middleware(FastCORSMiddleware, origins=origins)
+    return TestClient(app)
+
+
+@pytest.fixture
+def cors_client():
+    return _client(["http://localhost:8501"])
+
+
+def test_allowed_origin_is_echoed(cors_client):
+    response = cors_client.get("/ping", headers={"Origin": "http://localhost:8501"})
+    assert response.json() == {"pong": True}
+    assert response.headers["access-control-allow-origin"] == "http://localhost:8501"
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["vary"] == "Origin"
+
+
+def test_other_origin_gets_no_cors_headers(cors_client):
+    response = cors_client.get("/ping", headers={"Origin": "http://evil.test"})
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_preflight_answered_without_reaching_app(cors_client):
+    response = cors_client.options("/ping", headers={
+        "Origin": "http://localhost:8501",
+        "Access-Control-Request-Method": "POST",
+    })
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["access-control-allow-headers"] == "Authorization, Content-Type, X-API-Key"
+    assert "POST" in response.headers["access-control-allow-methods"]
+    assert response.headers["access-control-max-age"] == "600"
+
+
+def test_wildcard_echoes_any_origin():
+    response = _client(["*"]).get("/ping", headers={"Origin": "http://any.test"})
+    assert response.headers["access-control-allow-origin"] == "http://any.test"
+
+
+def test_app_cors_applies_to_fast_dispatched_routes(client):
+    response = client.get("/health", headers={"Origin": "http://localhost:8501"})
+    assert response.headers["access-control-allow-origin"] == "http://localhost:8501"
@@ -0,0 +1,140 @@
+"""
+DataBuffer: column-wise ring behaves like an append-only list capped at max_size.
+DataPipeline: invalid points are rejected at ingress, not per processed batch.
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# data_pipeline lives beside backend/ at the repository root
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from data_pipeline.data_pipeline import DataBuffer, DataPipeline, DataPoint  # noqa: E402
+
+
+def _points(n, start=None, step=timedelta(seconds=1)):
+    start = start or datetime.utcnow() - timedelta(minutes=30)
+    return [
+        DataPoint(
+            timestamp=start + i * step,
+            metric_name=("cpu", "mem")[i % 2],
+            value=float(i),
+            host=f"host-{i % 3}",
+            tags={"i": str(i)},
+        )
+        for i in range(n)
+    ]
+
+
+def _rows(points):
+    return [(p.timestamp, p.metric_name, p.value, p.host, p.tags) for p in points]
+
+
+def test_ring_keeps_newest_points_in_order():
+    buffer = DataBuffer(max_size=4)
+    points = _points(7)
+    for point in points:
+        buffer.add(point)
+
+    assert buffer.size() == 4
+    assert _rows(buffer.get_recent()) == _rows(points[-4:])
+
+
+@pytest.mark.parametrize("n", [3, 4, 9])
+def test_add_batch_matches_point_by_point(n):
+    points = _points(n)
+    one_by_one = DataBuffer(max_size=4)
+    one_by_one.add(points[0])
+    for point in points[1:]:
+        one_by_one.add(point)
+
+    batched = DataBuffer(max_size=4)
+    batched.add(points[0])
+    assert batched.add_batch(points[1:]) == n - 1
+
+    assert _rows(batched.get_recent()) == _rows(one_by_one.get_recent())
+    assert batched.head == one_by_one.head
+    assert batched.metric_stats == one_by_one.metric_stats
+
+
+def test_add_batch_drops_non_finite_values():
+    buffer = DataBuffer(max_size=10)
+    points = _points(3)
+    points[1].value = float("nan")
+
+    assert buffer.add_batch(points) == 2
+    assert [p.value for p in buffer.get_recent()] == [0.0, 2.0]
+
+
+def test_time_window_on_wrapped_ring_matches_scan():
+    now = datetime.utcnow()
+    buffer = DataBuffer(max_size=8)
+    # Two hours of points, ten minutes apart; only the last 8 survive
+    buffer.add_batch(_points(13, start=now - timedelta(minutes=125), step=timedelta(minutes=10)))
+
+    windowed = _rows(buffer.get_recent(hours=1))
+    buffer._monotonic = False  # force the full scan path
+    assert windowed == _rows(buffer.get_recent(hours=1))
+    assert len(windowed) == 6
+
+
+def test_out_of_order_points_still_filtered_by_time():
+    now = datetime.utcnow()
+    buffer = DataBuffer(max_size=8)
+    buffer.add(DataPoint(now - timedelta(minutes=5), "cpu", 1.0, "h"))
+    buffer.add(DataPoint(now - timedelta(hours=3), "cpu", 2.0, "h"))
+    buffer.add(DataPoint(now - timedelta(minutes=1), "cpu", 3.0, "h"))
+
+    assert [p.value for p in buffer.get_recent("cpu", hours=1)] == [1.0, 3.0]
+
+
+def test_metric_filter_stats_and_zscore():
+    buffer = DataBuffer(max_size=100)
+    buffer.add_batch(_points(10))
+
+    assert [p.value for p in buffer.get_recent("cpu")] == [0.0, 2.0, 4.0, 6.0, 8.0]
+    assert buffer.get_recent("disk") == []
+    stats = buffer.get_stats("mem")
+    assert (stats["min"], stats["max"], stats["sum"], stats["count"]) == (1.0, 9.0, 25.0, 5)
+    assert buffer.zscore_last("cpu") == pytest.approx((8.0 - 4.0) / 8.0 ** 0.5)
+
+
+def test_dataframe_and_clear():
+    buffer = DataBuffer(max_size=4)
+    buffer.add_batch(_points(6))
+
+    frame = buffer.get_dataframe()
+    assert list(frame["value"]) == [2.0, 3.0, 4.0, 5.0]
+    assert list(frame["host"]) == ["host-2", "host-0", "host-1", "host-2"]
+
+    buffer.clear()
+    assert buffer.size() == 0
+    assert buffer.get_dataframe() is None
+
+
+def test_pipeline_drops_only_invalid_points():
+    now = datetime.utcnow()
+    good = [DataPoint(now, "cpu", 1.0, "h"), DataPoint(now, "cpu", 2, "h")]
+    bad = [DataPoint(now, "cpu", "abc", "h"), DataPoint(now, "cpu", "5", "h"), DataPoint(now, 7, 1.0, "h")]
+
+    async def scenario():
+        pipeline = DataPipeline(batch_size=10)
+        accepted = await pipeline.add_batch([good[0], *bad, good[1]])
+        single = await pipeline.add_data_point(bad[0])
+
+        pipeline.is_running = True
+        loop = asyncio.create_task(pipeline._processing_loop())
+        await asyncio.sleep(0.05)
+        pipeline.is_running = False
+        await loop
+        return pipeline, accepted, single
+
+    pipeline, accepted, single = asyncio.run(scenario())
+    assert (accepted, single) == (False, False)
+    assert [p.value for p in pipeline.buffer.get_recent()] == [1.0, 2.0]
+    metrics = pipeline.get_metrics()
+    assert (metrics["points_processed"], metrics["points_rejected"], metrics["errors"]) == (2, 4, 0)
@@ -0,0 +1,31 @@
+"""
+FastDispatchMiddleware: fixed-path routes must behave as through the router
+"""
+
+
+def test_yield_dependency_route_runs(client):
+    # POST /login depends on get_db, a yield dependency that needs the
+    # exit stack FastAPI's router normally provides
+    response = client.post(
+        "/api/v1/auth/login", json={"username": "nobody", "password": "wrong"}
+    )
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Invalid credentials"}
+
+
+def test_authenticated_route_without_token(client):
+    response = client.get("/api/v1/incidents/list")
+    assert response.status_code == 401
+
+
+def test_fixed_route_served(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+
+
+def test_unknown_path_falls_through_to_router(client):
+    assert client.get("/api/v1/no-such-route").status_code == 404
+
+
+def test_wrong_method_falls_through_to_router(client):
+    assert client.get("/api/v1/auth/login").status_code == 405
@@ -0,0 +1,28 @@
+"""
+LoggingMiddleware: request start/finish records and the process-time header
+"""
+
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from middleware.logging_middleware import LoggingMiddleware
+
+
+def test_logs_request_and_sets_process_time(caplog):
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    app.add_middleware(LoggingMiddleware, process_time_header=True)
+
+    with caplog.at_level(logging.INFO):
+        response = TestClient(app).get("/ping?x=1")
+
+    assert float(response.headers["x-process-time"]) >= 0
+    messages = [r.getMessage() for r in caplog.records]
+    assert "Incoming request: GET /ping" in messages
+    assert "Request completed: GET /ping - 200" in messages
@@ -0,0 +1,29 @@
+"""
+Host metrics: the network rate is measured over its own window
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import psutil
+
+from core import metrics
+
+
+def test_network_rate_uses_its_own_window(monkeypatch):
+    reads = iter([
+        SimpleNamespace(bytes_sent=1_000, bytes_recv=5_000),
+        SimpleNamespace(bytes_sent=1_500, bytes_recv=4_000),  # recv counter reset
+    ])
+    monkeypatch.setattr(psutil, "net_io_counters", lambda: next(reads))
+
+    rates = asyncio.run(metrics.network_rate(window=0.05))
+    assert 0 < rates["network_sent_bps"] <= 500 / 0.05
+    assert rates["network_recv_bps"] == 0
+
+
+def test_host_snapshot_reports_totals():
+    snapshot = asyncio.run(metrics.host_snapshot())
+    assert snapshot["network_sent_mb"] >= 0
+    assert snapshot["network_recv_mb"] >= 0
+    assert "network_sent_bps" not in snapshot
@@ -0,0 +1,161 @@
+"""
+RBAC: AuthASGIMiddleware enforcement and the audit log
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jwt import PyJWKClient
+
+from core import rbac
+from core.config import settings
+from core.rbac import (
+    AuditLog,
+    AuthASGIMiddleware,
+    Permission,
+    User,
+    UserRole,
+    require_permission,
+)
+from middleware.cors import FastCORSMiddleware
+
+
+@pytest.fixture
+def guarded_client():
+    app = FastAPI()
+
+    @app.get("/open")
+    async def open_endpoint():
+        return {"ok": True}
+
+    @app.get("/guarded")
+    @require_permission(Permission.MANAGE_SETTINGS)
+    async def guarded_endpoint():
+        return {"ok": True}
+
+    app.add_middleware(AuthASGIMiddleware)
+    app.add_middleware(FastCORSMiddleware, origins=["http://a.test", "http://b.test"])
+    return TestClient(app)
+
+
+def test_open_route_needs_no_token(guarded_client):
+    assert guarded_client.get("/open").json() == {"ok": True}
+
+
+def test_guarded_route_without_token_is_401(guarded_client):
+    response = guarded_client.get("/guarded")
+    assert response.status_code == 401
+    assert response.headers["www-authenticate"] == "Bearer"
+    assert response.json() == {"detail": "Not authenticated"}
+
+
+def _bearer(role):
+    token = jwt.encode({"sub": role, "role": role}, settings.SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_guarded_route_checks_permissions(guarded_client):
+    assert guarded_client.get("/guarded", headers=_bearer("admin")).status_code == 200
+
+    response = guarded_client.get("/guarded", headers=_bearer("viewer"))
+    assert response.status_code == 403
+    assert response.json() == {"detail": "Permission denied: requires manage:settings"}
+
+
+def test_rejections_do_not_accumulate_cors_headers(guarded_client):
+    first = guarded_client.get("/guarded", headers={"Origin": "http://a.test"})
+    second = guarded_client.get("/guarded", headers={"Origin": "http://b.test"})
+    third = guarded_client.get("/guarded")
+
+    assert first.headers.get_list("access-control-allow-origin") == ["http://a.test"]
+    assert second.headers.get_list("access-control-allow-origin") == ["http://b.test"]
+    assert "access-control-allow-origin" not in third.headers
+
+
+def test_audit_log_survives_a_new_event_loop():
+    user = User(id=1, username="alice", email="alice@example.com", role=UserRole.VIEWER)
+
+    async def log_and_flush():
+        AuditLog.log_access(user, "/metrics", "read", True)
+        await asyncio.sleep(0.01)
+        return len(AuditLog._buffer)
+
+    # Each asyncio.run() gets a fresh loop; the second must not reuse the
+    # first loop's Event or drainer task
+    assert asyncio.run(log_and_flush()) == 0
+    assert asyncio.run(log_and_flush()) == 0
+
+
+# ---------------------------------------------------------------------------
+# Token resolution
+# ---------------------------------------------------------------------------
+
+class _FakeJWKClient:
+    """Stands in for PyJWKClient; counts forced refetches"""
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.refreshes = 0
+
+    def get_signing_keys(self, refresh=False):
+        self.refreshes += refresh
+        return self.keys
+
+    match_kid = staticmethod(PyJWKClient.match_kid)
+
+
+@pytest.fixture
+def rsa_jwks(monkeypatch):
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    signing_key = SimpleNamespace(key_id="good", key=private_key.public_key())
+    client = _FakeJWKClient([signing_key])
+
+    monkeypatch.setattr(rbac, "_jwk_client", lambda: client)
+    monkeypatch.setattr(rbac, "_jwks_refreshed_at", float("-inf"))
+    rbac._unknown_kids.clear()
+    rbac._user_cache.clear()
+    return private_key, client
+
+
+def test_resolve_user_with_secret_key():
+    token = jwt.encode(
+        {"sub": "alice", "uid": 7, "role": "operator"},
+        settings.SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM,
+    ).encode()
+
+    user = asyncio.run(rbac.resolve_user(token))
+    assert (user.id, user.username, user.role) == (7, "alice", UserRole.OPERATOR)
+    assert asyncio.run(rbac.resolve_user(b"not-a-token")) is None
+
+
+def test_resolve_user_with_jwks(rsa_jwks):
+    private_key, _ = rsa_jwks
+    token = jwt.encode(
+        {"sub": "bob"}, private_key, algorithm="RS256", headers={"kid": "good"}
+    ).encode()
+
+    user = asyncio.run(rbac.resolve_user(token))
+    assert user.username == "bob"
+
+
+def test_unknown_kids_do_not_refetch_per_token(rsa_jwks):
+    private_key, client = rsa_jwks
+
+    async def resolve_many():
+        for i in range(20):
+            token = jwt.encode(
+                {"sub": "eve"}, private_key, algorithm="RS256", headers={"kid": f"rand-{i}"}
+            ).encode()
+            assert await rbac.resolve_user(token) is None
+            assert await rbac.resolve_user(token) is None
+
+    asyncio.run(resolve_many())
+    assert client.refreshes == 1
+    assert "rand-0" in rbac._unknown_kids
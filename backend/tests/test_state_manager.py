@@ -0,0 +1,97 @@
+"""
+StateManager against a fake Redis and in local-only mode
+"""
+
+import asyncio
+
+import orjson
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from core.state_manager import StateManager, StateScope  # noqa: E402
+
+
+def _run(coro_fn):
+    return asyncio.run(coro_fn())
+
+
+def _manager(with_redis: bool) -> StateManager:
+    manager = StateManager()
+    if with_redis:
+        manager.redis_client = fakeredis.aioredis.FakeRedis()
+    return manager
+
+
+@pytest.mark.parametrize("with_redis", [True, False])
+def test_set_get_delete(with_redis):
+    async def scenario():
+        manager = _manager(with_redis)
+        assert await manager.set("k", {"a": 1})
+        assert await manager.get("k") == {"a": 1}
+        assert await manager.delete("k")
+        return await manager.get("k", default="gone")
+
+    assert _run(scenario) == "gone"
+
+
+def test_increment_counts_in_redis():
+    async def scenario():
+        manager = _manager(True)
+        assert await manager.increment("hits") == 1
+        assert await manager.increment("hits", 4) == 5
+        return await manager.redis_client.get("global:hits"), await manager.get("hits")
+
+    assert _run(scenario) == (b"5", 5)
+
+
+def test_increment_after_set_agrees_with_redis():
+    async def scenario():
+        manager = _manager(True)
+        await manager.set("c", 5)
+        first = await manager.increment("c")
+        second = await manager.increment("c", 2)
+        return first, second, await manager.get("c")
+
+    assert _run(scenario) == (6, 8, 8)
+
+
+def test_increment_non_numeric_value_raises():
+    async def scenario():
+        manager = _manager(True)
+        await manager.set("name", "alice")
+        await manager.increment("name")
+
+    with pytest.raises(ValueError):
+        _run(scenario)
+
+
+def test_increment_without_redis():
+    async def scenario():
+        manager = _manager(False)
+        await manager.increment("c", 3)
+        return await manager.increment("c")
+
+    assert _run(scenario) == 4
+
+
+@pytest.mark.parametrize("with_redis", [True, False])
+def test_append_returns_serializable_bounded_list(with_redis):
+    async def scenario():
+        manager = _manager(with_redis)
+        for i in range(5):
+            items = await manager.append("events", i, scope=StateScope.SESSION, max_size=3)
+        return items, await manager.get("events", scope=StateScope.SESSION)
+
+    items, stored = _run(scenario)
+    assert items == stored == [2, 3, 4]
+    assert orjson.loads(orjson.dumps(items)) == [2, 3, 4]
+
+
+def test_set_many_and_get_all():
+    async def scenario():
+        manager = _manager(True)
+        await manager.set_many({"a": 1, "b": 2})
+        return await manager.get_all()
+
+    assert _run(scenario) == {"a": 1, "b": 2}
@@ -0,0 +1,18 @@
+"""
+WebSocket endpoints: wire format selection
+"""
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+
+def test_unknown_format_is_rejected(client):
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/ws/metrics/agent-1?format=xml") as ws:
+            ws.receive_bytes()
+
+
+@pytest.mark.parametrize("fmt", ["json", "msgpack"])
+def test_known_formats_accepted(client, fmt):
+    with client.websocket_connect(f"/ws/alerts/agent-1?format={fmt}") as ws:
+        ws.close()
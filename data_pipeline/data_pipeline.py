@@ -3,19 +3,26 @@ Data Pipeline - Efficient data collection, processing, and state management
 """
 
 import asyncio
+import time
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass
 import logging
+import numpy as np
 import pandas as pd
-from collections import deque
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class DataPoint:
-    """Single data point with metadata"""
+    """
+    Single data point with metadata
+
+    Producers must supply a numeric value and a str metric_name;
+    DataPipeline rejects other points at ingress, and DataBuffer itself
+    does not type-check them.
+    """
     timestamp: datetime
     metric_name: str
     value: float
@@ -32,44 +39,249 @@ class DataPoint:
         }
 
 
+# Naive UTC epoch; DataPoint timestamps are naive UTC like datetime.utcnow()
+_EPOCH = datetime(1970, 1, 1)
+_NS_PER_HOUR = 3_600_000_000_000
+
+
+def _is_valid(data_point: DataPoint) -> bool:
+    """Ingress check: numeric value and str metric name"""
+    return isinstance(data_point.value, (int, float)) and isinstance(data_point.metric_name, str)
+
+
+def _to_ns(ts: datetime) -> int:
+    """Naive-UTC (or aware) datetime to integer epoch nanoseconds"""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return (ts - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
 class DataBuffer:
     """
     Efficient circular buffer for storing metrics
     Automatically rotates old data
+
+    Column-oriented: timestamps (epoch ns), values and interned metric/host
+    ids live in preallocated NumPy arrays written in place, so filtering and
+    DataFrame construction run vectorized instead of per DataPoint.
     """
     
     def __init__(self, max_size: int = 10000):
         self.max_size = max_size
-        self.buffer: deque = deque(maxlen=max_size)
+        self.ts = np.empty(max_size, dtype="int64")
+        self.val = np.empty(max_size, dtype="float64")
+        self.metric_id = np.empty(max_size, dtype="int32")
+        self.host_id = np.empty(max_size, dtype="int32")
+        self.tags: List[Optional[Dict[str, str]]] = [None] * max_size
+        self.head = 0   # next slot to write
+        self.count = 0  # number of filled slots
+        # True while points have arrived in non-decreasing time order, which
+        # lets time-window queries binary search instead of scanning
+        self._monotonic = True
+        self._last_ns = 0
+        self._metric_ids: Dict[str, int] = {}
+        self._metric_names: List[str] = []
+        self._host_ids: Dict[str, int] = {}
+        self._host_names: List[str] = []
         self.metric_stats: Dict[str, Dict[str, float]] = {}
     
+    @staticmethod
+    def _intern(name: str, ids: Dict[str, int], names: List[str]) -> int:
+        """Map a string to a small integer id, assigning a new one if unseen"""
+        idx = ids.get(name)
+        if idx is None:
+            idx = ids[name] = len(names)
+            names.append(name)
+        return idx
+    
+    def _write(
+        self,
+        ts_ns: int,
+        metric_name: str,
+        value: float,
+        host: str,
+        tags: Optional[Dict[str, str]]
+    ):
+        """Write one sample into the next ring slot"""
+        i = self.head
+        if self.count and ts_ns < self._last_ns:
+            self._monotonic = False
+        self._last_ns = ts_ns
+        self.ts[i] = ts_ns
+        self.val[i] = value
+        self.metric_id[i] = self._intern(metric_name, self._metric_ids, self._metric_names)
+        self.host_id[i] = self._intern(host, self._host_ids, self._host_names)
+        self.tags[i] = tags
+        self.head = (i + 1) % self.max_size
+        if self.count < self.max_size:
+            self.count += 1
+    
     def add(self, data_point: DataPoint):
         """Add data point to buffer"""
-        self.buffer.append(data_point)
-        self._update_stats(data_point)
+        self._write(
+            _to_ns(data_point.timestamp),
+            data_point.metric_name,
+            data_point.value,
+            data_point.host,
+            data_point.tags
+        )
+        self._update_stats(data_point.metric_name, data_point.value, data_point.timestamp)
     
-    def add_batch(self, data_points: List[DataPoint]):
-        """Add batch of data points"""
-        for dp in data_points:
-            self.add(dp)
+    def add_raw(
+        self,
+        ts_ns: int,
+        metric_name: str,
+        value: float,
+        host: str,
+        tags: Optional[Dict[str, str]] = None
+    ):
+        """
+        Add a sample given as plain values (timestamp in epoch ns), skipping
+        the DataPoint allocation for high-rate producers
+        """
+        self._write(ts_ns, metric_name, value, host, tags)
+        self._update_stats(metric_name, value, _EPOCH + timedelta(microseconds=ts_ns // 1000))
     
-    def _update_stats(self, dp: DataPoint):
+    def add_batch(self, data_points: List[DataPoint]) -> int:
+        """
+        Add batch of data points with one vectorized write and stats update.
+        Points with a NaN/inf value are dropped. Returns the number stored.
+        """
+        n = len(data_points)
+        if n == 0:
+            return 0
+        
+        val = np.fromiter((dp.value for dp in data_points), dtype="float64", count=n)
+        finite = np.isfinite(val)
+        if not finite.all():
+            logger.warning("Dropping %d non-finite data points", n - int(finite.sum()))
+            data_points = [dp for dp, ok in zip(data_points, finite.tolist()) if ok]
+            val = val[finite]
+            n = len(data_points)
+            if n == 0:
+                return 0
+        
+        intern = self._intern
+        ts = np.fromiter((_to_ns(dp.timestamp) for dp in data_points), dtype="int64", count=n)
+        mid = np.fromiter(
+            (intern(dp.metric_name, self._metric_ids, self._metric_names) for dp in data_points),
+            dtype="int32", count=n
+        )
+        hid = np.fromiter(
+            (intern(dp.host, self._host_ids, self._host_names) for dp in data_points),
+            dtype="int32", count=n
+        )
+        if (self.count and ts[0] < self._last_ns) or np.any(ts[1:] < ts[:-1]):
+            self._monotonic = False
+        self._last_ns = int(ts[-1])
+        
+        # Only the newest max_size points survive; write them where a
+        # point-by-point add would have left them
+        keep = min(n, self.max_size)
+        pos = (self.head + (n - keep) + np.arange(keep)) % self.max_size
+        self.ts[pos] = ts[n - keep:]
+        self.val[pos] = val[n - keep:]
+        self.metric_id[pos] = mid[n - keep:]
+        self.host_id[pos] = hid[n - keep:]
+        for slot, dp in zip(pos.tolist(), data_points[n - keep:]):
+            self.tags[slot] = dp.tags
+        self.head = (self.head + n) % self.max_size
+        self.count = min(self.count + n, self.max_size)
+        
+        self._update_stats_batch(data_points, val, mid)
+        return n
+    
+    def _update_stats(self, metric_name: str, value: float, timestamp: datetime):
         """Update running statistics"""
-        if dp.metric_name not in self.metric_stats:
-            self.metric_stats[dp.metric_name] = {
-                "min": dp.value,
-                "max": dp.value,
+        if metric_name not in self.metric_stats:
+            self.metric_stats[metric_name] = {
+                "min": value,
+                "max": value,
                 "sum": 0,
                 "count": 0,
-                "last_update": dp.timestamp
+                "last_update": timestamp
             }
         
-        stats = self.metric_stats[dp.metric_name]
-        stats["min"] = min(stats["min"], dp.value)
-        stats["max"] = max(stats["max"], dp.value)
-        stats["sum"] += dp.value
+        stats = self.metric_stats[metric_name]
+        stats["min"] = min(stats["min"], value)
+        stats["max"] = max(stats["max"], value)
+        stats["sum"] += value
         stats["count"] += 1
-        stats["last_update"] = dp.timestamp
+        stats["last_update"] = timestamp
+    
+    def _update_stats_batch(self, data_points: List[DataPoint], val: np.ndarray, mid: np.ndarray):
+        """Fold a batch into the running statistics with one dict update per metric"""
+        order = np.argsort(mid, kind="stable")
+        grouped = val[order]
+        metric_ids, starts = np.unique(mid[order], return_index=True)
+        ends = np.append(starts[1:], len(grouped))
+        
+        mins = np.minimum.reduceat(grouped, starts)
+        maxs = np.maximum.reduceat(grouped, starts)
+        sums = np.add.reduceat(grouped, starts)
+        counts = ends - starts
+        # Stable sort keeps insertion order inside a group, so its last
+        # element is the metric's most recently added point
+        last = order[ends - 1]
+        
+        for m, lo, hi, total, cnt, i in zip(
+            metric_ids.tolist(), mins.tolist(), maxs.tolist(),
+            sums.tolist(), counts.tolist(), last.tolist()
+        ):
+            name = self._metric_names[m]
+            stats = self.metric_stats.get(name)
+            if stats is None:
+                self.metric_stats[name] = {
+                    "min": lo,
+                    "max": hi,
+                    "sum": total,
+                    "count": cnt,
+                    "last_update": data_points[i].timestamp
+                }
+                continue
+            stats["min"] = min(stats["min"], lo)
+            stats["max"] = max(stats["max"], hi)
+            stats["sum"] += total
+            stats["count"] += cnt
+            stats["last_update"] = data_points[i].timestamp
+    
+    def _indices(self) -> np.ndarray:
+        """Slot indices of the stored points, oldest first"""
+        if self.count < self.max_size:
+            return np.arange(self.count)
+        return (np.arange(self.max_size) + self.head) % self.max_size
+    
+    def _window(self, cutoff_ns: int) -> np.ndarray:
+        """
+        Slot indices with ts >= cutoff_ns, oldest first, found by binary
+        search over the (at most two) sorted runs of the ring
+        """
+        if self.count < self.max_size:
+            start = int(np.searchsorted(self.ts[:self.count], cutoff_ns, side="left"))
+            return np.arange(start, self.count)
+        
+        head = self.head
+        older = self.ts[head:]
+        if cutoff_ns <= older[-1]:
+            start = head + int(np.searchsorted(older, cutoff_ns, side="left"))
+            return np.concatenate((np.arange(start, self.max_size), np.arange(head)))
+        start = int(np.searchsorted(self.ts[:head], cutoff_ns, side="left"))
+        return np.arange(start, head)
+    
+    def _select(self, metric_name: Optional[str], cutoff_ns: Optional[int] = None) -> np.ndarray:
+        """Slot indices matching the filters, oldest first"""
+        if cutoff_ns is not None and self._monotonic:
+            idx = self._window(cutoff_ns)
+        else:
+            idx = self._indices()
+            if cutoff_ns is not None:
+                idx = idx[self.ts[idx] >= cutoff_ns]
+        if metric_name is not None:
+            mid = self._metric_ids.get(metric_name)
+            if mid is None:
+                return idx[:0]
+            idx = idx[self.metric_id[idx] == mid]
+        return idx
     
     def get_recent(
         self,
@@ -77,48 +289,80 @@ class DataBuffer:
         hours: int = 1
     ) -> List[DataPoint]:
         """Get recent data points"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=hours)
+        cutoff_ns = time.time_ns() - hours * _NS_PER_HOUR
+        idx = self._select(metric_name, cutoff_ns)
         
-        if metric_name:
-            return [
-                dp for dp in self.buffer
-                if dp.metric_name == metric_name and dp.timestamp >= cutoff_time
-            ]
-        else:
-            return [dp for dp in self.buffer if dp.timestamp >= cutoff_time]
+        return [
+            DataPoint(
+                timestamp=_EPOCH + timedelta(microseconds=ts // 1000),
+                metric_name=self._metric_names[mid],
+                value=value,
+                host=self._host_names[hid],
+                tags=self.tags[i]
+            )
+            for i, ts, value, mid, hid in zip(
+                idx.tolist(),
+                self.ts[idx].tolist(),
+                self.val[idx].tolist(),
+                self.metric_id[idx].tolist(),
+                self.host_id[idx].tolist()
+            )
+        ]
     
     def get_stats(self, metric_name: str) -> Optional[Dict[str, float]]:
         """Get statistics for metric"""
         return self.metric_stats.get(metric_name)
     
+    def zscore_last(self, metric_name: str, window: int = 100) -> Optional[float]:
+        """
+        Z-score of the metric's newest value against its last `window`
+        points, computed over the value column in one vectorized pass
+        """
+        idx = self._select(metric_name)
+        if len(idx) < 2:
+            return None
+        
+        values = self.val[idx[-window:]]
+        std = values.std()
+        return float((values[-1] - values.mean()) / std) if std > 0 else 0.0
+    
     def get_dataframe(
         self,
         metric_name: Optional[str] = None
     ) -> Optional[pd.DataFrame]:
-        """Convert buffer to pandas DataFrame"""
-        if not self.buffer:
-            return None
-        
-        data = [dp.to_dict() for dp in self.buffer]
+        """
+        Convert buffer to pandas DataFrame. metric_name and host are
+        categoricals over the interned ids, so no per-row strings are built.
+        """
+        idx = self._select(metric_name)
         
-        if metric_name:
-            data = [d for d in data if d["metric_name"] == metric_name]
-        
-        if not data:
+        if not len(idx):
             return None
         
-        df = pd.DataFrame(data)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        return df
+        return pd.DataFrame({
+            "timestamp": self.ts[idx].view("datetime64[ns]"),
+            "metric_name": pd.Categorical.from_codes(self.metric_id[idx], categories=self._metric_names),
+            "value": self.val[idx],
+            "host": pd.Categorical.from_codes(self.host_id[idx], categories=self._host_names),
+            "tags": [self.tags[i] or {} for i in idx.tolist()]
+        })
     
     def clear(self):
         """Clear buffer"""
-        self.buffer.clear()
+        self.head = 0
+        self.count = 0
+        self._monotonic = True
+        self._last_ns = 0
+        self.tags = [None] * self.max_size
+        self._metric_ids.clear()
+        self._metric_names.clear()
+        self._host_ids.clear()
+        self._host_names.clear()
         self.metric_stats.clear()
     
     def size(self) -> int:
         """Get buffer size"""
-        return len(self.buffer)
+        return self.count
 
 
 class DataPipeline:
@@ -127,15 +371,25 @@ class DataPipeline:
     Handles collection, validation, processing, and storage
     """
     
-    def __init__(self, batch_size: int = 100, flush_interval: int = 5):
+    def __init__(
+        self,
+        batch_size: int = 100,
+        flush_interval: int = 5,
+        max_queue_size: Optional[int] = None
+    ):
         self.batch_size = batch_size
         self.flush_interval = flush_interval
         self.buffer = DataBuffer(max_size=10000)
-        self.processing_queue: asyncio.Queue = asyncio.Queue()
+        # Bounded so a burst sheds points instead of growing memory without limit
+        self.processing_queue: asyncio.Queue = asyncio.Queue(
+            maxsize=max_queue_size or 10 * batch_size
+        )
         self.is_running = False
         self.metrics = {
             "points_received": 0,
             "points_processed": 0,
+            "points_dropped": 0,
+            "points_rejected": 0,
             "batches_flushed": 0,
             "errors": 0
         }
@@ -158,45 +412,75 @@ class DataPipeline:
         logger.info("✅ Data pipeline stopped")
     
     async def add_data_point(self, data_point: DataPoint) -> bool:
-        """Add single data point"""
+        """Add single data point. Returns False if it is invalid or the queue is full."""
+        if not _is_valid(data_point):
+            self.metrics["points_rejected"] += 1
+            return False
         try:
-            await self.processing_queue.put(data_point)
+            self.processing_queue.put_nowait(data_point)
             self.metrics["points_received"] += 1
             return True
+        except asyncio.QueueFull:
+            self.metrics["points_dropped"] += 1
+            return False
         except Exception as e:
-            logger.error(f"Error adding data point: {str(e)}")
+            logger.error("Error adding data point: %s", e)
             self.metrics["errors"] += 1
             return False
     
     async def add_batch(self, data_points: List[DataPoint]) -> bool:
-        """Add batch of data points"""
+        """
+        Add batch of data points. Invalid points are rejected and points that
+        do not fit in the queue are dropped; returns False if any were.
+        """
         try:
-            for dp in data_points:
-                await self.add_data_point(dp)
-            return True
+            # Checked here so one bad point cannot fail a whole processing batch
+            valid = [dp for dp in data_points if _is_valid(dp)]
+            rejected = len(data_points) - len(valid)
+            if rejected:
+                self.metrics["points_rejected"] += rejected
+                logger.warning("Rejected %d invalid data points", rejected)
+            
+            # Enqueue without an await per point; stop at the first overflow
+            put = self.processing_queue.put_nowait
+            queued = 0
+            try:
+                for dp in valid:
+                    put(dp)
+                    queued += 1
+            except asyncio.QueueFull:
+                pass
+            self.metrics["points_received"] += queued
+            dropped = len(valid) - queued
+            if dropped:
+                self.metrics["points_dropped"] += dropped
+                logger.warning("Processing queue full, dropped %d data points", dropped)
+            return rejected == 0 and dropped == 0
         except Exception as e:
-            logger.error(f"Error adding batch: {str(e)}")
+            logger.error("Error adding batch: %s", e)
             self.metrics["errors"] += 1
             return False
     
     async def _processing_loop(self):
-        """Process incoming data points"""
+        """Process incoming data points in batches of up to batch_size"""
+        queue = self.processing_queue
         while self.is_running:
             try:
-                data_point = await asyncio.wait_for(
-                    self.processing_queue.get(),
-                    timeout=1.0
-                )
+                batch = [await asyncio.wait_for(queue.get(), timeout=1.0)]
                 
-                # Validate and process
-                if self._validate(data_point):
-                    self.buffer.add(data_point)
-                    self.metrics["points_processed"] += 1
+                # Drain whatever else is already queued without awaiting
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                
+                self.metrics["points_processed"] += self.buffer.add_batch(batch)
             
             except asyncio.TimeoutError:
                 pass
             except Exception as e:
-                logger.error(f"Processing error: {str(e)}")
+                logger.error("Processing error: %s", e)
                 self.metrics["errors"] += 1
     
     async def _flush_loop(self):
@@ -207,23 +491,13 @@ class DataPipeline:
                 
                 if self.buffer.size() > 0:
                     # Here you would save to database/storage
-                    logger.debug(f"Flushing {self.buffer.size()} data points")
+                    logger.debug("Flushing %d data points", self.buffer.size())
                     self.metrics["batches_flushed"] += 1
             
             except Exception as e:
-                logger.error(f"Flush error: {str(e)}")
+                logger.error("Flush error: %s", e)
                 self.metrics["errors"] += 1
     
-    def _validate(self, data_point: DataPoint) -> bool:
-        """Validate data point"""
-        if not isinstance(data_point.value, (int, float)):
-            return False
-        
-        if not isinstance(data_point.metric_name, str):
-            return False
-        
-        return True
-    
     def get_metrics(self) -> Dict[str, Any]:
         """Get pipeline metrics"""
         return {
@@ -17,12 +17,16 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import asyncio
 import json
-import hashlib
+import secrets
 import re
-from datetime import datetime, timedelta
+import logging
+import zlib
+from datetime import datetime
 from streamlit_option_menu import option_menu
 from typing import Dict, Any, List, Optional
 import smtplib
@@ -31,6 +35,9 @@ from email.mime.multipart import MIMEMultipart
 import websockets
 import threading
 from queue import Queue
+from collections import deque
+
+logger = logging.getLogger(__name__)
 
 # ============================================================================
 # SECURITY & CONFIGURATION
@@ -38,24 +45,40 @@ from queue import Queue
 
 # Input validation patterns
 EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+MAX_EMAIL_LENGTH = 254  # RFC 5321 path limit
+_HTML_ESCAPES = str.maketrans({'<': '&lt;', '>': '&gt;', '"': '&quot;'})
 INTERVAL_OPTIONS = ["5 seconds", "10 seconds", "30 seconds", "1 minute", "5 minutes", "10 minutes", "30 minutes", "1 hour"]
 
+# Outbound HTTP (Slack, PagerDuty)
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Keep-alive HTTP session shared by all outbound calls across sessions"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.1)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 # CSRF Token Management
 def generate_csrf_token():
-    """Generate CSRF token for form security"""
+    """Generate CSRF token for form security (random, once per session)"""
     if 'csrf_token' not in st.session_state:
-        st.session_state['csrf_token'] = hashlib.sha256(
-            f"{datetime.now().isoformat()}{st.session_state.get('user_email', 'anonymous')}".encode()
-        ).hexdigest()
+        st.session_state['csrf_token'] = secrets.token_hex(32)
     return st.session_state['csrf_token']
 
 def validate_email(email: str) -> bool:
     """Validate email format"""
-    return bool(EMAIL_PATTERN.match(email)) if email else False
+    if not email or len(email) > MAX_EMAIL_LENGTH:
+        return False
+    return EMAIL_PATTERN.fullmatch(email) is not None
 
 def sanitize_input(text: str) -> str:
     """Sanitize user input to prevent XSS"""
-    return text.replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+    return text.translate(_HTML_ESCAPES)
 
 # ============================================================================
 # SESSION STATE INITIALIZATION
@@ -77,7 +100,8 @@ def init_session_state():
         'authenticated': False,
         'websocket_connected': False,
         'custom_metrics': [],
-        'alert_history': []
+        'alert_history': [],
+        'email_failures_seen': 0
     }
     
     for key, value in defaults.items():
@@ -101,22 +125,85 @@ st.set_page_config(
 # NOTIFICATION SYSTEM
 # ============================================================================
 
+class MailWorker:
+    """
+    Sends queued emails from a daemon thread over one long-lived SMTP
+    connection, so the script thread never waits on the SMTP handshake.
+    A dropped connection is re-opened and the message retried once; sends
+    that still fail are kept in ``failures`` for the UI to report.
+    """
+    
+    def __init__(self, server: str, port: int, username: str, password: str):
+        self.server = server
+        self.port = port
+        self.username = username
+        self.password = password
+        self.queue: Queue = Queue()
+        self.failures: deque = deque(maxlen=50)  # (seq, to, subject, error), newest last
+        self.failure_seq = 0
+        threading.Thread(target=self._pump, name="smtp-worker", daemon=True).start()
+    
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.server, self.port, timeout=30)
+        smtp.starttls()
+        smtp.login(self.username, self.password)
+        return smtp
+    
+    def _pump(self):
+        smtp = None
+        while True:
+            msg = self.queue.get()
+            for attempt in range(2):
+                try:
+                    if smtp is None:
+                        smtp = self._connect()
+                    smtp.send_message(msg)
+                    break
+                except Exception as e:
+                    # Idle connections get closed server-side; reconnect and retry
+                    try:
+                        if smtp is not None:
+                            smtp.close()
+                    finally:
+                        smtp = None
+                    if attempt:
+                        logger.error("Email to %s failed: %s", msg['To'], e)
+                        self.failure_seq += 1
+                        self.failures.append((self.failure_seq, msg['To'], msg['Subject'], str(e)))
+
+@st.cache_resource
+def get_mail_worker(server: str, port: int, username: str, password: str) -> MailWorker:
+    """One mail worker per SMTP account, shared across sessions"""
+    return MailWorker(server, port, username, password)
+
+def get_smtp_config():
+    """(server, port, username, password) from secrets, or None without credentials"""
+    try:
+        smtp_user = st.secrets.get("SMTP_USERNAME", "")
+        smtp_pass = st.secrets.get("SMTP_PASSWORD", "")
+    except Exception:  # no secrets.toml
+        return None
+    if not smtp_user or not smtp_pass:
+        return None
+    return (
+        st.secrets.get("SMTP_SERVER", "smtp.gmail.com"),
+        int(st.secrets.get("SMTP_PORT", 587)),
+        smtp_user,
+        smtp_pass,
+    )
+
 class NotificationManager:
     """Manage in-app and external notifications"""
     
     @staticmethod
     def send_email(to_email: str, subject: str, body: str, html_body: str = None):
-        """Send email notification via SMTP"""
+        """Queue an email notification for the SMTP worker"""
         try:
-            # SMTP Configuration (from env)
-            smtp_server = st.secrets.get("SMTP_SERVER", "smtp.gmail.com")
-            smtp_port = int(st.secrets.get("SMTP_PORT", 587))
-            smtp_user = st.secrets.get("SMTP_USERNAME", "")
-            smtp_pass = st.secrets.get("SMTP_PASSWORD", "")
-            
-            if not smtp_user or not smtp_pass:
+            smtp_config = get_smtp_config()
+            if smtp_config is None:
                 st.error("📧 SMTP credentials not configured")
                 return False
+            smtp_server, smtp_port, smtp_user, smtp_pass = smtp_config
             
             msg = MIMEMultipart('alternative')
             msg['Subject'] = subject
@@ -128,18 +215,32 @@ class NotificationManager:
             if html_body:
                 msg.attach(MIMEText(html_body, 'html'))
             
-            # Send email
-            with smtplib.SMTP(smtp_server, smtp_port) as server:
-                server.starttls()
-                server.login(smtp_user, smtp_pass)
-                server.send_message(msg)
-            
+            # Hand off to the background sender
+            get_mail_worker(smtp_server, smtp_port, smtp_user, smtp_pass).queue.put(msg)
             return True
             
         except Exception as e:
             st.error(f"❌ Email send failed: {str(e)}")
             return False
     
+    @staticmethod
+    def report_email_failures():
+        """Turn this user's failed background sends into in-app notifications"""
+        smtp_config = get_smtp_config()
+        if smtp_config is None:
+            return
+        
+        worker = get_mail_worker(*smtp_config)
+        seen = st.session_state['email_failures_seen']
+        for seq, to_email, subject, error in list(worker.failures):
+            if seq > seen and to_email == st.session_state['user_email']:
+                NotificationManager.send_in_app_notification(
+                    "Email not delivered",
+                    f"{sanitize_input(subject)}: {sanitize_input(error)}",
+                    "critical"
+                )
+        st.session_state['email_failures_seen'] = worker.failure_seq
+    
     @staticmethod
     def send_in_app_notification(title: str, message: str, severity: str = "info"):
         """Add in-app notification"""
@@ -165,7 +266,7 @@ class NotificationManager:
                 "username": "System Monitor Bot",
                 "icon_emoji": ":bell:"
             }
-            response = requests.post(webhook_url, json=payload)
+            response = get_http_session().post(webhook_url, json=payload)
             return response.status_code == 200
         except Exception as e:
             st.error(f"Slack notification failed: {str(e)}")
@@ -190,7 +291,7 @@ class NotificationManager:
                     "timestamp": datetime.now().isoformat()
                 }
             }
-            response = requests.post(url, json=payload, headers=headers)
+            response = get_http_session().post(url, json=payload, headers=headers)
             return response.status_code == 202
         except Exception as e:
             st.error(f"PagerDuty alert failed: {str(e)}")
@@ -650,7 +751,7 @@ def show_user_preferences():
                 "<p>This is a test email. Your email notifications are <strong>working correctly!</strong></p>"
             )
             if success:
-                st.sidebar.success("📧 Test email sent!")
+                st.sidebar.success("📧 Test email queued! Delivery failures appear under Notifications.")
 
 # ============================================================================
 # IN-APP NOTIFICATION CENTER
@@ -658,6 +759,7 @@ def show_user_preferences():
 
 def show_notification_center():
     """Display in-app notification center"""
+    NotificationManager.report_email_failures()
     with st.sidebar.expander(f"🔔 Notifications ({len([n for n in st.session_state['notifications'] if not n['read']])} unread)"):
         if not st.session_state['notifications']:
             st.info("No notifications yet")
@@ -719,10 +821,29 @@ if 'ws_client' not in st.session_state:
     st.session_state['ws_client'] = WebSocketClient()
     # st.session_state['ws_client'].start()  # Uncomment when backend WebSocket is ready
 
+# ============================================================================
+# SAMPLE DATA
+# ============================================================================
+
+@st.cache_data(ttl=60, show_spinner=False)
+def sample_metric_history(metric: str, periods: int, freq: str) -> pd.DataFrame:
+    """
+    Simulated history for a metric, generated once per minute rather than on
+    every rerun. Seeded from the arguments, so regenerated data is stable too.
+    """
+    rng = np.random.default_rng(zlib.crc32(f"{metric}:{periods}:{freq}".encode()))
+    values = rng.normal(65, 15, periods)
+    np.clip(values, 0, 100, out=values)
+    return pd.DataFrame({
+        'timestamp': pd.date_range(end=datetime.now(), periods=periods, freq=freq),
+        'value': values
+    })
+
 # ============================================================================
 # ADVANCED FORECASTING
 # ============================================================================
 
+@st.cache_data(ttl=60, show_spinner=False)
 def forecast_with_prophet(data: pd.DataFrame, periods: int = 24):
     """Forecast using Facebook Prophet"""
     try:
@@ -749,6 +870,7 @@ def forecast_with_prophet(data: pd.DataFrame, periods: int = 24):
         st.warning("Prophet not installed. Install with: pip install prophet")
         return None
 
+@st.cache_data(ttl=60, show_spinner=False)
 def forecast_with_arima(data: pd.Series, periods: int = 24):
     """Forecast using ARIMA"""
     try:
@@ -888,13 +1010,9 @@ if selected == "Dashboard":
     with col1:
         st.subheader("CPU Utilization Over Time")
         
-        times = pd.date_range(start=datetime.now() - timedelta(hours=2), periods=100, freq='1min')
-        cpu_data = pd.DataFrame({
-            'time': times,
-            'cpu': np.random.normal(65, 15, 100).clip(0, 100)
-        })
+        cpu_data = sample_metric_history("CPU", periods=100, freq='1min')
         
-        fig = create_line_chart(cpu_data, "CPU %", "time", "cpu")
+        fig = create_line_chart(cpu_data, "CPU %", "timestamp", "value")
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
@@ -1063,14 +1181,8 @@ elif selected == "Predictions":
     
     st.divider()
     
-    # Generate sample data
-    historical_times = pd.date_range(start=datetime.now() - timedelta(days=7), periods=288, freq='30min')
-    historical_values = np.random.normal(65, 15, 288)
-    
-    df = pd.DataFrame({
-        'timestamp': historical_times,
-        'value': historical_values
-    })
+    # Sample data (cached, so forecasts below are only refit when it changes)
+    df = sample_metric_history(metric_to_forecast, periods=288, freq='30min')
     
     # Apply forecasting
     if forecast_model == "Prophet":
@@ -14,13 +14,13 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime, timedelta
 from streamlit_option_menu import option_menu
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 from typing import Dict, Any, List, Optional
-from collections import deque
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -242,15 +242,80 @@ def normalize_api_url(raw_url: str, fallback: str = "http://localhost:8000") ->
 
 API_BASE_URL = normalize_api_url(os.getenv("BACKEND_URL", "http://localhost:8000"))
 WS_BASE_URL = API_BASE_URL.replace("https://", "wss://").replace("http://", "ws://")
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Keep-alive HTTP session shared by all outbound calls across sessions"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.1)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+MAX_EMAIL_LENGTH = 254  # RFC 5321 path limit
+_HTML_ESCAPES = str.maketrans({'<': '&lt;', '>': '&gt;', '"': '&quot;'})
 
 def validate_email(email: str) -> bool:
     """Validate email format"""
-    return bool(EMAIL_PATTERN.match(email)) if email else False
+    if not email or len(email) > MAX_EMAIL_LENGTH:
+        return False
+    return EMAIL_PATTERN.fullmatch(email) is not None
 
 def sanitize_input(text: str) -> str:
     """Sanitize user input"""
-    return text.replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+    return text.translate(_HTML_ESCAPES)
+
+# ============================================================================
+# METRICS HISTORY BUFFER
+# ============================================================================
+
+class MetricsHistory:
+    """
+    Fixed-size ring of recent samples stored column-wise: one datetime64
+    array plus one float32 array per charted metric, written in place.
+    The DataFrame view is built once per new sample, not once per read.
+    """
+    
+    COLUMNS = ('cpu_percent', 'memory_percent', 'disk_percent')
+    
+    def __init__(self, size: int = 100):
+        self.size = size
+        self.timestamps = np.empty(size, dtype='datetime64[ns]')
+        self.values = {col: np.empty(size, dtype=np.float32) for col in self.COLUMNS}
+        self.head = 0
+        self.count = 0
+        self._frame: Optional[pd.DataFrame] = None
+    
+    def append(self, metrics: Dict[str, Any]):
+        ts = pd.Timestamp(metrics.get('timestamp') or datetime.now())
+        if ts.tzinfo is not None:
+            # Naive local time, the clock of datetime.now() used by the
+            # HTTP/fallback samples, so the x-axis doesn't jump between sources
+            ts = pd.Timestamp(ts.to_pydatetime().astimezone().replace(tzinfo=None))
+        i = self.head
+        self.timestamps[i] = ts.to_datetime64()
+        for col, column in self.values.items():
+            column[i] = metrics.get(col, np.nan)
+        self.head = (i + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        self._frame = None
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        if self._frame is None:
+            order = (np.arange(self.count) + self.head - self.count) % self.size
+            self._frame = pd.DataFrame({
+                'timestamp': self.timestamps[order],
+                **{col: column[order] for col, column in self.values.items()}
+            })
+        return self._frame
 
 # ============================================================================
 # SESSION STATE INITIALIZATION
@@ -259,7 +324,7 @@ def sanitize_input(text: str) -> str:
 def init_session_state():
     """Initialize all session state variables"""
     defaults = {
-        'metrics_history': deque(maxlen=100),
+        'metrics_history': MetricsHistory(size=100),
         'backend_connected': False,
         'user_email': '',
         'notifications': [],
@@ -300,7 +365,7 @@ init_session_state()
 # ============================================================================
 
 try:
-    from metrics_fetcher import MetricsFetcher
+    from metrics_fetcher import MetricsFetcher, start_ws_consumer
     METRICS_MODULE_AVAILABLE = True
 except ImportError:
     METRICS_MODULE_AVAILABLE = False
@@ -310,6 +375,7 @@ if METRICS_MODULE_AVAILABLE:
     def get_fetcher():
         return MetricsFetcher(API_BASE_URL)
     fetcher = get_fetcher()
+    start_ws_consumer(API_BASE_URL)
 else:
     fetcher = None
 
@@ -386,24 +452,35 @@ class NotificationManager:
 # HELPER FUNCTIONS
 # ============================================================================
 
-def check_backend_connection() -> bool:
-    """Check if backend is accessible"""
+@st.cache_data(ttl=10, show_spinner=False)
+def probe_backend() -> bool:
+    """GET /health; reruns within the TTL reuse the answer"""
     try:
-        response = requests.get(f"{API_BASE_URL}/health", timeout=2)
-        is_healthy = response.status_code == 200
-        st.session_state['backend_connected'] = is_healthy
-        return is_healthy
-    except requests.RequestException as exc:
-        st.session_state['backend_connected'] = False
+        response = get_http_session().get(f"{API_BASE_URL}/health", timeout=2)
+        return response.status_code == 200
+    except requests.RequestException:
         return False
 
+def check_backend_connection() -> bool:
+    """Check if backend is accessible"""
+    is_healthy = probe_backend()
+    st.session_state['backend_connected'] = is_healthy
+    return is_healthy
+
 def get_realtime_metrics() -> Dict[str, Any]:
     """Get latest metrics from backend or use fallback"""
     if METRICS_MODULE_AVAILABLE and fetcher:
         try:
-            from metrics_fetcher import fetch_and_cache_metrics
-            metrics = fetch_and_cache_metrics(fetcher)
-            st.session_state['metrics_history'].append(metrics)
+            from metrics_fetcher import fetch_and_cache_metrics, get_ws_metrics
+            # Pushed snapshots first; poll over HTTP while none is recent
+            metrics = get_ws_metrics()
+            if metrics is None:
+                metrics = fetch_and_cache_metrics(fetcher)
+                st.session_state['metrics_history'].append(metrics)
+            elif metrics is not st.session_state.get('last_ws_metrics'):
+                # Reruns between frames reuse the snapshot without re-recording it
+                st.session_state['last_ws_metrics'] = metrics
+                st.session_state['metrics_history'].append(metrics)
             st.session_state['backend_connected'] = True
             return metrics
         except:
@@ -421,28 +498,83 @@ def get_realtime_metrics() -> Dict[str, Any]:
     }
 
 def get_metrics_history() -> pd.DataFrame:
-    """Convert metrics history to DataFrame"""
-    if METRICS_MODULE_AVAILABLE:
-        try:
-            from metrics_fetcher import get_buffered_metrics_as_list
-            metrics_list = get_buffered_metrics_as_list()
-        except:
-            metrics_list = list(st.session_state['metrics_history'])
-    else:
-        metrics_list = list(st.session_state['metrics_history'])
+    """Metrics history as a DataFrame (simulated if nothing collected yet)"""
+    history = st.session_state['metrics_history']
     
-    if len(metrics_list) == 0:
+    if len(history) == 0:
         times = pd.date_range(start=datetime.now() - timedelta(minutes=10), periods=20, freq='30s')
+        samples = np.random.default_rng().normal([65, 55, 72], [15, 12, 5], size=(20, 3))
+        np.clip(samples, 0, 100, out=samples)
         return pd.DataFrame({
             'timestamp': times,
-            'cpu_percent': np.random.normal(65, 15, 20).clip(0, 100),
-            'memory_percent': np.random.normal(55, 12, 20).clip(0, 100),
-            'disk_percent': np.random.normal(72, 5, 20).clip(0, 100)
+            'cpu_percent': samples[:, 0],
+            'memory_percent': samples[:, 1],
+            'disk_percent': samples[:, 2]
         })
     
-    df = pd.DataFrame(metrics_list)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    return df
+    return history.to_dataframe()
+
+def get_live_figure(key: str, build) -> go.Figure:
+    """
+    Figure kept in session state across refreshes. Callers update its traces
+    in place and re-emit it under a stable chart key, so the browser applies
+    the change to the existing plot instead of rebuilding it.
+    """
+    if key not in st.session_state:
+        st.session_state[key] = build()
+    return st.session_state[key]
+
+def build_cpu_figure(chart_view: str) -> go.Figure:
+    """Empty CPU trend figure for the selected chart type"""
+    if chart_view == "Bar Chart":
+        trace = go.Bar(name='CPU', marker_color='#4CAF50')
+    elif chart_view == "Area Chart":
+        trace = go.Scatter(name='CPU', mode='lines', fill='tozeroy', line=dict(color='#4CAF50'))
+    else:
+        trace = go.Scatter(name='CPU', mode='lines+markers', line=dict(color='#4CAF50'))
+    
+    fig = go.Figure(trace)
+    fig.update_layout(
+        title="CPU Usage Over Time",
+        hovermode="x unified",
+        height=350,
+        margin=dict(l=0, r=0, t=30, b=0),
+        xaxis_title="Time",
+        yaxis_title="CPU %",
+        showlegend=False
+    )
+    return fig
+
+def build_memory_disk_figure() -> go.Figure:
+    """Empty Memory & Disk trend figure"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        mode='lines+markers',
+        name='Memory',
+        line=dict(color='#2196F3', width=2),
+        fill='tonexty'
+    ))
+    fig.add_trace(go.Scatter(
+        mode='lines+markers',
+        name='Disk',
+        line=dict(color='#FF9800', width=2)
+    ))
+    fig.update_layout(
+        title="Memory & Disk Usage",
+        height=350,
+        margin=dict(l=0, r=0, t=30, b=0),
+        xaxis_title="Time",
+        yaxis_title="Usage %",
+        hovermode='x unified',
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    return fig
 
 def get_health_status(value: float, threshold: float) -> tuple:
     """Get health status and color"""
@@ -505,7 +637,7 @@ System Health Monitor
 def fetch_anomaly_detection(metrics: Dict[str, float]) -> Dict[str, Any]:
     """Call backend anomaly detection API"""
     try:
-        response = requests.post(
+        response = get_http_session().post(
             f"{API_BASE_URL}/api/anomaly/detect",
             json=metrics,
             timeout=5
@@ -521,7 +653,7 @@ def fetch_anomaly_detection(metrics: Dict[str, float]) -> Dict[str, Any]:
 def fetch_ai_analysis(metrics: Dict[str, float]) -> str:
     """Get AI analysis from backend"""
     try:
-        response = requests.post(
+        response = get_http_session().post(
             f"{API_BASE_URL}/api/ai/analyze",
             json=metrics,
             timeout=10
@@ -537,7 +669,7 @@ def fetch_ai_analysis(metrics: Dict[str, float]) -> str:
 def fetch_anomaly_explanation(anomaly_data: Dict[str, Any]) -> str:
     """Get AI explanation for detected anomaly"""
     try:
-        response = requests.post(
+        response = get_http_session().post(
             f"{API_BASE_URL}/api/ai/anomaly-explanation",
             json=anomaly_data,
             timeout=10
@@ -736,6 +868,10 @@ with st.sidebar:
 # MAIN CONTENT AREA
 # ============================================================================
 
+# Live sections below are fragments: on each tick only they re-run, not the
+# whole script (sidebar, menu and static page content stay as rendered)
+LIVE_REFRESH = st.session_state['refresh_interval'] if st.session_state['auto_refresh'] else None
+
 # Show welcome tour for first-time users
 if selected == "Dashboard":
     show_welcome_tour()
@@ -752,230 +888,178 @@ if selected == "Dashboard":
     col1, col2 = st.columns([3, 1])
     with col1:
         st.title(f"{greeting}, {st.session_state['user_name']}! 👋")
-        st.caption(f"Last updated: {datetime.now().strftime('%B %d, %Y at %I:%M:%S %p')}")
     with col2:
         if st.button("🔄 Refresh Now", use_container_width=True):
+            probe_backend.clear()  # re-check the backend instead of using the cached answer
             st.rerun()
     
-    # Get real-time metrics
-    metrics = get_realtime_metrics()
-    
-    # System Health Overview Cards
-    st.markdown("### 📊 System Health Overview")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    # CPU Card
-    with col1:
-        cpu_val = metrics.get('cpu_percent', 0)
-        cpu_status, cpu_icon, cpu_color = get_health_status(cpu_val, st.session_state['alert_thresholds']['cpu'])
-        
-        st.metric(
-            label="⚙️ CPU Usage",
-            value=f"{cpu_val:.1f}%",
-            delta=f"{cpu_status}",
-            help="Processor utilization percentage"
-        )
-        st.progress(cpu_val / 100)
-        detect_and_notify_anomaly("CPU Usage", cpu_val, st.session_state['alert_thresholds']['cpu'])
-    
-    # Memory Card
-    with col2:
-        mem_val = metrics.get('memory_percent', 0)
-        mem_status, mem_icon, mem_color = get_health_status(mem_val, st.session_state['alert_thresholds']['memory'])
-        
-        st.metric(
-            label="💾 Memory Usage",
-            value=f"{mem_val:.1f}%",
-            delta=f"{mem_status}",
-            help="RAM utilization percentage"
-        )
-        st.progress(mem_val / 100)
-        detect_and_notify_anomaly("Memory Usage", mem_val, st.session_state['alert_thresholds']['memory'])
-    
-    # Disk Card
-    with col3:
-        disk_val = metrics.get('disk_percent', 0)
-        disk_status, disk_icon, disk_color = get_health_status(disk_val, st.session_state['alert_thresholds']['disk'])
-        
-        st.metric(
-            label="💿 Disk Usage",
-            value=f"{disk_val:.1f}%",
-            delta=f"{disk_status}",
-            help="Storage utilization percentage"
-        )
-        st.progress(disk_val / 100)
-        detect_and_notify_anomaly("Disk Usage", disk_val, st.session_state['alert_thresholds']['disk'])
-    
-    # Network Card
-    with col4:
-        network_mb = metrics.get('network_sent', 0) / (1024 * 1024)
-        st.metric(
-            label="🌐 Network (Sent)",
-            value=f"{network_mb:.1f} MB",
-            delta="Normal",
-            help="Total data sent over network"
-        )
-        st.progress(min(network_mb / 1000, 1.0))
-    
-    # Real-time Anomaly Detection
-    st.divider()
-    st.markdown("### 🔍 Real-Time Anomaly Detection")
-    
-    if st.session_state['backend_connected']:
-        # Fetch anomaly detection results from backend
-        anomaly_result = fetch_anomaly_detection(metrics)
+    @st.fragment(run_every=LIVE_REFRESH)
+    def _live_dashboard():
+        st.caption(f"Last updated: {datetime.now().strftime('%B %d, %Y at %I:%M:%S %p')}")
+        
+        # Get real-time metrics
+        metrics = get_realtime_metrics()
+        thresholds = st.session_state['alert_thresholds']
+        
+        # System Health Overview Cards
+        st.markdown("### 📊 System Health Overview")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        # CPU Card
+        with col1:
+            cpu_val = metrics.get('cpu_percent', 0)
+            cpu_status, cpu_icon, cpu_color = get_health_status(cpu_val, thresholds['cpu'])
+        
+            st.metric(
+                label="⚙️ CPU Usage",
+                value=f"{cpu_val:.1f}%",
+                delta=f"{cpu_status}",
+                help="Processor utilization percentage"
+            )
+            st.progress(cpu_val / 100)
+            detect_and_notify_anomaly("CPU Usage", cpu_val, thresholds['cpu'])
+        
+        # Memory Card
+        with col2:
+            mem_val = metrics.get('memory_percent', 0)
+            mem_status, mem_icon, mem_color = get_health_status(mem_val, thresholds['memory'])
+        
+            st.metric(
+                label="💾 Memory Usage",
+                value=f"{mem_val:.1f}%",
+                delta=f"{mem_status}",
+                help="RAM utilization percentage"
+            )
+            st.progress(mem_val / 100)
+            detect_and_notify_anomaly("Memory Usage", mem_val, thresholds['memory'])
+        
+        # Disk Card
+        with col3:
+            disk_val = metrics.get('disk_percent', 0)
+            disk_status, disk_icon, disk_color = get_health_status(disk_val, thresholds['disk'])
+        
+            st.metric(
+                label="💿 Disk Usage",
+                value=f"{disk_val:.1f}%",
+                delta=f"{disk_status}",
+                help="Storage utilization percentage"
+            )
+            st.progress(disk_val / 100)
+            detect_and_notify_anomaly("Disk Usage", disk_val, thresholds['disk'])
+        
+        # Network Card
+        with col4:
+            network_mb = metrics.get('network_sent', 0) / (1024 * 1024)
+            st.metric(
+                label="🌐 Network (Sent)",
+                value=f"{network_mb:.1f} MB",
+                delta="Normal",
+                help="Total data sent over network"
+            )
+            st.progress(min(network_mb / 1000, 1.0))
+        
+        # Real-time Anomaly Detection
+        st.divider()
+        st.markdown("### 🔍 Real-Time Anomaly Detection")
+        
+        if st.session_state['backend_connected']:
+            # Fetch anomaly detection results from backend
+            anomaly_result = fetch_anomaly_detection(metrics)
         
-        if anomaly_result and 'is_anomaly' in anomaly_result:
-            col1, col2 = st.columns([2, 1])
+            if anomaly_result and 'is_anomaly' in anomaly_result:
+                col1, col2 = st.columns([2, 1])
             
-            with col1:
-                if anomaly_result['is_anomaly']:
-                    severity = anomaly_result.get('severity', 'medium')
-                    severity_icons = {
-                        'critical': '🔴',
-                        'high': '🟠',
-                        'medium': '🟡',
-                        'low': '🟢'
-                    }
-                    severity_colors = {
-                        'critical': '#F44336',
-                        'high': '#FF9800',
-                        'medium': '#FFC107',
-                        'low': '#8BC34A'
-                    }
+                with col1:
+                    if anomaly_result['is_anomaly']:
+                        severity = anomaly_result.get('severity', 'medium')
+                        severity_icons = {
+                            'critical': '🔴',
+                            'high': '🟠',
+                            'medium': '🟡',
+                            'low': '🟢'
+                        }
+                        severity_colors = {
+                            'critical': '#F44336',
+                            'high': '#FF9800',
+                            'medium': '#FFC107',
+                            'low': '#8BC34A'
+                        }
                     
-                    st.error(f"""
-                    {severity_icons.get(severity, '⚠️')} **Anomaly Detected!** (Severity: {severity.upper()})
+                        st.error(f"""
+                        {severity_icons.get(severity, '⚠️')} **Anomaly Detected!** (Severity: {severity.upper()})
                     
-                    - **Metric:** {anomaly_result.get('metric_name', 'System')}
-                    - **Z-Score:** {anomaly_result.get('z_score', 0):.2f}
-                    - **Mean:** {anomaly_result.get('mean', 0):.2f}
-                    - **Std Dev:** {anomaly_result.get('std_dev', 0):.2f}
-                    """)
+                        - **Metric:** {anomaly_result.get('metric_name', 'System')}
+                        - **Z-Score:** {anomaly_result.get('z_score', 0):.2f}
+                        - **Mean:** {anomaly_result.get('mean', 0):.2f}
+                        - **Std Dev:** {anomaly_result.get('std_dev', 0):.2f}
+                        """)
                     
-                    # Store anomaly in session state
-                    if anomaly_result not in st.session_state['anomalies_detected']:
-                        st.session_state['anomalies_detected'].insert(0, {
-                            **anomaly_result,
-                            'timestamp': datetime.now()
-                        })
-                        if len(st.session_state['anomalies_detected']) > 50:
-                            st.session_state['anomalies_detected'] = st.session_state['anomalies_detected'][:50]
-                else:
-                    st.success("✅ All metrics are within normal ranges")
+                        # Store anomaly in session state
+                        if anomaly_result not in st.session_state['anomalies_detected']:
+                            st.session_state['anomalies_detected'].insert(0, {
+                                **anomaly_result,
+                                'timestamp': datetime.now()
+                            })
+                            if len(st.session_state['anomalies_detected']) > 50:
+                                st.session_state['anomalies_detected'] = st.session_state['anomalies_detected'][:50]
+                    else:
+                        st.success("✅ All metrics are within normal ranges")
             
-            with col2:
-                if anomaly_result['is_anomaly'] and st.button("🤖 Get AI Explanation"):
-                    with st.spinner("Analyzing anomaly..."):
-                        explanation = fetch_anomaly_explanation(anomaly_result)
-                        st.info(f"**AI Analysis:**\n\n{explanation}")
-        else:
-            st.info("Anomaly detection service is initializing... (collecting baseline data)")
-    else:
-        st.warning("⚠️ Connect to backend to enable real-time anomaly detection")
-    
-    st.divider()
-    
-    # Real-time Charts
-    st.markdown("### 📈 Live Performance Trends")
-    
-    df_history = get_metrics_history()
-    
-    # View selector
-    col1, col2 = st.columns([3, 1])
-    with col2:
-        chart_view = st.selectbox(
-            "Chart Type",
-            ["Line Chart", "Area Chart", "Bar Chart"],
-            label_visibility="collapsed"
-        )
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("#### ⚙️ CPU Performance")
-        if not df_history.empty and 'cpu_percent' in df_history.columns:
-            if chart_view == "Area Chart":
-                fig = px.area(
-                    df_history,
-                    x='timestamp',
-                    y='cpu_percent',
-                    title="CPU Usage Over Time",
-                    color_discrete_sequence=['#4CAF50']
-                )
-            elif chart_view == "Bar Chart":
-                fig = px.bar(
-                    df_history,
-                    x='timestamp',
-                    y='cpu_percent',
-                    title="CPU Usage Over Time",
-                    color_discrete_sequence=['#4CAF50']
-                )
+                with col2:
+                    if anomaly_result['is_anomaly'] and st.button("🤖 Get AI Explanation"):
+                        with st.spinner("Analyzing anomaly..."):
+                            explanation = fetch_anomaly_explanation(anomaly_result)
+                            st.info(f"**AI Analysis:**\n\n{explanation}")
             else:
-                fig = px.line(
-                    df_history,
-                    x='timestamp',
-                    y='cpu_percent',
-                    title="CPU Usage Over Time",
-                    markers=True,
-                    color_discrete_sequence=['#4CAF50']
-                )
-            
-            fig.update_layout(
-                hovermode="x unified",
-                height=350,
-                margin=dict(l=0, r=0, t=30, b=0),
-                xaxis_title="Time",
-                yaxis_title="CPU %",
-                showlegend=False
-            )
-            st.plotly_chart(fig, use_container_width=True)
+                st.info("Anomaly detection service is initializing... (collecting baseline data)")
         else:
-            st.info("⏳ Collecting data...")
-    
-    with col2:
-        st.markdown("#### 💾 Memory & Disk")
-        if not df_history.empty:
-            fig = go.Figure()
-            
-            if 'memory_percent' in df_history.columns:
-                fig.add_trace(go.Scatter(
-                    x=df_history['timestamp'],
-                    y=df_history['memory_percent'],
-                    mode='lines+markers',
-                    name='Memory',
-                    line=dict(color='#2196F3', width=2),
-                    fill='tonexty'
-                ))
-            
-            if 'disk_percent' in df_history.columns:
-                fig.add_trace(go.Scatter(
-                    x=df_history['timestamp'],
-                    y=df_history['disk_percent'],
-                    mode='lines+markers',
-                    name='Disk',
-                    line=dict(color='#FF9800', width=2)
-                ))
-            
-            fig.update_layout(
-                title="Memory & Disk Usage",
-                height=350,
-                margin=dict(l=0, r=0, t=30, b=0),
-                xaxis_title="Time",
-                yaxis_title="Usage %",
-                hovermode='x unified',
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1
-                )
+            st.warning("⚠️ Connect to backend to enable real-time anomaly detection")
+        
+        st.divider()
+        
+        # Real-time Charts
+        st.markdown("### 📈 Live Performance Trends")
+        
+        df_history = get_metrics_history()
+        
+        # View selector
+        col1, col2 = st.columns([3, 1])
+        with col2:
+            chart_view = st.selectbox(
+                "Chart Type",
+                ["Line Chart", "Area Chart", "Bar Chart"],
+                label_visibility="collapsed"
             )
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("⏳ Collecting data...")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("#### ⚙️ CPU Performance")
+            if not df_history.empty and 'cpu_percent' in df_history.columns:
+                fig = get_live_figure(f"fig_cpu_{chart_view}", lambda: build_cpu_figure(chart_view))
+                fig.update_traces(x=df_history['timestamp'], y=df_history['cpu_percent'])
+                st.plotly_chart(fig, use_container_width=True, key="cpu_chart")
+            else:
+                st.info("⏳ Collecting data...")
+        
+        with col2:
+            st.markdown("#### 💾 Memory & Disk")
+            if not df_history.empty:
+                fig = get_live_figure("fig_memory_disk", build_memory_disk_figure)
+                for name, column in (('Memory', 'memory_percent'), ('Disk', 'disk_percent')):
+                    has_data = column in df_history.columns
+                    fig.update_traces(
+                        x=df_history['timestamp'] if has_data else [],
+                        y=df_history[column] if has_data else [],
+                        visible=has_data,
+                        selector=dict(name=name)
+                    )
+                st.plotly_chart(fig, use_container_width=True, key="memory_disk_chart")
+            else:
+                st.info("⏳ Collecting data...")
+    
+    _live_dashboard()
     
     st.divider()
     
@@ -1071,54 +1155,58 @@ elif selected == "Metrics":
     
     st.divider()
     
-    # Metrics table
-    df_history = get_metrics_history()
-    
-    if not df_history.empty:
-        st.markdown("#### 📊 Live Metrics Table")
+    @st.fragment(run_every=LIVE_REFRESH)
+    def _live_metrics_table():
+        # Metrics table
+        df_history = get_metrics_history()
         
-        # Format the dataframe for display
-        display_df = df_history.copy()
-        display_df['timestamp'] = display_df['timestamp'].dt.strftime('%H:%M:%S')
+        if not df_history.empty:
+            st.markdown("#### 📊 Live Metrics Table")
         
-        if 'cpu_percent' in display_df.columns:
-            display_df['cpu_percent'] = display_df['cpu_percent'].round(2)
-        if 'memory_percent' in display_df.columns:
-            display_df['memory_percent'] = display_df['memory_percent'].round(2)
-        if 'disk_percent' in display_df.columns:
-            display_df['disk_percent'] = display_df['disk_percent'].round(2)
+            # Format the dataframe for display
+            display_df = df_history.copy()
+            display_df['timestamp'] = display_df['timestamp'].dt.strftime('%H:%M:%S')
         
-        st.dataframe(
-            display_df.tail(20),
-            use_container_width=True,
-            height=400
-        )
+            if 'cpu_percent' in display_df.columns:
+                display_df['cpu_percent'] = display_df['cpu_percent'].round(2)
+            if 'memory_percent' in display_df.columns:
+                display_df['memory_percent'] = display_df['memory_percent'].round(2)
+            if 'disk_percent' in display_df.columns:
+                display_df['disk_percent'] = display_df['disk_percent'].round(2)
         
-        # Statistics
-        st.markdown("#### 📊 Statistical Summary")
-        col1, col2, col3, col4 = st.columns(4)
+            st.dataframe(
+                display_df.tail(20),
+                use_container_width=True,
+                height=400
+            )
         
-        with col1:
-            if 'cpu_percent' in df_history.columns:
-                st.metric("Avg CPU", f"{df_history['cpu_percent'].mean():.1f}%")
-                st.metric("Max CPU", f"{df_history['cpu_percent'].max():.1f}%")
+            # Statistics
+            st.markdown("#### 📊 Statistical Summary")
+            col1, col2, col3, col4 = st.columns(4)
         
-        with col2:
-            if 'memory_percent' in df_history.columns:
-                st.metric("Avg Memory", f"{df_history['memory_percent'].mean():.1f}%")
-                st.metric("Max Memory", f"{df_history['memory_percent'].max():.1f}%")
+            with col1:
+                if 'cpu_percent' in df_history.columns:
+                    st.metric("Avg CPU", f"{df_history['cpu_percent'].mean():.1f}%")
+                    st.metric("Max CPU", f"{df_history['cpu_percent'].max():.1f}%")
         
-        with col3:
-            if 'disk_percent' in df_history.columns:
-                st.metric("Avg Disk", f"{df_history['disk_percent'].mean():.1f}%")
-                st.metric("Max Disk", f"{df_history['disk_percent'].max():.1f}%")
+            with col2:
+                if 'memory_percent' in df_history.columns:
+                    st.metric("Avg Memory", f"{df_history['memory_percent'].mean():.1f}%")
+                    st.metric("Max Memory", f"{df_history['memory_percent'].max():.1f}%")
         
-        with col4:
-            st.metric("Data Points", len(df_history))
-            st.metric("Time Span", f"{len(df_history) * 10}s")
+            with col3:
+                if 'disk_percent' in df_history.columns:
+                    st.metric("Avg Disk", f"{df_history['disk_percent'].mean():.1f}%")
+                    st.metric("Max Disk", f"{df_history['disk_percent'].max():.1f}%")
+        
+            with col4:
+                st.metric("Data Points", len(df_history))
+                st.metric("Time Span", f"{len(df_history) * 10}s")
+        
+        else:
+            st.info("⏳ No data available yet. Metrics will appear as they are collected.")
     
-    else:
-        st.info("⏳ No data available yet. Metrics will appear as they are collected.")
+    _live_metrics_table()
 
 # ============================================================================
 # PAGE: ALERTS
@@ -1224,62 +1312,66 @@ elif selected == "Predictions":
     *Note: Predictions become more accurate with more historical data.*
     """)
     
-    # Simple prediction based on current trend
-    df_history = get_metrics_history()
-    
-    if not df_history.empty and len(df_history) > 5:
-        st.markdown("### 📈 CPU Usage Forecast (Next Hour)")
+    @st.fragment(run_every=LIVE_REFRESH)
+    def _live_forecast():
+        # Simple prediction based on current trend
+        df_history = get_metrics_history()
+        
+        if not df_history.empty and len(df_history) > 5:
+            st.markdown("### 📈 CPU Usage Forecast (Next Hour)")
         
-        # Simple linear trend
-        if 'cpu_percent' in df_history.columns:
-            recent_cpu = df_history['cpu_percent'].tail(10).values
-            trend = np.polyfit(range(len(recent_cpu)), recent_cpu, 1)
+            # Simple linear trend
+            if 'cpu_percent' in df_history.columns:
+                recent_cpu = df_history['cpu_percent'].tail(10).values
+                trend = np.polyfit(range(len(recent_cpu)), recent_cpu, 1)
             
-            # Predict next 12 points (1 hour if 5-min intervals)
-            future_points = 12
-            predictions = [trend[0] * i + trend[1] for i in range(len(recent_cpu), len(recent_cpu) + future_points)]
+                # Predict next 12 points (1 hour if 5-min intervals)
+                future_points = 12
+                predictions = [trend[0] * i + trend[1] for i in range(len(recent_cpu), len(recent_cpu) + future_points)]
             
-            # Create forecast chart
-            fig = go.Figure()
+                # Create forecast chart
+                fig = go.Figure()
             
-            # Historical data
-            fig.add_trace(go.Scatter(
-                x=list(range(len(recent_cpu))),
-                y=recent_cpu,
-                mode='lines+markers',
-                name='Historical',
-                line=dict(color='#4CAF50', width=2)
-            ))
+                # Historical data
+                fig.add_trace(go.Scatter(
+                    x=list(range(len(recent_cpu))),
+                    y=recent_cpu,
+                    mode='lines+markers',
+                    name='Historical',
+                    line=dict(color='#4CAF50', width=2)
+                ))
             
-            # Predictions
-            fig.add_trace(go.Scatter(
-                x=list(range(len(recent_cpu), len(recent_cpu) + future_points)),
-                y=predictions,
-                mode='lines+markers',
-                name='Forecast',
-                line=dict(color='#FF9800', width=2, dash='dash')
-            ))
+                # Predictions
+                fig.add_trace(go.Scatter(
+                    x=list(range(len(recent_cpu), len(recent_cpu) + future_points)),
+                    y=predictions,
+                    mode='lines+markers',
+                    name='Forecast',
+                    line=dict(color='#FF9800', width=2, dash='dash')
+                ))
             
-            fig.update_layout(
-                title="CPU Usage Prediction",
-                xaxis_title="Time Points",
-                yaxis_title="CPU %",
-                height=400,
-                hovermode='x unified'
-            )
+                fig.update_layout(
+                    title="CPU Usage Prediction",
+                    xaxis_title="Time Points",
+                    yaxis_title="CPU %",
+                    height=400,
+                    hovermode='x unified'
+                )
             
-            st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True)
             
-            # Prediction insights
-            avg_predicted = np.mean(predictions)
-            if avg_predicted > 80:
-                st.error(f"⚠️ **Warning:** CPU usage predicted to reach {avg_predicted:.1f}% - Consider scaling resources!")
-            elif avg_predicted > 70:
-                st.warning(f"⚡ **Attention:** CPU usage trending towards {avg_predicted:.1f}% - Monitor closely")
-            else:
-                st.success(f"✅ **Healthy:** CPU usage expected to remain at {avg_predicted:.1f}%")
-    else:
-        st.info("⏳ Not enough data for predictions yet. Keep monitoring to build history!")
+                # Prediction insights
+                avg_predicted = np.mean(predictions)
+                if avg_predicted > 80:
+                    st.error(f"⚠️ **Warning:** CPU usage predicted to reach {avg_predicted:.1f}% - Consider scaling resources!")
+                elif avg_predicted > 70:
+                    st.warning(f"⚡ **Attention:** CPU usage trending towards {avg_predicted:.1f}% - Monitor closely")
+                else:
+                    st.success(f"✅ **Healthy:** CPU usage expected to remain at {avg_predicted:.1f}%")
+        else:
+            st.info("⏳ Not enough data for predictions yet. Keep monitoring to build history!")
+    
+    _live_forecast()
 
 # ============================================================================
 # PAGE: AI INSIGHTS
@@ -1555,10 +1647,3 @@ elif selected == "Settings":
         if st.button("💾 Save Appearance Settings"):
             st.success("✅ Appearance settings saved!")
 
-# ============================================================================
-# AUTO REFRESH
-# ============================================================================
-
-if st.session_state['auto_refresh']:
-    time.sleep(st.session_state['refresh_interval'])
-    st.rerun()
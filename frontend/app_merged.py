@@ -49,15 +49,19 @@ except ImportError:
 
 # Input validation patterns
 EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+MAX_EMAIL_LENGTH = 254  # RFC 5321 path limit
+_HTML_ESCAPES = str.maketrans({'<': '&lt;', '>': '&gt;', '"': '&quot;'})
 INTERVAL_OPTIONS = ["5 seconds", "10 seconds", "30 seconds", "1 minute", "5 minutes", "10 minutes"]
 
 def validate_email(email: str) -> bool:
     """Validate email format"""
-    return bool(EMAIL_PATTERN.match(email)) if email else False
+    if not email or len(email) > MAX_EMAIL_LENGTH:
+        return False
+    return EMAIL_PATTERN.fullmatch(email) is not None
 
 def sanitize_input(text: str) -> str:
     """Sanitize user input to prevent XSS"""
-    return text.replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+    return text.translate(_HTML_ESCAPES)
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -7,11 +7,17 @@ import streamlit as st
 import requests
 import json
 import os
+import queue
+import asyncio
+import threading
+import websockets
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 from collections import deque
 import time
 
+AGENT_ID = os.getenv("AGENT_ID", "default-agent")
+
 
 def normalize_api_url(raw_url: str, fallback: str = "http://localhost:8000") -> str:
     """Normalize API URL by ensuring scheme and stripping trailing slashes."""
@@ -164,6 +170,90 @@ def get_latest_metrics() -> Dict[str, Any]:
         return fetch_and_cache_metrics(fetcher)
 
 
+# ============================================================================
+# WebSocket consumer - metric snapshots pushed by the backend
+# ============================================================================
+
+_ws_metrics_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=256)
+_ws_latest: Dict[str, Any] = {"metrics": None, "received_at": 0.0}
+
+# A pushed snapshot older than this means the stream has stalled (agent or
+# socket gone), so callers go back to polling over HTTP
+WS_MAX_AGE = float(os.getenv("WS_MAX_AGE", "15"))
+
+
+async def _consume_ws_metrics(ws_url: str) -> None:
+    """Receive metric frames forever, reconnecting with backoff"""
+    backoff = 1
+    while True:
+        try:
+            async with websockets.connect(ws_url) as ws:
+                backoff = 1
+                async for message in ws:
+                    frame = json.loads(message)
+                    if frame.get("type") != "metrics":
+                        continue  # keepalive pings
+                    try:
+                        _ws_metrics_queue.put_nowait(frame["data"])
+                    except queue.Full:
+                        # Nobody is draining; drop the oldest snapshot
+                        try:
+                            _ws_metrics_queue.get_nowait()
+                        except queue.Empty:
+                            pass
+                        _ws_metrics_queue.put_nowait(frame["data"])
+        except Exception:
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+
+@st.cache_resource
+def start_ws_consumer(api_base_url: str, agent_id: str = AGENT_ID) -> threading.Thread:
+    """Start the background WebSocket consumer once per process"""
+    ws_base = api_base_url.replace("https://", "wss://").replace("http://", "ws://")
+    ws_url = f"{ws_base}/ws/metrics/{agent_id}"
+    thread = threading.Thread(
+        target=lambda: asyncio.run(_consume_ws_metrics(ws_url)),
+        name="ws-metrics-consumer",
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def _to_dashboard_metrics(frame: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Give a pushed frame (the agent's ingest payload) the keys the dashboard
+    reads, which follow the HTTP /api/metrics/current response
+    """
+    metrics = dict(frame)
+    metrics.setdefault('network_sent', frame.get('network_sent_bytes_total', 0))
+    metrics.setdefault('network_recv', frame.get('network_recv_bytes_total', 0))
+    return metrics
+
+
+def get_ws_metrics() -> Optional[Dict[str, Any]]:
+    """
+    Move snapshots received over the WebSocket into the metrics buffer
+    without blocking. Returns the newest snapshot if it arrived within the
+    last WS_MAX_AGE seconds, otherwise None. The same dict is returned until
+    a newer frame arrives, so callers can detect new frames by identity.
+    """
+    buffer = get_metrics_buffer()
+    while True:
+        try:
+            metrics = _to_dashboard_metrics(_ws_metrics_queue.get_nowait())
+        except queue.Empty:
+            break
+        buffer.append(metrics)
+        _ws_latest["metrics"] = metrics
+        _ws_latest["received_at"] = time.monotonic()
+    
+    if time.monotonic() - _ws_latest["received_at"] > WS_MAX_AGE:
+        return None
+    return _ws_latest["metrics"]
+
+
 def get_buffered_metrics_as_list() -> List[Dict[str, Any]]:
     """Get all buffered metrics as a list"""
     buffer = get_metrics_buffer()